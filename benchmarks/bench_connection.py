@@ -0,0 +1,64 @@
+"""Benchmark per-call latency of Database with and without connection pooling.
+
+USAGE:
+    python benchmarks/bench_connection.py [--calls N]
+
+Runs the same mix of calls a ``clide boot`` makes (log_action, four reads,
+end_action) against a temporary memory bank, once opening a fresh connection
+per call and once reusing the pooled per-thread connection.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clide.db import Database  # noqa: E402
+
+
+def boot_like_cycle(db: Database) -> int:
+    """Run one boot-shaped sequence of calls and return how many calls it made."""
+    log_id = db.log_action("Bench", "boot", "benchmark")
+    db.get_open_work(limit=20)
+    db.get_landmines(limit=10)
+    db.get_open_defects()
+    db.get_config()
+    db.end_action(log_id)
+    return 6
+
+
+def run(db: Database, calls: int) -> float:
+    """Return mean latency per call in microseconds."""
+    done = 0
+    start = time.perf_counter()
+    while done < calls:
+        done += boot_like_cycle(db)
+    elapsed = time.perf_counter() - start
+    return elapsed / done * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=3000, help="Calls per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "bench.db")
+        Database(db_path, pooled=False).initialize()
+
+        fresh = run(Database(db_path, pooled=False), args.calls)
+        pooled_db = Database(db_path, pooled=True)
+        pooled = run(pooled_db, args.calls)
+        pooled_db.close()
+
+    print(f"calls per mode:  {args.calls}")
+    print(f"fresh connection: {fresh:8.1f} us/call")
+    print(f"pooled connection:{pooled:8.1f} us/call")
+    print(f"speedup:          {fresh / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
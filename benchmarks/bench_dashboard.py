@@ -0,0 +1,83 @@
+"""Benchmark dashboard requests/sec per page, with and without the page cache.
+
+USAGE:
+    python benchmarks/bench_dashboard.py [--requests N] [--rows N]
+
+Seeds a temporary memory bank, then drives the WSGI app in-process through
+Flask's test client (no sockets), so the numbers are rendering and query cost
+only. "uncached" re-checks PRAGMA data_version on every hit and a background
+write before each request forces a re-render; "cached" is the steady state of
+an unchanged database with the default TTL.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clide.dashboard import create_app  # noqa: E402
+from clide.db import Database  # noqa: E402
+
+PAGES = (
+    "/",
+    "/log",
+    "/browse/landmines",
+    "/api/v1/open-work",
+    "/api/v1/log?limit=100",
+)
+
+
+def seed(db: Database, rows: int) -> None:
+    """Fill the tables the dashboard pages read."""
+    with db.transaction():
+        for i in range(rows):
+            db.create_story(f"Story {i}", priority=i % 5 + 1)
+            db.create_defect(f"Defect {i}", severity=("critical", "major", "minor")[i % 3])
+            db.create_landmine(f"Landmine {i}", tags="bench,dashboard")
+            db.log_action("Bench", "step", f"entry {i}")
+
+
+def run(client, path: str, requests: int, writer: Optional[Database] = None) -> float:
+    """Return requests/sec for path; a writer commits before every request."""
+    start = time.perf_counter()
+    for i in range(requests):
+        if writer is not None:
+            writer.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('bench_tick', ?)",
+                (str(i),),
+                write=True,
+            )
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per page and mode")
+    parser.add_argument("--rows", type=int, default=500, help="Rows seeded per table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "bench.db")
+        db = Database(db_path)
+        db.initialize()
+        seed(db, args.rows)
+
+        uncached = create_app(db_path, cache_ttl=0).test_client()
+        cached = create_app(db_path).test_client()
+
+        print(f"requests per page: {args.requests}, rows per table: {args.rows}")
+        print(f"{'page':<24}{'uncached req/s':>16}{'cached req/s':>16}")
+        for path in PAGES:
+            cold = run(uncached, path, args.requests, writer=db)
+            warm = run(cached, path, args.requests)
+            print(f"{path:<24}{cold:>16.0f}{warm:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Stress-test concurrent writers on one memory bank.
+
+USAGE:
+    python benchmarks/bench_locks.py [--writers N] [--transactions M] [--mode MODE]
+
+Spawns N writer processes that each run M save-shaped transactions (read the
+health summary, then log and end an action) against a temporary memory bank.
+Reports throughput, transaction latency percentiles, failures and lock
+retries. ``--mode deferred`` runs the same work with a plain ``BEGIN`` and
+SQLite's busy handler, for comparison with the jittered ``BEGIN IMMEDIATE``
+coordinator (``coordinated``, the default); ``both`` runs one after the other.
+"""
+
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clide.db import Database  # noqa: E402
+
+
+def writer(db_path: str, transactions: int, coordinated: bool, start, results) -> None:
+    """Run transactions and report (latencies, failures, lock stats)."""
+    db = Database(db_path, pooled=True, buffered_log=False)
+    latencies = []
+    failures = 0
+    start.wait()
+    for _ in range(transactions):
+        began = time.perf_counter()
+        try:
+            with db.transaction(write=coordinated):
+                db.get_health_summary()
+                log_id = db.log_action("Bench", "save", "stress")
+                db.end_action(log_id)
+        except sqlite3.OperationalError:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - began)
+    results.put((latencies, failures, db.lock_stats))
+    db.close()
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    index = max(int(len(values) * fraction + 0.999999) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def run(db_path: str, writers: int, transactions: int, coordinated: bool) -> None:
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(
+            target=writer, args=(db_path, transactions, coordinated, start, results)
+        )
+        for _ in range(writers)
+    ]
+    for proc in procs:
+        proc.start()
+    began = time.perf_counter()
+    start.set()
+    collected = [results.get() for _ in procs]
+    elapsed = time.perf_counter() - began
+    for proc in procs:
+        proc.join()
+
+    latencies = sorted(value for result in collected for value in result[0])
+    failures = sum(result[1] for result in collected)
+    retries = sum(result[2]["retries"] for result in collected)
+    contended = sum(result[2]["contended"] for result in collected)
+
+    mode = "coordinated" if coordinated else "deferred"
+    print(f"mode:           {mode}")
+    print(f"writers:        {writers} x {transactions} transactions")
+    print(f"throughput:     {len(latencies) / elapsed:8.1f} txn/s")
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)):
+        print(f"latency {label}:    {percentile(latencies, fraction) * 1000:8.1f} ms")
+    print(f"failed:         {failures}")
+    if coordinated:
+        print(f"contended:      {contended} ({retries} retries)")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8, help="Writer processes")
+    parser.add_argument("--transactions", type=int, default=200, help="Transactions per writer")
+    parser.add_argument(
+        "--mode", choices=("coordinated", "deferred", "both"), default="both", help="Locking mode"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "bench.db")
+        Database(db_path, pooled=False).initialize()
+        if args.mode in ("coordinated", "both"):
+            run(db_path, args.writers, args.transactions, True)
+        if args.mode in ("deferred", "both"):
+            run(db_path, args.writers, args.transactions, False)
+
+
+if __name__ == "__main__":
+    main()
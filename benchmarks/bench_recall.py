@@ -0,0 +1,115 @@
+"""Benchmark landmine recall latency on a large memory bank.
+
+USAGE:
+    python benchmarks/bench_recall.py [--landmines N] [--queries N] [--budget MS]
+
+Seeds a temporary bank with synthetic landmines (summaries mentioning file
+names, tags drawn from a fixed vocabulary), then times recall for random
+working sets of a few changed files plus diff terms. Reports p50/p95/max
+latency with no time budget and with --budget, and how often the budget
+cut a search short.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clide.db import Database  # noqa: E402
+from clide.recall import WorkingSet, build_working_set  # noqa: E402
+
+MODULES = [f"module{i}" for i in range(300)]
+AREAS = ["auth", "billing", "dashboard", "db", "deploy", "cache", "search", "api", "cli", "worker"]
+WORDS = [
+    "timeout",
+    "retry",
+    "lock",
+    "migration",
+    "index",
+    "cursor",
+    "token",
+    "session",
+    "queue",
+    "backoff",
+    "schema",
+    "encoding",
+    "unicode",
+    "overflow",
+    "race",
+    "deadlock",
+    "leak",
+    "stale",
+    "cache",
+    "invalidation",
+]
+
+
+def seed(db: Database, count: int, rng: random.Random) -> None:
+    """Insert count synthetic landmines in one transaction."""
+    with db.transaction():
+        for i in range(count):
+            module = rng.choice(MODULES)
+            words = " ".join(rng.sample(WORDS, 3))
+            db.create_landmine(
+                f"{words} in {module}.py #{i}",
+                cause=f"{rng.choice(WORDS)} when {rng.choice(WORDS)}",
+                tags=",".join(rng.sample(AREAS, 2)),
+            )
+
+
+def working_set(rng: random.Random) -> WorkingSet:
+    """A few changed files in one area, plus diff terms."""
+    area = rng.choice(AREAS)
+    files = [f"src/{area}/{rng.choice(MODULES)}.py" for _ in range(rng.randint(1, 4))]
+    base = build_working_set(files)
+    return base._replace(terms=base.terms + rng.sample(WORDS, 4))
+
+
+def measure(db: Database, sets, budget_ms) -> tuple:
+    """Return per-query latencies in ms and the number of truncated searches."""
+    latencies, truncated = [], 0
+    for ws in sets:
+        start = time.perf_counter()
+        _, cut = db.recall_landmines(ws.phrases, ws.tags, ws.terms, limit=10, budget_ms=budget_ms)
+        latencies.append((time.perf_counter() - start) * 1000)
+        truncated += cut
+    return latencies, truncated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--landmines", type=int, default=100_000, help="Landmines to seed")
+    parser.add_argument("--queries", type=int, default=200, help="Recall queries per mode")
+    parser.add_argument("--budget", type=float, default=20.0, help="Time budget in ms")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "bench.db"), pooled=True)
+        db.initialize()
+        start = time.perf_counter()
+        seed(db, args.landmines, rng)
+        print(f"seeded {args.landmines} landmines in {time.perf_counter() - start:.1f}s")
+
+        sets = [working_set(rng) for _ in range(args.queries)]
+        measure(db, sets[:10], None)  # warm the page cache
+
+        for label, budget in (("no budget", None), (f"{args.budget:g} ms budget", args.budget)):
+            latencies, truncated = measure(db, sets, budget)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(
+                f"{label:<16} p50 {statistics.median(latencies):6.2f} ms"
+                f"  p95 {p95:6.2f} ms  max {latencies[-1]:6.2f} ms"
+                f"  truncated {truncated}/{len(sets)}"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark full-text search against the legacy LIKE substring scan.
+
+USAGE:
+    python benchmarks/bench_search.py [--rows N] [--queries N]
+
+Loads N synthetic landmines into a temporary memory bank and times the
+same term lookups through ``LIKE '%term%'`` over the text columns and
+through ``Database.search`` (FTS5 + BM25).
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clide.db import Database  # noqa: E402
+
+WORDS = [
+    "redis",
+    "timeout",
+    "cache",
+    "deploy",
+    "rollback",
+    "auth",
+    "token",
+    "migration",
+    "schema",
+    "index",
+    "lock",
+    "retry",
+    "webhook",
+    "queue",
+    "worker",
+    "cron",
+    "backup",
+    "restore",
+    "latency",
+    "memory",
+    "leak",
+    "docker",
+    "kubernetes",
+    "nginx",
+    "tls",
+    "certificate",
+    "dns",
+    "proxy",
+    "session",
+    "cookie",
+    "build",
+]
+
+LIKE_SQL = """
+    SELECT id FROM landmines
+    WHERE summary LIKE ? OR cause LIKE ? OR remediation LIKE ? OR avoidance_rules LIKE ?
+    ORDER BY updated_at DESC LIMIT 20
+"""
+
+
+def synthetic_landmines(count: int, seed: int = 7):
+    """Yield landmine rows made of random vocabulary plus a unique token."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "summary": " ".join(rng.choices(WORDS, k=6)) + f" item{i}",
+            "cause": " ".join(rng.choices(WORDS, k=12)),
+            "remediation": " ".join(rng.choices(WORDS, k=12)),
+            "avoidance_rules": " ".join(rng.choices(WORDS, k=8)),
+            "tags": ",".join(rng.sample(WORDS, 3)),
+        }
+
+
+def time_queries(fn, terms) -> float:
+    """Return mean milliseconds per query."""
+    start = time.perf_counter()
+    for term in terms:
+        fn(term)
+    return (time.perf_counter() - start) / len(terms) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Landmines to load")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per method")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    rare_terms = [f"item{rng.randrange(args.rows)}" for _ in range(args.queries)]
+    common_terms = rng.choices(WORDS, k=args.queries)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "bench.db"), pooled=True)
+        db.initialize()
+        start = time.perf_counter()
+        db.bulk_insert("landmines", synthetic_landmines(args.rows), batch_size=5000)
+        load = time.perf_counter() - start
+
+        def like(term):
+            pattern = f"%{term}%"
+            return db.execute(LIKE_SQL, (pattern, pattern, pattern, pattern))
+
+        def fts(term):
+            return db.search(term, kinds=["landmines"])
+
+        results = {
+            label: (time_queries(like, terms), time_queries(fts, terms))
+            for label, terms in (("selective term", rare_terms), ("common term", common_terms))
+        }
+        db.close()
+
+    print(f"rows loaded: {args.rows} in {load:.1f}s (FTS index maintained by triggers)")
+    print(f"{'query':<16}{'LIKE ms':>10}{'FTS5 ms':>10}{'speedup':>10}")
+    for label, (like_ms, fts_ms) in results.items():
+        print(f"{label:<16}{like_ms:>10.2f}{fts_ms:>10.2f}{like_ms / fts_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 $DB="memory_bank.db"
 $SCHEMA="memory_bank.schema.sql"
-$MIGRATION="migrations/2025-08-28-v1_1.sql"
+$MIGRATIONS_DIR="migrations"
 
 if (-not (Get-Command sqlite3 -ErrorAction SilentlyContinue)) {
   Write-Error "sqlite3 is required. On Windows, install via winget or scoop."
@@ -16,9 +16,15 @@ if (Test-Path $DB) { Remove-Item $DB -Force }
 Write-Host "Initializing $DB from $SCHEMA ..."
 sqlite3 $DB ".read $SCHEMA"
 
-if (Test-Path $MIGRATION) {
-  Write-Host "Applying migration $MIGRATION ..."
-  sqlite3 $DB ".read $MIGRATION"
+if (Test-Path $MIGRATIONS_DIR) {
+  # Natural sort so v1_10 is applied after v1_9
+  $migrations = Get-ChildItem "$MIGRATIONS_DIR/*.sql" |
+    Sort-Object { [regex]::Replace($_.Name, '\d+', { $args[0].Value.PadLeft(10, '0') }) }
+  foreach ($m in $migrations) {
+    $MIGRATION = "$MIGRATIONS_DIR/$($m.Name)"
+    Write-Host "Applying migration $MIGRATION ..."
+    sqlite3 $DB ".read $MIGRATION"
+  }
 }
 
 Write-Host "Tables:"
@@ -3,7 +3,7 @@ set -euo pipefail
 
 DB="memory_bank.db"
 SCHEMA="memory_bank.schema.sql"
-MIGRATION="migrations/2025-08-28-v1_1.sql"
+MIGRATIONS_DIR="migrations"
 
 if ! command -v sqlite3 >/dev/null 2>&1; then
   echo "sqlite3 is required. On macOS: brew install sqlite3"
@@ -19,9 +19,12 @@ echo "Initializing $DB from $SCHEMA ..."
 rm -f "$DB"
 sqlite3 "$DB" < "$SCHEMA"
 
-if [ -f "$MIGRATION" ]; then
-  echo "Applying migration $MIGRATION ..."
-  sqlite3 "$DB" < "$MIGRATION"
+if [ -d "$MIGRATIONS_DIR" ]; then
+  # Version-sort so v1_10 is applied after v1_9
+  for MIGRATION in $(ls "$MIGRATIONS_DIR"/*.sql | sort -V); do
+    echo "Applying migration $MIGRATION ..."
+    sqlite3 "$DB" < "$MIGRATION"
+  done
 fi
 
 echo "Done. Created $DB"
@@ -1,3 +1,4 @@
+PRAGMA auto_vacuum = INCREMENTAL;
 PRAGMA journal_mode=WAL;
 PRAGMA foreign_keys = ON;
 PRAGMA busy_timeout = 5000;
@@ -0,0 +1,99 @@
+-- v1.10: per-table change versions maintained by triggers
+-- Unlike PRAGMA data_version, which only means something on one connection,
+-- these survive across processes, so on-disk caches (the boot context pack)
+-- can tell which tables changed since they were built. agents_log is left
+-- out on purpose: logging must not invalidate anything.
+-- Safe to re-run.
+
+-- 1) One row per tracked table
+CREATE TABLE IF NOT EXISTS table_versions (
+  name    TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO table_versions(name, version) VALUES
+  ('landmines', 0),
+  ('stories', 0),
+  ('defects', 0),
+  ('deployment', 0),
+  ('configuration', 0);
+
+-- 2) Bump on every change (statement-level triggers do not exist in SQLite,
+--    so a bulk write bumps once per row; only the value changing matters)
+CREATE TRIGGER IF NOT EXISTS trg_landmines_version_ai AFTER INSERT ON landmines
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'landmines';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_version_au AFTER UPDATE ON landmines
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'landmines';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_version_ad AFTER DELETE ON landmines
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'landmines';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_version_ai AFTER INSERT ON stories
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'stories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_version_au AFTER UPDATE ON stories
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'stories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_version_ad AFTER DELETE ON stories
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'stories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_version_ai AFTER INSERT ON defects
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'defects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_version_au AFTER UPDATE ON defects
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'defects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_version_ad AFTER DELETE ON defects
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'defects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_deployment_version_ai AFTER INSERT ON deployment
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'deployment';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_deployment_version_au AFTER UPDATE ON deployment
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'deployment';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_deployment_version_ad AFTER DELETE ON deployment
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'deployment';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_configuration_version_ai AFTER INSERT ON configuration
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'configuration';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_configuration_version_au AFTER UPDATE ON configuration
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'configuration';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_configuration_version_ad AFTER DELETE ON configuration
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE name = 'configuration';
+END;
+
+-- 3) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.10');
@@ -0,0 +1,90 @@
+-- v1.2: full-text search over landmines, defects and stories (FTS5)
+-- Safe to re-run: tables/triggers use IF NOT EXISTS and 'rebuild' re-indexes in place.
+
+-- 1) External-content FTS5 indexes (rows live in the base tables)
+CREATE VIRTUAL TABLE IF NOT EXISTS landmines_fts USING fts5(
+  summary, cause, impact, remediation, avoidance_rules, tags,
+  content='landmines', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS defects_fts USING fts5(
+  title, description, resolution,
+  content='defects', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+  title, description, acceptance_criteria, labels,
+  content='stories', content_rowid='id', tokenize='porter unicode61'
+);
+
+-- 2) Keep indexes in sync with the base tables
+CREATE TRIGGER IF NOT EXISTS trg_landmines_fts_ai AFTER INSERT ON landmines
+BEGIN
+  INSERT INTO landmines_fts(rowid, summary, cause, impact, remediation, avoidance_rules, tags)
+  VALUES (NEW.id, NEW.summary, NEW.cause, NEW.impact, NEW.remediation, NEW.avoidance_rules, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_fts_ad AFTER DELETE ON landmines
+BEGIN
+  INSERT INTO landmines_fts(landmines_fts, rowid, summary, cause, impact, remediation, avoidance_rules, tags)
+  VALUES ('delete', OLD.id, OLD.summary, OLD.cause, OLD.impact, OLD.remediation, OLD.avoidance_rules, OLD.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_fts_au
+AFTER UPDATE OF summary, cause, impact, remediation, avoidance_rules, tags ON landmines
+BEGIN
+  INSERT INTO landmines_fts(landmines_fts, rowid, summary, cause, impact, remediation, avoidance_rules, tags)
+  VALUES ('delete', OLD.id, OLD.summary, OLD.cause, OLD.impact, OLD.remediation, OLD.avoidance_rules, OLD.tags);
+  INSERT INTO landmines_fts(rowid, summary, cause, impact, remediation, avoidance_rules, tags)
+  VALUES (NEW.id, NEW.summary, NEW.cause, NEW.impact, NEW.remediation, NEW.avoidance_rules, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_fts_ai AFTER INSERT ON defects
+BEGIN
+  INSERT INTO defects_fts(rowid, title, description, resolution)
+  VALUES (NEW.id, NEW.title, NEW.description, NEW.resolution);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_fts_ad AFTER DELETE ON defects
+BEGIN
+  INSERT INTO defects_fts(defects_fts, rowid, title, description, resolution)
+  VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.resolution);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_fts_au
+AFTER UPDATE OF title, description, resolution ON defects
+BEGIN
+  INSERT INTO defects_fts(defects_fts, rowid, title, description, resolution)
+  VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.resolution);
+  INSERT INTO defects_fts(rowid, title, description, resolution)
+  VALUES (NEW.id, NEW.title, NEW.description, NEW.resolution);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_fts_ai AFTER INSERT ON stories
+BEGIN
+  INSERT INTO stories_fts(rowid, title, description, acceptance_criteria, labels)
+  VALUES (NEW.id, NEW.title, NEW.description, NEW.acceptance_criteria, NEW.labels);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_fts_ad AFTER DELETE ON stories
+BEGIN
+  INSERT INTO stories_fts(stories_fts, rowid, title, description, acceptance_criteria, labels)
+  VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.acceptance_criteria, OLD.labels);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_fts_au
+AFTER UPDATE OF title, description, acceptance_criteria, labels ON stories
+BEGIN
+  INSERT INTO stories_fts(stories_fts, rowid, title, description, acceptance_criteria, labels)
+  VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.acceptance_criteria, OLD.labels);
+  INSERT INTO stories_fts(rowid, title, description, acceptance_criteria, labels)
+  VALUES (NEW.id, NEW.title, NEW.description, NEW.acceptance_criteria, NEW.labels);
+END;
+
+-- 3) Backfill rows that existed before this migration
+INSERT INTO landmines_fts(landmines_fts) VALUES ('rebuild');
+INSERT INTO defects_fts(defects_fts) VALUES ('rebuild');
+INSERT INTO stories_fts(stories_fts) VALUES ('rebuild');
+
+-- 4) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.2');
@@ -0,0 +1,113 @@
+-- v1.3: normalized tag index for landmines.tags and stories.labels
+-- The comma-separated columns stay the source of truth; triggers mirror them
+-- into tags + link tables for exact, indexed lookups. Safe to re-run.
+
+-- 1) Tag dictionary and link tables
+CREATE TABLE IF NOT EXISTS tags (
+  id   INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS landmine_tags (
+  landmine_id INTEGER NOT NULL REFERENCES landmines(id) ON DELETE CASCADE,
+  tag_id      INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+  PRIMARY KEY (landmine_id, tag_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_landmine_tags_tag ON landmine_tags(tag_id, landmine_id);
+
+CREATE TABLE IF NOT EXISTS story_tags (
+  story_id INTEGER NOT NULL REFERENCES stories(id) ON DELETE CASCADE,
+  tag_id   INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+  PRIMARY KEY (story_id, tag_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_story_tags_tag ON story_tags(tag_id, story_id);
+
+-- 2) Triggers: split on commas/tabs/newlines, trim spaces, lowercase ASCII
+--    (SQLite's lower()), drop empties; split_tags() in db.py must match.
+--    CTEs are not allowed in triggers, so the string is split with
+--    json_each: json_quote escapes it, then each comma becomes '","'.
+CREATE TRIGGER IF NOT EXISTS trg_landmines_tags_ai AFTER INSERT ON landmines
+WHEN NEW.tags IS NOT NULL
+BEGIN
+  INSERT OR IGNORE INTO tags(name)
+  SELECT lower(trim(value)) FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']')
+  WHERE trim(value) <> '';
+  INSERT OR IGNORE INTO landmine_tags(landmine_id, tag_id)
+  SELECT NEW.id, t.id FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+  JOIN tags t ON t.name = lower(trim(j.value));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_tags_au AFTER UPDATE OF tags ON landmines
+BEGIN
+  DELETE FROM landmine_tags WHERE landmine_id = NEW.id;
+  INSERT OR IGNORE INTO tags(name)
+  SELECT lower(trim(value)) FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']')
+  WHERE trim(value) <> '';
+  INSERT OR IGNORE INTO landmine_tags(landmine_id, tag_id)
+  SELECT NEW.id, t.id FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+  JOIN tags t ON t.name = lower(trim(j.value));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_tags_ad AFTER DELETE ON landmines
+BEGIN
+  DELETE FROM landmine_tags WHERE landmine_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_tags_ai AFTER INSERT ON stories
+WHEN NEW.labels IS NOT NULL
+BEGIN
+  INSERT OR IGNORE INTO tags(name)
+  SELECT lower(trim(value)) FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']')
+  WHERE trim(value) <> '';
+  INSERT OR IGNORE INTO story_tags(story_id, tag_id)
+  SELECT NEW.id, t.id FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+  JOIN tags t ON t.name = lower(trim(j.value));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_tags_au AFTER UPDATE OF labels ON stories
+BEGIN
+  DELETE FROM story_tags WHERE story_id = NEW.id;
+  INSERT OR IGNORE INTO tags(name)
+  SELECT lower(trim(value)) FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']')
+  WHERE trim(value) <> '';
+  INSERT OR IGNORE INTO story_tags(story_id, tag_id)
+  SELECT NEW.id, t.id FROM json_each('[' || replace(json_quote(replace(replace(replace(
+         NEW.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+  JOIN tags t ON t.name = lower(trim(j.value));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_tags_ad AFTER DELETE ON stories
+BEGIN
+  DELETE FROM story_tags WHERE story_id = OLD.id;
+END;
+
+-- 3) Backfill rows that existed before this migration
+INSERT OR IGNORE INTO tags(name)
+SELECT lower(trim(j.value)) FROM landmines, json_each('[' || replace(json_quote(replace(replace(replace(
+         landmines.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+WHERE landmines.tags IS NOT NULL AND trim(j.value) <> '';
+INSERT OR IGNORE INTO landmine_tags(landmine_id, tag_id)
+SELECT landmines.id, t.id FROM landmines, json_each('[' || replace(json_quote(replace(replace(replace(
+         landmines.tags, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+JOIN tags t ON t.name = lower(trim(j.value))
+WHERE landmines.tags IS NOT NULL;
+
+INSERT OR IGNORE INTO tags(name)
+SELECT lower(trim(j.value)) FROM stories, json_each('[' || replace(json_quote(replace(replace(replace(
+         stories.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+WHERE stories.labels IS NOT NULL AND trim(j.value) <> '';
+INSERT OR IGNORE INTO story_tags(story_id, tag_id)
+SELECT stories.id, t.id FROM stories, json_each('[' || replace(json_quote(replace(replace(replace(
+         stories.labels, char(9), ','), char(10), ','), char(13), ',')), ',', '","') || ']') j
+JOIN tags t ON t.name = lower(trim(j.value))
+WHERE stories.labels IS NOT NULL;
+
+-- 4) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.3');
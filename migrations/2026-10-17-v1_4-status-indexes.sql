@@ -0,0 +1,14 @@
+-- v1.4: covering indexes for grouped health counts
+-- Safe to re-run.
+
+-- 1) (status, severity) / (status, priority) cover the GROUP BY in
+--    Database.get_health_summary, so counting never touches table rows.
+CREATE INDEX IF NOT EXISTS idx_defects_status_severity ON defects(status, severity);
+CREATE INDEX IF NOT EXISTS idx_stories_status_priority ON stories(status, priority);
+
+-- 2) The single-column status indexes are prefixes of the new ones
+DROP INDEX IF EXISTS idx_defects_status;
+DROP INDEX IF EXISTS idx_stories_status;
+
+-- 3) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.4');
@@ -0,0 +1,97 @@
+-- v1.5: materialized health counters maintained by triggers
+-- One row per (kind, status, severity) so health views read a handful of rows
+-- regardless of table size. Rebuild/verify with `clide doctor --recount`.
+-- Safe to re-run: the backfill recomputes every counter from scratch.
+
+-- 1) Counters table (severity is '' for kinds without one; landmine status
+--    is their solution_verification)
+CREATE TABLE IF NOT EXISTS counters (
+  kind     TEXT NOT NULL,
+  status   TEXT NOT NULL,
+  severity TEXT NOT NULL DEFAULT '',
+  count    INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (kind, status, severity)
+) WITHOUT ROWID;
+
+-- 2) Keep counters current
+CREATE TRIGGER IF NOT EXISTS trg_stories_counters_ai AFTER INSERT ON stories
+BEGIN
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('story', NEW.status, '', 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_counters_ad AFTER DELETE ON stories
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'story' AND status = OLD.status AND severity = '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stories_counters_au AFTER UPDATE OF status ON stories
+WHEN OLD.status IS NOT NEW.status
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'story' AND status = OLD.status AND severity = '';
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('story', NEW.status, '', 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_counters_ai AFTER INSERT ON defects
+BEGIN
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('defect', NEW.status, NEW.severity, 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_counters_ad AFTER DELETE ON defects
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'defect' AND status = OLD.status AND severity = OLD.severity;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_defects_counters_au AFTER UPDATE OF status, severity ON defects
+WHEN OLD.status IS NOT NEW.status OR OLD.severity IS NOT NEW.severity
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'defect' AND status = OLD.status AND severity = OLD.severity;
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('defect', NEW.status, NEW.severity, 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_counters_ai AFTER INSERT ON landmines
+BEGIN
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('landmine', COALESCE(NEW.solution_verification, ''), '', 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_counters_ad AFTER DELETE ON landmines
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'landmine' AND status = COALESCE(OLD.solution_verification, '') AND severity = '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_landmines_counters_au AFTER UPDATE OF solution_verification ON landmines
+WHEN OLD.solution_verification IS NOT NEW.solution_verification
+BEGIN
+  UPDATE counters SET count = count - 1
+  WHERE kind = 'landmine' AND status = COALESCE(OLD.solution_verification, '') AND severity = '';
+  INSERT INTO counters(kind, status, severity, count)
+  VALUES ('landmine', COALESCE(NEW.solution_verification, ''), '', 1)
+  ON CONFLICT(kind, status, severity) DO UPDATE SET count = count + 1;
+END;
+
+-- 3) Backfill from the base tables
+DELETE FROM counters;
+INSERT INTO counters(kind, status, severity, count)
+SELECT 'story', status, '', COUNT(*) FROM stories GROUP BY status
+UNION ALL
+SELECT 'defect', status, severity, COUNT(*) FROM defects GROUP BY status, severity
+UNION ALL
+SELECT 'landmine', COALESCE(solution_verification, ''), '', COUNT(*)
+FROM landmines GROUP BY COALESCE(solution_verification, '');
+
+-- 4) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.5');
@@ -0,0 +1,16 @@
+-- v1.6: indexes for keyset (cursor) pagination
+-- Safe to re-run.
+
+-- 1) Each paged listing orders by (column, id). SQLite appends the rowid to
+--    every index entry, so a single-column index already serves the
+--    (column, id) row-value comparison as an index range scan.
+CREATE INDEX IF NOT EXISTS idx_agents_log_started ON agents_log(started_at);
+CREATE INDEX IF NOT EXISTS idx_stories_created ON stories(created_at);
+CREATE INDEX IF NOT EXISTS idx_defects_created ON defects(created_at);
+CREATE INDEX IF NOT EXISTS idx_landmines_updated ON landmines(updated_at);
+CREATE INDEX IF NOT EXISTS idx_testing_created ON testing(created_at);
+CREATE INDEX IF NOT EXISTS idx_deployment_created ON deployment(created_at);
+CREATE INDEX IF NOT EXISTS idx_milestones_achieved ON milestones(achieved_at);
+
+-- 2) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.6');
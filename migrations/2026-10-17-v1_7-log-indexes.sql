@@ -0,0 +1,18 @@
+-- v1.7: indexes behind the clide log filters
+-- (parent_id subtree walks use idx_agents_log_parent from v1.1)
+-- Safe to re-run.
+
+-- 1) Equality filters followed by the (started_at, id) sort, so a filtered
+--    page is still one index range scan
+CREATE INDEX IF NOT EXISTS idx_agents_log_agent_started ON agents_log(agent, started_at);
+CREATE INDEX IF NOT EXISTS idx_agents_log_action_started ON agents_log(action, started_at);
+CREATE INDEX IF NOT EXISTS idx_agents_log_trace_started ON agents_log(trace_id, started_at);
+
+-- 2) idx_agents_log_trace (v1.1) is a prefix of idx_agents_log_trace_started
+DROP INDEX IF EXISTS idx_agents_log_trace;
+
+-- 3) Open (unended) actions are few; a partial index keeps them apart
+CREATE INDEX IF NOT EXISTS idx_agents_log_open ON agents_log(started_at) WHERE ended_at IS NULL;
+
+-- 4) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.7');
@@ -0,0 +1,18 @@
+-- v1.8: daily agent log rollups for clide log compact
+-- Safe to re-run.
+
+-- 1) Per-day, per-agent, per-action aggregates of compacted agents_log rows.
+--    Durations are in seconds over the rows that had ended.
+CREATE TABLE IF NOT EXISTS agents_log_daily (
+  day            TEXT NOT NULL,
+  agent          TEXT NOT NULL,
+  action         TEXT NOT NULL,
+  count          INTEGER NOT NULL DEFAULT 0,
+  ended          INTEGER NOT NULL DEFAULT 0,
+  total_duration REAL NOT NULL DEFAULT 0,
+  max_duration   REAL,
+  PRIMARY KEY (day, agent, action)
+) WITHOUT ROWID;
+
+-- 2) Meta bump
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.8');
@@ -0,0 +1,19 @@
+-- v1.9: write-lock contention per command (filled by Database.record_lock_waits)
+-- Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS lock_waits (
+  id           INTEGER PRIMARY KEY,
+  command      TEXT NOT NULL,
+  pid          INTEGER,
+  recorded_at  DATETIME DEFAULT (datetime('now')),
+  transactions INTEGER NOT NULL DEFAULT 0,
+  contended    INTEGER NOT NULL DEFAULT 0,
+  retries      INTEGER NOT NULL DEFAULT 0,
+  wait_ms      REAL NOT NULL DEFAULT 0,
+  max_wait_ms  REAL NOT NULL DEFAULT 0,
+  timeouts     INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_lock_waits_recorded ON lock_waits(recorded_at);
+
+INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version','1.9');
@@ -0,0 +1,430 @@
+"""Online, consistent database backups.
+
+Copies are taken with SQLite's online backup API (or ``VACUUM INTO`` in
+compact mode), so they include committed data still in the WAL file and are
+never torn by concurrent writers. The copy is verified with
+``PRAGMA integrity_check`` before it is optionally compressed into place.
+
+``SnapshotStore`` keeps incremental snapshots instead: fixed-size chunks of
+the database file stored by content hash, plus a manifest per snapshot.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Pages copied per backup step (4 MB at the default 4 KB page size) and the
+# pause between steps that lets other connections get at the database
+STEP_PAGES = 1024
+STEP_PAUSE = 0.005
+
+# Output suffix for each compression method
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be created or fails verification."""
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Infer the compression method from an output file name."""
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return method
+    return None
+
+
+def _zstd_module():
+    """Return a zstd implementation, preferring the standard library."""
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        raise BackupError(
+            "zstd compression needs the 'zstandard' package (pip install clide[backup])"
+        ) from None
+
+
+def open_compressed(path: str, method: Optional[str], mode: str = "wb"):
+    """Open ``path`` for binary reading or writing with the given compression."""
+    if method is None:
+        return open(path, mode)
+    if method == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if method == "zstd":
+        return _zstd_module().open(path, mode)
+    raise BackupError(f"Unknown compression: {method}")
+
+
+def verify_database(path: str) -> None:
+    """Run ``PRAGMA integrity_check`` on a database file; raise BackupError if not ok."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"Backup copy is not a valid database: {e}") from e
+    finally:
+        conn.close()
+    if problems != ["ok"]:
+        raise BackupError(f"Backup copy failed integrity check: {'; '.join(problems[:5])}")
+
+
+def copy_database(
+    db_path: str,
+    target: str,
+    compact: bool = False,
+    step_pages: int = STEP_PAGES,
+    pause: float = STEP_PAUSE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    """Write a consistent copy of ``db_path`` to ``target``.
+
+    The backup API copies ``step_pages`` pages per step and sleeps ``pause``
+    seconds between steps. ``compact`` uses ``VACUUM INTO`` instead, which
+    also drops free pages and defragments the copy in one read transaction.
+    ``progress`` is called with (pages done, total pages).
+    """
+    source = sqlite3.connect(db_path)
+    try:
+        source.execute("PRAGMA busy_timeout = 5000")
+        if compact:
+            source.execute("VACUUM INTO ?", (target,))
+        else:
+            _backup_pages(source, target, step_pages, pause, progress)
+    finally:
+        source.close()
+
+    # Leave a self-contained file rather than one expecting a -wal sidecar
+    dest = sqlite3.connect(target)
+    try:
+        dest.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dest.close()
+
+
+def _backup_pages(
+    source: sqlite3.Connection,
+    target: str,
+    step_pages: int,
+    pause: float,
+    progress: Optional[Callable[[int, int], None]],
+) -> None:
+    """Copy ``source`` into ``target`` with the online backup API, step by step."""
+
+    def step(status: int, remaining: int, total: int) -> None:
+        if progress:
+            progress(total - remaining, total)
+        if remaining and pause:
+            time.sleep(pause)
+
+    dest = sqlite3.connect(target)
+    try:
+        source.backup(dest, pages=step_pages, progress=step)
+    finally:
+        dest.close()
+
+
+def backup_database(
+    db_path: str,
+    output: str,
+    compact: bool = False,
+    compression: Optional[str] = None,
+    verify: bool = True,
+    step_pages: int = STEP_PAGES,
+    pause: float = STEP_PAUSE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Back up ``db_path`` to ``output`` and return size and timing figures.
+
+    The copy is written next to ``output`` under a temporary name, verified,
+    then compressed or renamed into place, so ``output`` never holds a partial
+    backup. Returns ``bytes`` (database copy size), ``output_bytes``,
+    ``seconds`` and ``mb_per_s`` (copy throughput over the whole run).
+    """
+    if not Path(db_path).exists():
+        raise BackupError(f"Database not found: {db_path}")
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise BackupError(f"Unknown compression: {compression}")
+    if compression == "zstd":
+        _zstd_module()
+
+    output_dir = Path(output).resolve().parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".clide-backup-", suffix=".db", dir=output_dir)
+    os.close(fd)
+    os.unlink(tmp_path)  # VACUUM INTO requires that the target does not exist
+
+    started = time.perf_counter()
+    try:
+        try:
+            copy_database(db_path, tmp_path, compact, step_pages, pause, progress)
+        except sqlite3.Error as e:
+            raise BackupError(f"Backup failed: {e}") from e
+        if verify:
+            verify_database(tmp_path)
+
+        size = os.path.getsize(tmp_path)
+        if compression:
+            packed_path = tmp_path + COMPRESSION_SUFFIXES[compression]
+            with open(tmp_path, "rb") as src, open_compressed(packed_path, compression) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            os.replace(packed_path, output)
+        else:
+            os.replace(tmp_path, output)
+    finally:
+        leftovers = [tmp_path + suffix for suffix in ("", "-wal", "-shm", "-journal")]
+        leftovers += [tmp_path + suffix for suffix in COMPRESSION_SUFFIXES.values()]
+        for path in leftovers:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    seconds = time.perf_counter() - started
+    return {
+        "path": output,
+        "bytes": size,
+        "output_bytes": os.path.getsize(output),
+        "seconds": seconds,
+        "mb_per_s": size / (1024 * 1024) / seconds if seconds else 0.0,
+        "verified": verify,
+        "compact": compact,
+        "compression": compression,
+    }
+
+
+# ========== Incremental snapshots ==========
+
+# Snapshot chunks are whole pages: 16 x 4 KB pages by default
+CHUNK_PAGES = 16
+
+# Attempts at lining up a read snapshot with a fully checkpointed WAL
+SNAPSHOT_ATTEMPTS = 20
+
+# Chunks younger than this survive pruning, so a backup running concurrently
+# never loses chunks it wrote but has not referenced in a manifest yet
+GC_GRACE_SECONDS = 3600
+
+
+@contextmanager
+def _stable_file(db_path: str):
+    """Hold a read transaction while the main database file matches it.
+
+    In WAL mode committed pages may still live only in the -wal file. After
+    opening a read snapshot, a passive checkpoint from a second connection
+    can copy frames up to (but never past) that snapshot into the main file;
+    if it copies every frame, the file equals the snapshot and stays that way
+    until the read transaction ends. Writers are never blocked. Yields the
+    page size.
+    """
+    reader = sqlite3.connect(db_path, isolation_level=None)
+    checkpointer = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        reader.execute("PRAGMA busy_timeout = 5000")
+        checkpointer.execute("PRAGMA busy_timeout = 5000")
+        page_size = reader.execute("PRAGMA page_size").fetchone()[0]
+        wal = reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for attempt in range(SNAPSHOT_ATTEMPTS):
+            reader.execute("BEGIN")
+            reader.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            if not wal:
+                break  # the shared lock alone keeps the file stable
+            busy, frames, copied = checkpointer.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            if not busy and frames == copied:
+                break
+            reader.execute("ROLLBACK")
+            time.sleep(0.05 * (attempt + 1))
+        else:
+            raise BackupError("Database kept changing; could not take a stable snapshot")
+        try:
+            yield page_size
+        finally:
+            reader.execute("ROLLBACK")
+    finally:
+        checkpointer.close()
+        reader.close()
+
+
+class SnapshotStore:
+    """Content-addressed store of incremental database snapshots.
+
+    Layout::
+
+        <root>/chunks/<ab>/<blake2b hex>   zlib-compressed fixed-size chunks
+        <root>/snapshots/<id>.json         manifest: ordered chunk hashes
+
+    A snapshot only writes chunks the store does not already hold, so its
+    write cost scales with the pages changed since earlier snapshots.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.snapshots_dir = self.root / "snapshots"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _write_chunk(self, digest: str, data: bytes) -> bool:
+        """Store a chunk unless it exists already; returns True if written."""
+        path = self._chunk_path(digest)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(zlib.compress(data, 1))
+        os.replace(tmp, path)
+        return True
+
+    def _read_chunk(self, digest: str) -> bytes:
+        try:
+            data = zlib.decompress(self._chunk_path(digest).read_bytes())
+        except (OSError, zlib.error) as e:
+            raise BackupError(f"Chunk {digest} is missing or unreadable: {e}") from e
+        if hashlib.blake2b(data, digest_size=20).hexdigest() != digest:
+            raise BackupError(f"Chunk {digest} is corrupt")
+        return data
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All snapshot manifests, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        manifests = []
+        for path in sorted(self.snapshots_dir.glob("*.json")):
+            with open(path) as f:
+                manifests.append(json.load(f))
+        return manifests
+
+    def get(self, snapshot_id: str) -> Dict[str, Any]:
+        """Load a manifest by id, or the newest one for ``"latest"``."""
+        if snapshot_id == "latest":
+            manifests = self.list()
+            if not manifests:
+                raise BackupError(f"No snapshots in {self.root}")
+            return manifests[-1]
+        path = self.snapshots_dir / f"{snapshot_id}.json"
+        if not path.exists():
+            raise BackupError(f"Snapshot not found: {snapshot_id}")
+        with open(path) as f:
+            return json.load(f)
+
+    def create(self, db_path: str, chunk_pages: int = CHUNK_PAGES) -> Dict[str, Any]:
+        """Take a snapshot of ``db_path`` and return its manifest.
+
+        The whole file is read and hashed (sequentially, under a stable read
+        snapshot), but only chunks not already in the store are written.
+        """
+        if not Path(db_path).exists():
+            raise BackupError(f"Database not found: {db_path}")
+        started = time.perf_counter()
+        chunks: List[str] = []
+        new_chunks = new_bytes = size = 0
+
+        try:
+            with _stable_file(db_path) as page_size:
+                chunk_size = page_size * chunk_pages
+                with open(db_path, "rb") as f:
+                    while True:
+                        data = f.read(chunk_size)
+                        if not data:
+                            break
+                        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+                        chunks.append(digest)
+                        size += len(data)
+                        if self._write_chunk(digest, data):
+                            new_chunks += 1
+                            new_bytes += len(data)
+        except sqlite3.Error as e:
+            raise BackupError(f"Snapshot failed: {e}") from e
+
+        now = datetime.now(timezone.utc)
+        manifests = self.list()
+        manifest = {
+            "id": now.strftime("%Y%m%dT%H%M%S%fZ"),
+            "created_at": now.isoformat(timespec="seconds"),
+            "parent": manifests[-1]["id"] if manifests else None,
+            "source": str(Path(db_path).resolve()),
+            "size": size,
+            "page_size": page_size,
+            "chunk_size": chunk_size,
+            "chunks": chunks,
+            "new_chunks": new_chunks,
+            "new_bytes": new_bytes,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots_dir / f"{manifest['id']}.json"
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)
+        return manifest
+
+    def restore(self, snapshot_id: str, target: str, overwrite: bool = False) -> Dict[str, Any]:
+        """Rebuild a snapshot into ``target``, verified before it is moved into place.
+
+        Stale ``-wal``/``-shm`` files next to ``target`` are removed, since
+        SQLite would otherwise replay them over the restored pages.
+        """
+        manifest = self.get(snapshot_id)
+        if Path(target).exists() and not overwrite:
+            raise BackupError(f"{target} exists; pass overwrite to replace it")
+
+        target_dir = Path(target).resolve().parent
+        target_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".clide-restore-", suffix=".db", dir=target_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for digest in manifest["chunks"]:
+                    out.write(self._read_chunk(digest))
+            if os.path.getsize(tmp_path) != manifest["size"]:
+                raise BackupError("Restored size does not match the manifest")
+            verify_database(tmp_path)
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(target + suffix):
+                    os.unlink(target + suffix)
+            os.replace(tmp_path, target)
+        finally:
+            for path in (tmp_path, tmp_path + "-wal", tmp_path + "-shm"):
+                if os.path.exists(path):
+                    os.unlink(path)
+        return manifest
+
+    def prune(self, keep: int) -> Dict[str, int]:
+        """Delete all but the newest ``keep`` snapshots and unreferenced chunks."""
+        manifests = self.list()
+        doomed = manifests[:-keep] if keep > 0 else manifests
+        for manifest in doomed:
+            (self.snapshots_dir / f"{manifest['id']}.json").unlink()
+
+        live = {digest for manifest in manifests[len(doomed) :] for digest in manifest["chunks"]}
+        cutoff = time.time() - GC_GRACE_SECONDS
+        freed_chunks = freed_bytes = 0
+        if self.chunks_dir.exists():
+            for path in self.chunks_dir.glob("*/*"):
+                if path.name in live or path.name.startswith("."):
+                    continue
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                path.unlink()
+                freed_chunks += 1
+                freed_bytes += stat.st_size
+        return {"snapshots": len(doomed), "chunks": freed_chunks, "bytes": freed_bytes}
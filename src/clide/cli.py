@@ -1,23 +1,27 @@
 """Main CLI entry point for Clide."""
 
+import atexit
 import sys
+from pathlib import Path
 
 import click
-from rich.console import Console
 
 from . import __version__
 from .config import config
-from .utils import print_error, print_info
-
-console = Console()
+from .utils import get_console, print_error, print_info
 
 
 @click.group()
 @click.version_option(version=__version__, prog_name="clide")
 @click.option("-v", "--verbose", is_flag=True, help="Enable verbose output")
 @click.option("--db", default=None, help="Path to database file")
+@click.option(
+    "--via-daemon",
+    is_flag=True,
+    help="Forward to a running 'clide serve' daemon even if CLIDE_DAEMON=off",
+)
 @click.pass_context
-def cli(ctx, verbose, db):
+def cli(ctx, verbose, db, via_daemon):
     """Clide - World-class AI agent CLI for project memory management.
 
     Transform your repository into a self-documenting, self-improving project
@@ -29,6 +33,33 @@ def cli(ctx, verbose, db):
         config.db_path = db
     config.verbose = verbose
 
+    if ctx.invoked_subcommand not in NO_AUTO_MIGRATE:
+        upgrade_schema()
+    if ctx.invoked_subcommand:
+        ctx.call_on_close(lambda: record_lock_waits(ctx.invoked_subcommand))
+
+
+# Commands that create, replace or copy the database file as-is
+NO_AUTO_MIGRATE = {"init", "backup", "restore", "migrate"}
+
+
+def record_lock_waits(command: str) -> None:
+    """Store the command's write-lock waits, if it opened the database at all."""
+    module = sys.modules.get(f"{__package__}.db")
+    if module is not None and Path(module.db.db_path).exists():
+        module.db.record_lock_waits(command)
+
+
+def upgrade_schema() -> None:
+    """Apply pending migrations to an existing database before a command runs."""
+    from .db import db
+
+    if not Path(db.db_path).exists() or db.is_current():
+        return
+    applied = db.migrate()
+    if applied and config.verbose:
+        print_info(f"Applied {len(applied)} migration(s): {', '.join(applied)}")
+
 
 @cli.command()
 @click.option("--force", is_flag=True, help="Force re-initialization")
@@ -40,14 +71,49 @@ def init(ctx, force):
     init_command(force)
 
 
+@cli.command()
+@click.option("--status", is_flag=True, help="List migrations without applying them")
+@click.pass_context
+def migrate(ctx, status):
+    """Apply pending schema migrations."""
+    from .commands.init import migrate_command
+
+    migrate_command(status)
+
+
 @cli.command()
 @click.option("--summary", is_flag=True, help="Show brief summary only")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["table", "context", "json"]),
+    default="table",
+    help="table for people; context (plain text) or json brief for agents",
+)
+@click.option(
+    "--budget",
+    type=click.IntRange(min=1),
+    default=2000,
+    help="Token budget for --format context/json",
+)
+@click.option(
+    "--files",
+    multiple=True,
+    help="Rank landmines for these paths (comma-separated or repeated)",
+)
+@click.option("--diff", is_flag=True, help="Rank landmines for the files and code changed in git")
 @click.pass_context
-def boot(ctx, summary):
-    """Boot Clide context: load landmines, open work, and deployment info."""
+def boot(ctx, summary, fmt, budget, files, diff):
+    """Boot Clide context: load landmines, open work, and deployment info.
+
+    The context/json brief is ranked and cut to --budget tokens. It is cached
+    next to the database and rebuilt only for tables changed since.
+    --files/--diff show the landmines most relevant to that working set
+    (file names, tags and changed identifiers) instead of the latest ones.
+    """
     from .commands.boot import boot_command
 
-    boot_command(summary)
+    boot_command(summary, fmt, budget, files, diff)
 
 
 @cli.command()
@@ -97,28 +163,51 @@ def fix(ctx, defect_id, auto):
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["markdown", "json", "csv"]),
+    type=click.Choice(["markdown", "json", "jsonl", "csv"]),
     default="markdown",
     help="Output format",
 )
+@click.option("--tag", "-t", help="Only rows with any of these comma-separated tags")
+@click.option("--limit", "-n", type=int, help="Page size (default: all rows)")
+@click.option("--before", type=int, help="Page of rows keyed below this row id")
+@click.option("--after", type=int, help="Page of rows keyed above this row id")
 @click.pass_context
-def report(ctx, table, output, fmt):
-    """Generate markdown report for specified table."""
+def report(ctx, table, output, fmt, tag, limit, before, after):
+    """Generate markdown report for specified table.
+
+    Rows are streamed from the database to the output, so memory use stays
+    flat regardless of table size. With --limit the report is one page.
+    Reports list newest first (config: by name), so for dated reports the
+    next page is --before <last id> and the previous one --after <first id>.
+    """
     from .commands.report import report_command
 
-    report_command(table, output, fmt)
+    if before is not None and after is not None:
+        raise click.UsageError("Use only one of --before and --after")
+    report_command(table, output, fmt, tag, limit, before, after)
 
 
 @cli.command()
 @click.option("--host", default="127.0.0.1", help="Dashboard host")
 @click.option("--port", default=5000, type=int, help="Dashboard port")
 @click.option("--debug", is_flag=True, help="Run in debug mode")
+@click.option("--threads", default=8, type=int, help="Worker threads (waitress)")
 @click.pass_context
-def dashboard(ctx, host, port, debug):
+def dashboard(ctx, host, port, debug, threads):
     """Launch web dashboard for viewing memory bank."""
     from .commands.dashboard import dashboard_command
 
-    dashboard_command(host, port, debug)
+    dashboard_command(host, port, debug, threads)
+
+
+@cli.command()
+@click.option("--socket", "socket_path", default=None, help="Socket path (default: <db>.sock)")
+@click.pass_context
+def serve(ctx, socket_path):
+    """Run a resident daemon that executes forwarded commands with a warm database."""
+    from .commands.serve import serve_command
+
+    serve_command(socket_path)
 
 
 @cli.command()
@@ -143,13 +232,66 @@ def config_cmd(ctx, key, value, scope, delete, list_all):
 
 
 @cli.command()
-@click.option("--output", "-o", help="Backup file path")
+@click.option("--output", "-o", help="Backup file path (.gz/.zst implies compression)")
+@click.option("--compact", is_flag=True, help="Write a defragmented copy with VACUUM INTO")
+@click.option(
+    "--compress",
+    "compression",
+    type=click.Choice(["gzip", "zstd"]),
+    help="Compress the backup (zstd needs the 'zstandard' package)",
+)
+@click.option("--no-verify", is_flag=True, help="Skip PRAGMA integrity_check on the copy")
+@click.option("--step-pages", type=int, help="Pages copied per backup step (default 1024)")
+@click.option(
+    "--incremental", is_flag=True, help="Snapshot into the chunk store, writing only changes"
+)
+@click.option("--store", help="Snapshot store directory (default: CLIDE_SNAPSHOT_DIR)")
+@click.option("--list", "list_snapshots", is_flag=True, help="List incremental snapshots")
+@click.option("--prune", "keep", type=int, help="Keep only the newest N snapshots")
+@click.pass_context
+def backup(
+    ctx,
+    output,
+    compact,
+    compression,
+    no_verify,
+    step_pages,
+    incremental,
+    store,
+    list_snapshots,
+    keep,
+):
+    """Create a consistent backup of the memory bank database.
+
+    Uses SQLite's online backup API, so the copy includes data still in the
+    WAL file and is safe to take while other processes write. With
+    --incremental, only chunks that changed since earlier snapshots are
+    stored; restore one with 'clide restore'.
+
+    Examples:
+        clide backup -o backup.db.gz
+        clide backup --incremental
+        clide backup --prune 10
+    """
+    from .commands.backup import backup_command, snapshot_command
+
+    if incremental or list_snapshots or keep is not None:
+        snapshot_command(store, incremental, list_snapshots, keep)
+        return
+    backup_command(output, compact, compression, not no_verify, step_pages)
+
+
+@cli.command()
+@click.argument("snapshot")
+@click.option("--output", "-o", help="Restore to this path (default: the configured database)")
+@click.option("--store", help="Snapshot store directory (default: CLIDE_SNAPSHOT_DIR)")
+@click.option("--force", is_flag=True, help="Overwrite an existing database file")
 @click.pass_context
-def backup(ctx, output):
-    """Create a backup of the memory bank database."""
-    from .commands.backup import backup_command
+def restore(ctx, snapshot, output, store, force):
+    """Restore an incremental snapshot (an id from 'clide backup --list', or 'latest')."""
+    from .commands.backup import restore_command
 
-    backup_command(output)
+    restore_command(snapshot, output, store, force)
 
 
 @cli.command()
@@ -206,28 +348,237 @@ def landmine(ctx, summary, cause, impact, remediation, tags):
     landmine_command(summary, cause, impact, remediation, tags)
 
 
+@cli.group(invoke_without_command=True)
+@click.option("--recount", is_flag=True, help="Rebuild health counters from the base tables")
+@click.pass_context
+def doctor(ctx, recount):
+    """Verify derived data such as the health counters.
+
+    Without options, reports any drift between the trigger-maintained
+    counters and the real row counts. --recount rebuilds them.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from .commands.doctor import doctor_command
+
+    doctor_command(recount)
+
+
+@doctor.command("locks")
+@click.option("--since", help="Only waits recorded at or after this time (ISO 8601, or 2h/7d ago)")
+def doctor_locks(since):
+    """Show time spent waiting for the write lock, per command."""
+    from .commands.doctor import locks_command
+
+    locks_command(since)
+
+
+@cli.command()
+@click.argument("names", nargs=-1)
+@click.option(
+    "--kind",
+    "-k",
+    type=click.Choice(["landmines", "stories"]),
+    default="landmines",
+    help="Tagged table (story labels count as tags)",
+)
+@click.option("--days", type=int, help="Only count items created in the last N days")
+@click.option("--limit", "-n", type=int, default=20, help="Maximum rows to show")
+@click.pass_context
+def tags(ctx, names, kind, days, limit):
+    """Show tag usage counts, or the items carrying the given tags.
+
+    Examples:
+        clide tags
+        clide tags --kind stories --days 30
+        clide tags redis perf
+    """
+    from .commands.tags import tags_command
+
+    tags_command(list(names), kind, days, limit)
+
+
 @cli.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option(
+    "--kind",
+    "-k",
+    "kinds",
+    multiple=True,
+    type=click.Choice(["landmines", "defects", "stories"]),
+    help="Only search these tables (repeatable)",
+)
+@click.option("--limit", "-n", type=int, default=20, help="Maximum number of results")
+@click.option("--raw", is_flag=True, help="Use FTS5 query syntax (OR, NEAR, prefix*, col:)")
+@click.pass_context
+def search(ctx, query, kinds, limit, raw):
+    """Full-text search landmines, defects and stories (BM25 ranked).
+
+    Examples:
+        clide search redis timeout
+        clide search -k landmines "auth token"
+        clide search --raw "deploy* OR rollback"
+    """
+    from .commands.search import search_command
+
+    search_command(" ".join(query), kinds or None, limit, raw)
+
+
+@cli.command("import")
+@click.argument("table", type=click.Choice(["stories", "defects", "landmines", "testing"]))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["jsonl", "csv"]),
+    default=None,
+    help="Input format (default: from file extension)",
+)
+@click.option("--batch-size", type=int, default=1000, help="Rows per batch/commit")
+@click.option("--defer-indexes", is_flag=True, help="Rebuild table indexes once after loading")
+@click.option("--restart", is_flag=True, help="Ignore saved progress and start from row 1")
+@click.pass_context
+def import_cmd(ctx, table, path, fmt, batch_size, defer_indexes, restart):
+    """Bulk import stories, defects, landmines or test runs from JSONL/CSV.
+
+    Each batch is committed together with its progress, so an interrupted
+    import resumes from the last committed batch when re-run.
+
+    Examples:
+        clide import stories tickets.jsonl
+        clide import defects bugs.csv --batch-size 5000 --defer-indexes
+    """
+    from .commands.importer import import_command
+
+    import_command(table, path, fmt, batch_size, defer_indexes, restart)
+
+
+@cli.group(invoke_without_command=True)
 @click.option("--limit", "-n", type=int, default=50, help="Number of entries to show")
 @click.option("--agent", help="Filter by agent name")
+@click.option("--action", help="Filter by action")
+@click.option("--trace", "trace_id", help="Filter by trace id")
+@click.option("--since", help="Entries started at or after this time (ISO 8601, or 30m/2h/7d ago)")
+@click.option("--until", help="Entries started before this time (ISO 8601, or 30m/2h/7d ago)")
+@click.option("--parent", "parent_id", type=int, help="Only this entry and its descendants")
+@click.option("--open", "open_only", is_flag=True, help="Only actions that have not ended")
+@click.option("--before", type=int, help="Show entries older than this log id")
+@click.option("--after", type=int, help="Show entries newer than this log id")
 @click.pass_context
-def log(ctx, limit, agent):
-    """Show recent agent activity log."""
+def log(ctx, limit, agent, action, trace_id, since, until, parent_id, open_only, before, after):
+    """Show recent agent activity log.
+
+    Filters combine with AND. Every filter and the --before/--after pages are
+    index range scans, so paging deep into a large log is as fast as the
+    first page.
+
+    Examples:
+        clide log --agent Clide --since 2h
+        clide log --trace 3f2c... --open
+        clide log --parent 120
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
     from .commands.log import log_command
 
-    log_command(limit, agent)
+    if before is not None and after is not None:
+        raise click.UsageError("Use only one of --before and --after")
+    log_command(limit, agent, before, after, action, trace_id, since, until, parent_id, open_only)
+
+
+@cli.command()
+@click.argument("trace_id", required=False)
+@click.option("--stats", is_flag=True, help="Show p50/p95/p99 duration per action instead")
+@click.option("--since", help="With --stats: only actions started since (ISO 8601, or 2h/7d ago)")
+@click.option("--agent", help="With --stats: only this agent's actions")
+@click.pass_context
+def trace(ctx, trace_id, stats, since, agent):
+    """Show a trace as a span tree with durations, self-time and critical path.
+
+    Examples:
+        clide trace 3f2c9a1e-...
+        clide trace --stats --since 7d
+    """
+    from .commands.trace import trace_command
+
+    if not trace_id and not stats:
+        raise click.UsageError("Give a TRACE_ID or --stats")
+    trace_command(trace_id, stats, since, agent)
+
+
+@log.command("compact")
+@click.option(
+    "--older-than",
+    help="Compact rows started before this (ISO 8601, or e.g. 30d ago; "
+    "default: CLIDE_LOG_RETENTION_DAYS)",
+)
+@click.option("--archive", "archive_path", help="Also copy raw rows into this archive database")
+@click.option(
+    "--batch-size", type=int, default=1000, help="Span trees (root and children) per transaction"
+)
+@click.option("--dry-run", is_flag=True, help="Only count the rows that would be compacted")
+@click.option(
+    "--enable-incremental-vacuum",
+    is_flag=True,
+    help="Convert the database so compaction can shrink the file (one full VACUUM)",
+)
+def log_compact(older_than, archive_path, batch_size, dry_run, enable_incremental_vacuum):
+    """Roll old log rows into daily aggregates, optionally archive, then delete.
+
+    Rows are processed in short batches so other writers are not locked out,
+    and freed pages are returned with incremental_vacuum afterwards.
+
+    Examples:
+        clide log compact --older-than 30d
+        clide log compact --archive agents_log_archive.db
+    """
+    from .commands.log import compact_command
+
+    compact_command(older_than, archive_path, batch_size, dry_run, enable_incremental_vacuum)
+
+
+def flush_log_on_exit() -> None:
+    """Write out buffered agent log entries before the process exits."""
+    from .db import db
+
+    if not db.flush_log(close=True):
+        print_error("Timed out writing buffered agent log entries")
+    stats = db.log_stats
+    if stats and (stats["dropped"] or stats["failed"]):
+        print_error(
+            f"Agent log buffer lost {stats['dropped']} dropped and {stats['failed']} "
+            "failed entries"
+        )
+    elif stats and config.verbose:
+        print_info(f"Agent log buffer: {stats['flushed']} entries in {stats['batches']} batches")
+
+
+# Exit status for a temporary failure (sysexits.h), e.g. the write lock timed out
+EX_TEMPFAIL = 75
 
 
 def main():
     """Main entry point."""
+    if config.log_buffer:
+        atexit.register(flush_log_on_exit)
     try:
         cli(obj={})
     except KeyboardInterrupt:
         print_info("\nOperation cancelled by user")
         sys.exit(130)
     except Exception as e:
+        from .db import LockTimeout
+
+        if isinstance(e, LockTimeout):
+            # Another writer held the lock past CLIDE_LOCK_TIMEOUT; retryable
+            print_error(f"Memory bank busy: {e}")
+            print_info("See 'clide doctor locks' for contention by command")
+            sys.exit(EX_TEMPFAIL)
         print_error(f"Fatal error: {e}")
         if config.verbose:
-            console.print_exception()
+            get_console().print_exception()
         sys.exit(1)
 
 
@@ -0,0 +1,99 @@
+"""Thin ``clide`` entry point that forwards commands to a running daemon.
+
+Only the standard library and ``clide.config`` are imported before the
+daemon is tried, so a forwarded command costs interpreter start-up plus one
+socket round trip. The command's output is written as the daemon streams
+it. Without a daemon the full CLI runs in-process.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from .config import config
+from .daemon import DaemonError, runs_locally, socket_path_for, stream_request
+
+
+def split_global_options(argv: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Separate the group options that precede the subcommand from the rest."""
+    options: Dict[str, Any] = {"db": None, "verbose": False, "via_daemon": False}
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        if arg in ("-v", "--verbose"):
+            options["verbose"] = True
+        elif arg == "--via-daemon":
+            options["via_daemon"] = True
+        elif arg == "--db" and index + 1 < len(argv):
+            index += 1
+            options["db"] = argv[index]
+        elif arg.startswith("--db="):
+            options["db"] = arg[len("--db=") :]
+        else:
+            break
+        index += 1
+    return options, argv[index:]
+
+
+def forward(
+    argv: List[str], stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None
+) -> Optional[int]:
+    """Run argv on the daemon and return its exit code.
+
+    Output is written to stdout/stderr (default: this process's) as it
+    arrives. Returns None if the command should run in this process instead.
+    """
+    options, command = split_global_options(argv)
+    if config.daemon == "off" and not options["via_daemon"]:
+        return None
+    if runs_locally(command):
+        return None
+
+    db_path = options["db"] or config.db_path
+    tty = sys.stdout.isatty()
+    width = None
+    if tty:
+        try:
+            width = os.get_terminal_size(sys.stdout.fileno()).columns
+        except OSError:
+            width = 80
+    request = {
+        "argv": command,
+        "cwd": os.getcwd(),
+        "db": os.path.abspath(db_path),
+        "verbose": options["verbose"],
+        "tty": tty and config.plain_output != "true",
+        "width": width,
+        "env": {k: v for k, v in os.environ.items() if k.startswith("CLIDE_")},
+    }
+    streams = {"stdout": stdout or sys.stdout, "stderr": stderr or sys.stderr}
+    answered = False
+    for frame in stream_request(socket_path_for(db_path), request):
+        if not answered and "error" in frame:
+            return None
+        answered = True
+        if "exit_code" in frame:
+            return frame["exit_code"]
+        for name, text in frame.items():
+            streams[name].write(text)
+            streams[name].flush()
+    if not answered:
+        return None
+    raise DaemonError("Daemon stopped before the command finished")
+
+
+def main() -> None:
+    """Console entry point: use the daemon when available, else the full CLI."""
+    try:
+        exit_code = forward(sys.argv[1:])
+    except DaemonError as e:
+        sys.stderr.write(f"✗ {e}\n")
+        sys.exit(1)
+
+    if exit_code is None:
+        from .cli import main as cli_main
+
+        cli_main()
+        return
+
+    sys.exit(exit_code)
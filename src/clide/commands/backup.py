@@ -1,36 +1,156 @@
 """Backup command implementation."""
 
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
 from ..config import config
-from ..utils import print_error, print_info, print_success
+from ..utils import print_error, print_info, print_success, print_table
 
 
-def backup_command(output: Optional[str] = None) -> None:
+def backup_command(
+    output: Optional[str] = None,
+    compact: bool = False,
+    compression: Optional[str] = None,
+    verify: bool = True,
+    step_pages: Optional[int] = None,
+) -> None:
     """Create a backup of the memory bank database."""
     if not config.db_exists:
         print_error("Database not found. Nothing to backup.")
         return
 
+    from ..backup import (
+        COMPRESSION_SUFFIXES,
+        STEP_PAGES,
+        BackupError,
+        backup_database,
+        compression_for,
+    )
+
     if output is None:
         # Generate default backup path with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output = f"memory_bank_backup_{timestamp}.db"
+    elif compression is None:
+        compression = compression_for(output)
+    if compression and not output.endswith(COMPRESSION_SUFFIXES[compression]):
+        output += COMPRESSION_SUFFIXES[compression]
 
-    print_info(f"Creating backup: {output}")
+    mode = "VACUUM INTO" if compact else "online backup"
+    print_info(f"Creating backup ({mode}): {output}")
 
     try:
-        from ..db import db
-
-        success = db.backup(output)
-        if success:
-            print_success(f"Backup created successfully: {output}")
-            db.log_action(
-                "Clide", "backup", f"Created backup: {output}", trace_id=db.generate_trace_id()
-            )
-        else:
-            print_error("Backup failed")
-    except Exception as e:
-        print_error(f"Backup failed: {e}")
-        raise
+        result = backup_database(
+            config.db_path,
+            output,
+            compact=compact,
+            compression=compression,
+            verify=verify,
+            step_pages=step_pages or STEP_PAGES,
+        )
+    except BackupError as e:
+        print_error(str(e))
+        return
+
+    size_mb = result["bytes"] / (1024 * 1024)
+    details = f"{size_mb:.1f} MB in {result['seconds']:.2f}s ({result['mb_per_s']:.1f} MB/s)"
+    if compression:
+        details += f", {compression} {result['output_bytes'] / (1024 * 1024):.1f} MB"
+    if verify:
+        details += ", integrity verified"
+    print_success(f"Backup created successfully: {output}")
+    print_info(details)
+
+    from ..db import db
+
+    db.log_action(
+        "Clide",
+        "backup",
+        f"Created backup: {output} ({details})",
+        trace_id=db.generate_trace_id(),
+    )
+
+
+def snapshot_command(
+    store: Optional[str] = None,
+    create: bool = False,
+    list_snapshots: bool = False,
+    keep: Optional[int] = None,
+) -> None:
+    """Take, list or prune incremental snapshots."""
+    from ..backup import BackupError, SnapshotStore
+
+    snapshots = SnapshotStore(store or config.snapshot_dir)
+
+    if create:
+        if not config.db_exists:
+            print_error("Database not found. Nothing to backup.")
+            return
+        try:
+            manifest = snapshots.create(config.db_path)
+        except BackupError as e:
+            print_error(str(e))
+            return
+        size_mb = manifest["size"] / (1024 * 1024)
+        print_success(f"Snapshot {manifest['id']} created in {snapshots.root}")
+        print_info(
+            f"{size_mb:.1f} MB scanned in {manifest['seconds']:.2f}s; "
+            f"{manifest['new_chunks']} of {len(manifest['chunks'])} chunks new "
+            f"({manifest['new_bytes'] / (1024 * 1024):.1f} MB written)"
+        )
+
+    if keep is not None:
+        result = snapshots.prune(keep)
+        print_success(
+            f"Pruned {result['snapshots']} snapshots and {result['chunks']} chunks "
+            f"({result['bytes'] / (1024 * 1024):.1f} MB)"
+        )
+
+    if list_snapshots:
+        manifests = snapshots.list()
+        if not manifests:
+            print_info(f"No snapshots in {snapshots.root}")
+            return
+        print_table(
+            [
+                {
+                    "ID": m["id"],
+                    "Created": m["created_at"],
+                    "Size": f"{m['size'] / (1024 * 1024):.1f} MB",
+                    "New": f"{m['new_bytes'] / (1024 * 1024):.1f} MB",
+                }
+                for m in manifests
+            ],
+            title=f"Snapshots in {snapshots.root}",
+            columns=["ID", "Created", "Size", "New"],
+        )
+
+
+def restore_command(
+    snapshot: str,
+    output: Optional[str] = None,
+    store: Optional[str] = None,
+    force: bool = False,
+) -> None:
+    """Restore an incremental snapshot to a database file."""
+    from ..backup import BackupError, SnapshotStore
+
+    target = output or config.db_path
+    if Path(target).exists() and not force:
+        print_error(f"{target} already exists. Use --force to overwrite it.")
+        return
+    if target == config.db_path:
+        # Drop pooled connections to the file about to be replaced
+        from ..db import pool
+
+        pool.close_all()
+
+    try:
+        manifest = SnapshotStore(store or config.snapshot_dir).restore(
+            snapshot, target, overwrite=force
+        )
+    except BackupError as e:
+        print_error(str(e))
+        return
+    print_success(f"Restored snapshot {manifest['id']} to {target} (integrity verified)")
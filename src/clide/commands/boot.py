@@ -1,6 +1,11 @@
 """Boot command implementation."""
 
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 from ..db import db
+from ..log_writer import span_now
+from ..recall import RecallError, WorkingSet, build_working_set, recall
 from ..utils import (
     format_priority,
     print_error,
@@ -11,85 +16,154 @@ from ..utils import (
 )
 
 
-def boot_command(summary: bool = False) -> None:
-    """Boot Clide context: load landmines, open work, and deployment info."""
-    print_success("Booting Clide context...")
+def boot_command(
+    summary: bool = False,
+    fmt: str = "table",
+    budget: int = 2000,
+    files: Sequence[str] = (),
+    diff: bool = False,
+) -> None:
+    """Boot Clide context: load landmines, open work, and deployment info.
+
+    ``fmt`` "context" / "json" print a token-budgeted brief for agents
+    instead of tables, built from the cached context pack. With ``files`` or
+    ``diff`` the landmines shown are those most relevant to that working set
+    rather than the most recent.
+    """
+    working_set = None
+    if files or diff:
+        try:
+            working_set = build_working_set(files, diff)
+        except RecallError as e:
+            print_error(f"Cannot read the working set: {e}")
+            sys.exit(1)
+
+    if fmt != "table":
+        context_brief(fmt, budget, working_set)
+        return
 
+    print_success("Booting Clide context...")
+    started_at = span_now()
     trace_id = db.generate_trace_id()
-    log_id = db.log_action("Clide", "boot", "Loading context", trace_id=trace_id)
 
+    # Reads share one snapshot and take no write lock; the log entry is
+    # written in one short commit afterwards
     try:
-        # Get open work
-        open_work = db.get_open_work(limit=20)
-        print_info(f"Found {len(open_work)} open work items")
-
-        if not summary and open_work:
-            # Format for display
-            display_work = []
-            for item in open_work:
-                display_work.append(
-                    {
-                        "Kind": item["kind"].title(),
-                        "ID": f"#{item['id']}",
-                        "Title": truncate(item["title"], 40),
-                        "Status": item["status"],
-                        "Priority": format_priority(item["priority"]),
-                    }
-                )
-            print_table(
-                display_work,
-                title="Open Work",
-                columns=["Kind", "ID", "Title", "Status", "Priority"],
-            )
-
-        # Get landmines
-        landmines = db.get_landmines(limit=10)
-        print_info(f"Found {len(landmines)} recent landmines")
-
-        if not summary and landmines:
-            display_landmines = []
-            for item in landmines:
-                display_landmines.append(
-                    {
-                        "ID": f"#{item['id']}",
-                        "Summary": truncate(item["summary"], 50),
-                        "Tags": item.get("tags", ""),
-                    }
-                )
-            print_table(
-                display_landmines, title="Recent Landmines", columns=["ID", "Summary", "Tags"]
-            )
-
-        # Get critical defects
-        defects = db.get_open_defects()
-        critical_defects = [d for d in defects if d["severity"] == "critical"]
-
-        if critical_defects:
-            print_info(f"⚠️  {len(critical_defects)} CRITICAL defects require attention!")
-            if not summary:
-                display_defects = []
-                for item in critical_defects:
-                    display_defects.append(
+        with db.transaction(write=False):
+            # Get open work
+            open_work = db.get_open_work(limit=20)
+            print_info(f"Found {len(open_work)} open work items")
+
+            if not summary and open_work:
+                # Format for display
+                display_work = []
+                for item in open_work:
+                    display_work.append(
                         {
+                            "Kind": item["kind"].title(),
                             "ID": f"#{item['id']}",
-                            "Title": truncate(item["title"], 50),
+                            "Title": truncate(item["title"], 40),
                             "Status": item["status"],
+                            "Priority": format_priority(item["priority"]),
                         }
                     )
                 print_table(
-                    display_defects, title="Critical Defects", columns=["ID", "Title", "Status"]
+                    display_work,
+                    title="Open Work",
+                    columns=["Kind", "ID", "Title", "Status", "Priority"],
                 )
 
-        # Get recent configuration
-        configs = db.get_config()
-        if configs and not summary:
-            print_info(f"Configuration: {len(configs)} settings loaded")
+            # Get landmines
+            landmines, title, truncated = select_landmines(working_set, limit=10)
+            print_info(f"Found {len(landmines)} {title.lower()}")
+            if truncated:
+                print_info("Landmine recall ran out of time; ranking may be partial")
 
-        print_success("Context loaded successfully")
-        print_info(f"Session trace ID: {trace_id}")
+            if not summary and landmines:
+                display_landmines = []
+                for item in landmines:
+                    display_landmines.append(
+                        {
+                            "ID": f"#{item['id']}",
+                            "Summary": truncate(item["summary"], 50),
+                            "Tags": item.get("tags", ""),
+                        }
+                    )
+                print_table(display_landmines, title=title, columns=["ID", "Summary", "Tags"])
 
-        db.end_action(log_id)
+            # Get critical defects
+            critical_defects = db.get_open_defects(severity="critical")
+
+            if critical_defects:
+                print_info(f"⚠️  {len(critical_defects)} CRITICAL defects require attention!")
+                if not summary:
+                    display_defects = []
+                    for item in critical_defects:
+                        display_defects.append(
+                            {
+                                "ID": f"#{item['id']}",
+                                "Title": truncate(item["title"], 50),
+                                "Status": item["status"],
+                            }
+                        )
+                    print_table(
+                        display_defects, title="Critical Defects", columns=["ID", "Title", "Status"]
+                    )
+
+            # Get recent configuration
+            configs = db.get_config()
+            if configs and not summary:
+                print_info(f"Configuration: {len(configs)} settings loaded")
 
     except Exception as e:
         print_error(f"Failed to boot context: {e}")
         raise
+
+    with db.transaction():
+        log_id = db.log_action(
+            "Clide", "boot", "Loading context", trace_id=trace_id, started_at=started_at
+        )
+        db.end_action(log_id)
+
+    print_success("Context loaded successfully")
+    print_info(f"Session trace ID: {trace_id}")
+
+
+def select_landmines(
+    working_set: Optional[WorkingSet], limit: int
+) -> Tuple[List[Dict[str, Any]], str, bool]:
+    """Landmines for boot, a title for them, and whether recall was cut short.
+
+    Recalled for the working set when there is one and anything matches,
+    otherwise the most recently updated.
+    """
+    if working_set is not None:
+        rows, truncated = recall(db, working_set, limit=limit)
+        if rows:
+            return rows, "Relevant Landmines", truncated
+    return db.get_landmines(limit=limit), "Recent Landmines", False
+
+
+def context_brief(fmt: str, budget: int, working_set: Optional[WorkingSet] = None) -> None:
+    """Print the context pack fitted to budget tokens, as text or JSON."""
+    from ..context import (
+        MAX_SECTION_ITEMS,
+        fit_budget,
+        load_pack,
+        render_json,
+        render_text,
+        with_landmines,
+    )
+
+    started_at = span_now()
+    pack, _ = load_pack(db)
+    if working_set is not None:
+        rows, title, _ = select_landmines(working_set, limit=MAX_SECTION_ITEMS)
+        if title == "Relevant Landmines":
+            pack = with_landmines(pack, rows)
+    brief = fit_budget(pack, budget)
+    sys.stdout.write(render_json(brief) if fmt == "json" else render_text(brief))
+
+    with db.transaction():
+        note = f"Context pack ({fmt}, {budget} tokens)"
+        db.end_action(db.log_action("Clide", "boot", note, started_at=started_at))
@@ -0,0 +1,104 @@
+"""Doctor command implementation."""
+
+from typing import Optional
+
+from ..db import db
+from ..utils import (
+    format_duration,
+    parse_time,
+    print_error,
+    print_info,
+    print_success,
+    print_table,
+    print_warning,
+)
+
+
+def doctor_command(recount: bool = False) -> None:
+    """Check derived data (health counters) against the base tables."""
+    if not db.has_table("counters"):
+        print_error("Counters table not found; run 'clide migrate'")
+        return
+
+    with db.transaction(write=recount):
+        drift = db.recount(fix=recount)
+
+        if not drift:
+            print_success("Health counters match the base tables")
+        else:
+            print_warning(f"{len(drift)} counter(s) drifted from the base tables")
+            print_table(
+                [
+                    {
+                        "Kind": d["kind"],
+                        "Status": d["status"] or "-",
+                        "Severity": d["severity"] or "-",
+                        "Stored": d["stored"],
+                        "Actual": d["actual"],
+                    }
+                    for d in drift
+                ],
+                title="Counter drift",
+                columns=["Kind", "Status", "Severity", "Stored", "Actual"],
+            )
+            if recount:
+                print_success("Counters rebuilt from the base tables")
+            else:
+                print_info("Run 'clide doctor --recount' to rebuild them")
+
+        if recount:
+            db.log_action(
+                "Clide",
+                "doctor_recount",
+                f"Rebuilt health counters ({len(drift)} drifted)",
+                trace_id=db.generate_trace_id(),
+            )
+
+
+def locks_command(since: Optional[str] = None) -> None:
+    """Report time commands spent waiting for the database write lock."""
+    if not db.has_table("lock_waits"):
+        print_error("Lock statistics table not found; run 'clide migrate'")
+        return
+
+    try:
+        since_ts = parse_time(since) if since else None
+    except ValueError as e:
+        print_error(str(e))
+        return
+
+    if db.write_lock_held():
+        print_warning("Another connection holds the write lock right now")
+    else:
+        print_success("Write lock is free")
+
+    rows = db.get_lock_report(since_ts)
+    if not rows:
+        print_info(
+            "No command has waited for the write lock" + (f" since {since}" if since else "")
+        )
+        return
+
+    print_table(
+        [
+            {
+                "Command": row["command"],
+                "Waited": row["invocations"],
+                "Retries": row["retries"],
+                "Total": format_duration(row["wait_ms"] / 1000),
+                "P50": format_duration(row["p50_ms"] / 1000),
+                "P95": format_duration(row["p95_ms"] / 1000),
+                "Max": format_duration(row["max_ms"] / 1000),
+                "Timeouts": row["timeouts"],
+                "Last Seen": row["last_seen"],
+            }
+            for row in rows
+        ],
+        title="Write-lock waits by command",
+    )
+    timeouts = sum(row["timeouts"] for row in rows)
+    if timeouts:
+        print_warning(
+            f"{timeouts} write(s) gave up after CLIDE_LOCK_TIMEOUT; "
+            "consider 'clide serve' to funnel writes through one process"
+        )
@@ -10,7 +10,8 @@ def fix_command(defect_id: Optional[int] = None, auto: bool = False) -> None:
     """Plan, patch, and prove a fix for a defect."""
     if defect_id is None:
         # Show all open defects
-        defects = db.get_open_defects()
+        with db.transaction(write=False):
+            defects = db.get_open_defects()
         if not defects:
             print_success("No open defects! 🎉")
             return
@@ -33,7 +34,8 @@ def fix_command(defect_id: Optional[int] = None, auto: bool = False) -> None:
         return
 
     # Get specific defect
-    defect = db.execute_one("SELECT * FROM defects WHERE id = ?", (defect_id,))
+    with db.transaction(write=False):
+        defect = db.execute_one("SELECT * FROM defects WHERE id = ?", (defect_id,))
     if not defect:
         print_error(f"Defect #{defect_id} not found")
         return
@@ -0,0 +1,84 @@
+"""Import command implementation."""
+
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from ..db import db
+from ..utils import print_error, print_info, print_success
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSONL or CSV file one at a time.
+
+    Empty CSV cells become NULL so column defaults and nullable columns
+    behave the same as in JSONL input.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def import_command(
+    table: str,
+    path: str,
+    fmt: Optional[str] = None,
+    batch_size: int = 1000,
+    defer_indexes: bool = False,
+    restart: bool = False,
+) -> None:
+    """Bulk import records into a memory bank table."""
+    checkpoint_key = f"{table}:{Path(path).resolve()}"
+    if restart:
+        db.clear_import_checkpoint(checkpoint_key)
+
+    resumed_at = db.get_import_checkpoint(checkpoint_key)
+    if resumed_at:
+        print_info(f"Resuming import after {resumed_at} committed rows")
+
+    start = time.perf_counter()
+    last_report = start
+
+    def report_progress(committed: int) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= 1.0:
+            rate = (committed - resumed_at) / (now - start)
+            print_info(f"{committed} rows committed ({rate:,.0f} rows/s)")
+            last_report = now
+
+    try:
+        inserted = db.bulk_insert(
+            table,
+            read_records(path, fmt),
+            batch_size=batch_size,
+            checkpoint_key=checkpoint_key,
+            defer_indexes=defer_indexes,
+            progress=report_progress,
+        )
+    except ValueError as e:
+        print_error(f"Import failed: {e}")
+        print_info("Committed batches are kept; re-run the same command to resume")
+        raise
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    db.clear_import_checkpoint(checkpoint_key)
+    print_success(
+        f"Imported {inserted} rows into {table} in {elapsed:.2f}s "
+        f"({inserted / elapsed:,.0f} rows/s)"
+    )
+
+    db.log_action(
+        "Clide",
+        "import",
+        f"Imported {inserted} rows into {table} from {path}",
+        trace_id=db.generate_trace_id(),
+    )
@@ -3,8 +3,8 @@
 from pathlib import Path
 
 from ..config import config
-from ..db import db
-from ..utils import print_error, print_info, print_success
+from ..db import db, discover_migrations
+from ..utils import print_error, print_info, print_success, print_table
 
 
 def init_command(force: bool = False) -> None:
@@ -18,6 +18,7 @@ def init_command(force: bool = False) -> None:
 
     if force and db_path.exists():
         print_info(f"Removing existing database at {config.db_path}")
+        db.close()
         db_path.unlink()
 
     print_info(f"Initializing database at {config.db_path}")
@@ -36,3 +37,28 @@ def init_command(force: bool = False) -> None:
     except Exception as e:
         print_error(f"Failed to initialize database: {e}")
         raise
+
+
+def migrate_command(status: bool = False) -> None:
+    """Apply pending schema migrations, or list them with ``status``."""
+    if not Path(db.db_path).exists():
+        print_error(f"Database not found at {db.db_path}")
+        print_info("Run 'clide init' to create it")
+        return
+
+    pending = db.pending_migrations()
+    if status:
+        rows = [
+            {"migration": name, "status": "pending" if name in pending else "applied"}
+            for name in discover_migrations()
+        ]
+        print_table(rows, title=f"Migrations (user_version {db.user_version})")
+        return
+
+    if not pending:
+        print_success("Schema is up to date")
+        return
+    applied = db.migrate()
+    for name in applied:
+        print_info(f"Applied {name}")
+    print_success(f"Applied {len(applied)} migration(s)")
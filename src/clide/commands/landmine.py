@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from ..db import db
+from ..db import db, split_tags
 from ..utils import print_info, print_success
 
 
@@ -14,22 +14,23 @@ def landmine_command(
     tags: Optional[str] = None,
 ) -> None:
     """Record a gotcha/landmine for future reference."""
-    landmine_id = db.create_landmine(
-        summary=summary,
-        cause=cause,
-        impact=impact,
-        remediation=remediation,
-        tags=tags,
-    )
+    with db.transaction():
+        landmine_id = db.create_landmine(
+            summary=summary,
+            cause=cause,
+            impact=impact,
+            remediation=remediation,
+            tags=tags,
+        )
+
+        # Log creation
+        db.log_action(
+            "Clide",
+            "create_landmine",
+            f"Recorded landmine #{landmine_id}: {summary}",
+            trace_id=db.generate_trace_id(),
+        )
 
     print_success(f"Recorded landmine #{landmine_id}: {summary}")
     if tags:
-        print_info(f"Tags: {tags}")
-
-    # Log creation
-    db.log_action(
-        "Clide",
-        "create_landmine",
-        f"Recorded landmine #{landmine_id}: {summary}",
-        trace_id=db.generate_trace_id(),
-    )
+        print_info(f"Tags: {', '.join(split_tags(tags))}")
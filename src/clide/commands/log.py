@@ -2,25 +2,54 @@
 
 from typing import Optional
 
+from ..config import config
 from ..db import db
-from ..utils import format_datetime, print_info, print_table, truncate
-
-
-def log_command(limit: int = 50, agent: Optional[str] = None) -> None:
-    """Show recent agent activity log."""
-    if agent:
-        logs = db.execute(
-            """
-            SELECT id, agent, action, details, trace_id, started_at, ended_at
-            FROM agents_log
-            WHERE agent = ?
-            ORDER BY started_at DESC
-            LIMIT ?
-            """,
-            (agent, limit),
+from ..utils import (
+    format_datetime,
+    parse_time,
+    print_error,
+    print_info,
+    print_success,
+    print_table,
+    print_warning,
+    truncate,
+)
+
+
+def log_command(
+    limit: int = 50,
+    agent: Optional[str] = None,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    action: Optional[str] = None,
+    trace_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    open_only: bool = False,
+) -> None:
+    """Show recent agent activity log.
+
+    ``before`` / ``after`` page through older or newer entries relative to a
+    log id, newest first either way. The remaining arguments filter entries;
+    every combination is served by an index (see migration v1.7).
+    """
+    try:
+        logs = db.get_actions_page(
+            limit,
+            before=before,
+            after=after,
+            agent=agent,
+            action=action,
+            trace_id=trace_id,
+            since=parse_time(since) if since else None,
+            until=parse_time(until) if until else None,
+            parent_id=parent_id,
+            open_only=open_only,
         )
-    else:
-        logs = db.get_recent_actions(limit)
+    except ValueError as e:
+        print_error(str(e))
+        return
 
     if not logs:
         print_info("No log entries found")
@@ -35,11 +64,57 @@ def log_command(limit: int = 50, agent: Optional[str] = None) -> None:
                 "Action": log["action"],
                 "Details": truncate(log.get("details", ""), 40),
                 "Started": format_datetime(log["started_at"]),
+                "Ended": format_datetime(log["ended_at"]) or "open",
             }
         )
 
     print_table(
         display_logs,
-        title=f"Agent Activity Log (last {len(logs)})",
-        columns=["ID", "Agent", "Action", "Details", "Started"],
+        title=f"Agent Activity Log ({len(logs)} entries)",
+        columns=["ID", "Agent", "Action", "Details", "Started", "Ended"],
     )
+    if len(logs) == limit:
+        print_info(f"Older entries: clide log --before {logs[-1]['id']}")
+
+
+def compact_command(
+    older_than: Optional[str] = None,
+    archive_path: Optional[str] = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    enable_incremental_vacuum: bool = False,
+) -> None:
+    """Compact agent log rows older than the retention horizon."""
+    try:
+        before = parse_time(older_than or f"{config.log_retention_days}d")
+    except ValueError as e:
+        print_error(str(e))
+        return
+
+    if enable_incremental_vacuum:
+        print_info("Converting database to incremental auto-vacuum (full VACUUM)...")
+        db.enable_incremental_vacuum()
+
+    if dry_run:
+        count = db.count_compactable(before)
+        print_info(f"{count} log rows started before {before} would be compacted")
+        return
+
+    result = db.compact_log(before, batch_size=batch_size, archive_path=archive_path)
+    if not result["rows"]:
+        print_info(f"No log rows started before {before}")
+        return
+
+    message = f"Compacted {result['rows']} log rows in {result['batches']} batches"
+    if archive_path:
+        message += f", archived to {archive_path}"
+    print_success(message)
+
+    released = db.vacuum_free_pages()
+    if released is None:
+        print_warning(
+            "Database does not use incremental auto-vacuum, so freed pages stay in "
+            "the file; run with --enable-incremental-vacuum once to change that"
+        )
+    else:
+        print_info(f"Released {released} free pages")
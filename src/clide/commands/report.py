@@ -1,62 +1,162 @@
 """Report command implementation."""
 
 import csv
+import io
+import itertools
 import json
-from typing import Optional
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from ..db import db
+from ..db import TAG_LINKS, db, split_tags
 from ..utils import print_error, print_info, print_success
 
+# Source table, fixed filter and ordering for each report. Rows are streamed
+# from the resulting query; nothing is materialized in full.
+REPORT_SOURCES = {
+    "milestones": ("milestones", None, "achieved_at DESC"),
+    "landmines": ("landmines", None, "updated_at DESC"),
+    "defects": ("defects", None, "created_at DESC"),
+    "stories": ("stories", None, "created_at DESC"),
+    "config": ("configuration", "scope = 'global'", "name"),
+    "testing": ("testing", None, "created_at DESC"),
+    "deployment": ("deployment", None, "created_at DESC"),
+}
+
+# Flush output once this many characters are buffered
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# Page size when --before/--after is given without --limit
+DEFAULT_PAGE_SIZE = 100
+
+
+def report_filter(table: str, tags: Optional[List[str]] = None) -> Tuple[Optional[str], tuple]:
+    """Return the WHERE condition (or None) and params for a report."""
+    _, condition, _ = REPORT_SOURCES[table]
+    conditions = [condition] if condition else []
+    params: tuple = ()
+    if tags:
+        tag_condition, params = db.tag_filter(table, tags)
+        conditions.append(tag_condition)
+    return (" AND ".join(conditions) or None), params
+
+
+def build_report_query(table: str, tags: Optional[List[str]] = None) -> Tuple[str, tuple]:
+    """Build the streaming query for a report, optionally filtered by tags."""
+    source, _, order = REPORT_SOURCES[table]
+    condition, params = report_filter(table, tags)
+    where = f" WHERE {condition}" if condition else ""
+    return f"SELECT * FROM {source}{where} ORDER BY {order}", params
+
+
+def get_report_page(
+    table: str,
+    limit: int,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    tags: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch one keyset page of a report, in report order.
+
+    ``before`` / ``after`` are row ids whose sort key bounds the page.
+    Raises ValueError if the cursor row does not exist.
+    """
+    source, _, order = REPORT_SOURCES[table]
+    order_col, _, direction = order.partition(" ")
+    condition, params = report_filter(table, tags)
+
+    keys = {}
+    for name, row_id in (("before", before), ("after", after)):
+        if row_id is not None:
+            keys[name] = db.get_cursor_key(source, order_col, row_id)
+            if keys[name] is None:
+                raise ValueError(f"No {table} row #{row_id}")
+    return db.get_page(
+        source,
+        order_col,
+        limit,
+        before=keys.get("before"),
+        after=keys.get("after"),
+        condition=condition,
+        params=params,
+        descending=direction == "DESC",
+    )
 
-def report_command(table: str, output: Optional[str] = None, fmt: str = "markdown") -> None:
-    """Generate report for specified table."""
-    # Query data based on table
-    if table == "milestones":
-        data = db.execute("SELECT * FROM milestones ORDER BY achieved_at DESC")
-    elif table == "landmines":
-        data = db.get_landmines(limit=1000)
-    elif table == "defects":
-        data = db.execute("SELECT * FROM defects ORDER BY created_at DESC")
-    elif table == "stories":
-        data = db.execute("SELECT * FROM stories ORDER BY created_at DESC")
-    elif table == "config":
-        data = db.get_config()
-    elif table == "testing":
-        data = db.execute("SELECT * FROM testing ORDER BY created_at DESC")
-    elif table == "deployment":
-        data = db.execute("SELECT * FROM deployment ORDER BY created_at DESC")
-    else:
-        print_error(f"Unknown table: {table}")
-        return
 
-    if not data:
-        print_info(f"No data found for table '{table}'")
+def report_command(
+    table: str,
+    output: Optional[str] = None,
+    fmt: str = "markdown",
+    tag: Optional[str] = None,
+    limit: Optional[int] = None,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+) -> None:
+    """Generate report for specified table.
+
+    Without ``limit``/``before``/``after`` the whole table is streamed;
+    otherwise one keyset page is written.
+    """
+    if table not in REPORT_SOURCES:
+        print_error(f"Unknown table: {table}")
         return
-
-    # Convert to dict
-    data = [dict(row) for row in data]
-
-    # Generate report based on format
-    if fmt == "markdown":
-        content = generate_markdown(table, data)
-    elif fmt == "json":
-        content = json.dumps(data, indent=2, default=str)
-    elif fmt == "csv":
-        content = generate_csv(data)
-    else:
-        print_error(f"Unknown format: {fmt}")
+    if tag and table not in TAG_LINKS:
+        print_error(f"Tag filtering is only supported for {', '.join(TAG_LINKS)}")
         return
 
-    # Output
-    if output:
-        with open(output, "w") as f:
-            f.write(content)
-        print_success(f"Report written to {output}")
-    else:
-        from rich.console import Console
-
-        console = Console()
-        console.print(content)
+    paged = limit is not None or before is not None or after is not None
+
+    # Reads share one snapshot; the log entry below takes the write lock
+    # only after it, so no writer waits on a long read
+    with db.transaction(write=False):
+        if paged:
+            try:
+                page = get_report_page(
+                    table, limit or DEFAULT_PAGE_SIZE, before, after, split_tags(tag)
+                )
+            except ValueError as e:
+                print_error(str(e))
+                return
+            empty = not page
+            rows: Iterable[Dict[str, Any]] = page
+        else:
+            query, params = build_report_query(table, split_tags(tag))
+            stream = (dict(row) for row in db.iter_rows(query, params))
+            # Peek at the first row rather than counting them all up front
+            first = next(stream, None)
+            empty = first is None
+            rows = itertools.chain([first], stream)
+
+        if empty:
+            print_info(f"No data found for table '{table}'")
+            return
+
+        # Generate report based on format
+        if fmt == "markdown":
+            # Only the markdown header states the total, so only it pays for
+            # a count over a streamed report
+            if paged:
+                total = len(page)
+            else:
+                total = db.execute_one(f"SELECT COUNT(*) FROM ({query})", params)[0]
+            chunks = iter_markdown(table, rows, total)
+        elif fmt == "json":
+            chunks = iter_json(rows)
+        elif fmt == "jsonl":
+            chunks = iter_jsonl(rows)
+        elif fmt == "csv":
+            chunks = iter_csv(rows)
+        else:
+            print_error(f"Unknown format: {fmt}")
+            return
+
+        # Output
+        if output:
+            with open(output, "w", newline="") as f:
+                write_chunks(chunks, f)
+            print_success(f"Report written to {output}")
+        else:
+            write_chunks(chunks, sys.stdout)
+            sys.stdout.write("\n")
 
     # Log report generation
     db.log_action(
@@ -67,44 +167,82 @@ def report_command(table: str, output: Optional[str] = None, fmt: str = "markdow
     )
 
 
-def generate_markdown(table: str, data: list) -> str:
-    """Generate markdown report."""
-    lines = [f"# {table.title()} Report", ""]
-    now_time = db.execute_one("SELECT datetime('now')")[0]
-    lines.append(f"Generated: {now_time}")
-    lines.append(f"Total entries: {len(data)}")
-    lines.append("")
-
-    if not data:
-        return "\n".join(lines)
-
-    # Get columns
-    columns = list(data[0].keys())
-
-    # Table header
-    lines.append("| " + " | ".join(columns) + " |")
-    lines.append("| " + " | ".join(["---"] * len(columns)) + " |")
+def write_chunks(chunks: Iterable[str], stream) -> None:
+    """Write formatter output to stream in buffered chunks."""
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= WRITE_CHUNK_SIZE:
+            stream.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    if buffer:
+        stream.write("".join(buffer))
+    stream.flush()
+
+
+def iter_markdown(
+    table: str, rows: Iterable[Dict[str, Any]], total: int, generated_at: Optional[str] = None
+) -> Iterator[str]:
+    """Yield a markdown report line by line."""
+    if generated_at is None:
+        generated_at = db.execute_one("SELECT datetime('now')")[0]
+    yield f"# {table.title()} Report\n\n"
+    yield f"Generated: {generated_at}\n"
+    yield f"Total entries: {total}\n"
+
+    columns = None
+    escaped_pipe = "\\|"
+    for row in rows:
+        if columns is None:
+            # Table header
+            columns = list(row.keys())
+            yield "\n| " + " | ".join(columns) + " |\n"
+            yield "| " + " | ".join(["---"] * len(columns)) + " |"
 
-    # Table rows
-    for row in data:
-        escaped_pipe = "\\|"
         values = [
             str(row.get(col, "")).replace("\n", " ").replace("|", escaped_pipe) for col in columns
         ]
-        lines.append("| " + " | ".join(values) + " |")
+        yield "\n| " + " | ".join(values) + " |"
 
-    return "\n".join(lines)
 
+def iter_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield a CSV report one row at a time."""
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()))
+            writer.writeheader()
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
 
-def generate_csv(data: list) -> str:
-    """Generate CSV report."""
-    if not data:
-        return ""
 
-    import io
+def iter_json(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield a pretty-printed JSON array one element at a time."""
+    first = True
+    for row in rows:
+        element = json.dumps(row, indent=2, default=str).replace("\n", "\n  ")
+        yield ("[\n  " if first else ",\n  ") + element
+        first = False
+    yield "[]" if first else "\n]"
+
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=list(data[0].keys()))
-    writer.writeheader()
-    writer.writerows(data)
-    return output.getvalue()
+def iter_jsonl(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield one compact JSON object per line."""
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def generate_markdown(table: str, data: list) -> str:
+    """Generate markdown report."""
+    return "".join(iter_markdown(table, data, len(data)))
+
+
+def generate_csv(data: list) -> str:
+    """Generate CSV report."""
+    return "".join(iter_csv(data))
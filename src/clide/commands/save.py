@@ -59,16 +59,20 @@ def save_command(message: Optional[str] = None, trace_id: Optional[str] = None)
 
     details = message or "Session checkpoint"
 
-    log_id = db.log_action("Clide", "save", details, trace_id=trace_id)
+    with db.transaction():
+        log_id = db.log_action("Clide", "save", details, trace_id=trace_id)
+        db.end_action(log_id)
 
     print_success(f"Session saved (trace: {trace_id})")
     print_info(f"Log entry #{log_id}")
 
     # Get summary stats
-    stories = db.get_open_stories()
-    defects = db.get_open_defects()
+    with db.transaction(write=False):
+        health = db.get_health_summary()
+    stories = health["stories"]["total"]
+    defects = health["defects"]["total"]
 
-    print_info(f"Current state: {len(stories)} open stories, {len(defects)} open defects")
+    print_info(f"Current state: {stories} open stories, {defects} open defects")
 
     # Append to agents_log.md
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -78,5 +82,3 @@ def save_command(message: Optional[str] = None, trace_id: Optional[str] = None)
         print_info("Updated agents_log.md")
     else:
         print_warning("Could not update agents_log.md (continuing anyway)")
-
-    db.end_action(log_id)
@@ -0,0 +1,49 @@
+"""Search command implementation."""
+
+import sqlite3
+from typing import Optional, Sequence
+
+from ..db import db
+from ..utils import print_error, print_info, print_table, truncate
+
+# Display label for each searchable kind
+KIND_LABELS = {"landmines": "Landmine", "defects": "Defect", "stories": "Story"}
+
+
+def search_command(
+    query: str, kinds: Optional[Sequence[str]] = None, limit: int = 20, raw: bool = False
+) -> None:
+    """Full-text search landmines, defects and stories."""
+    if not db.has_table("landmines_fts"):
+        # Memory banks created before v1.2 get their index built on first use
+        print_info("Building full-text search index (one-time)...")
+        db.migrate()
+
+    try:
+        results = db.search(query, kinds=kinds, limit=limit, raw=raw)
+    except sqlite3.OperationalError as e:
+        if raw:
+            print_error(f"Invalid search query: {e}")
+            return
+        raise
+
+    if not results:
+        print_info(f"No matches for '{query}'")
+        return
+
+    display = []
+    for item in results:
+        display.append(
+            {
+                "Kind": KIND_LABELS.get(item["kind"], item["kind"]),
+                "ID": f"#{item['id']}",
+                "Title": truncate(item["title"], 40),
+                "Match": item["snippet"].replace("\n", " "),
+            }
+        )
+
+    print_table(
+        display,
+        title=f"Search results for '{query}' ({len(results)})",
+        columns=["Kind", "ID", "Title", "Match"],
+    )
@@ -0,0 +1,28 @@
+"""Serve command implementation."""
+
+import os
+from typing import Optional
+
+from ..config import config
+from ..utils import print_error, print_info, print_success
+
+
+def serve_command(socket_path: Optional[str] = None) -> None:
+    """Run the clide daemon in the foreground."""
+    from ..daemon import DaemonError, serve, socket_path_for
+
+    if not config.db_exists:
+        print_error(f"Database not found at {config.db_path}")
+        print_info("Run 'clide init' to create it")
+        return
+
+    def ready(server) -> None:
+        print_success(f"clide daemon (pid {os.getpid()}) listening on {server.socket_path}")
+        print_info(f"Serving {server.db_path}; press Ctrl+C to stop")
+
+    try:
+        serve(socket_path or socket_path_for(), ready=ready)
+    except DaemonError as e:
+        print_error(str(e))
+        return
+    print_info("clide daemon stopped")
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from ..db import db
+from ..db import db, split_tags
 from ..utils import print_info, print_success
 
 
@@ -14,21 +14,24 @@ def story_command(
     labels: Optional[str] = None,
 ) -> None:
     """Create a new story/work item."""
-    story_id = db.create_story(
-        title=title,
-        description=description,
-        priority=priority,
-        assignee=assignee,
-        labels=labels,
-    )
+    with db.transaction():
+        story_id = db.create_story(
+            title=title,
+            description=description,
+            priority=priority,
+            assignee=assignee,
+            labels=labels,
+        )
+
+        # Log creation
+        db.log_action(
+            "Clide",
+            "create_story",
+            f"Created story #{story_id}: {title}",
+            trace_id=db.generate_trace_id(),
+        )
 
     print_success(f"Created story #{story_id}: {title}")
     print_info(f"Priority: {priority}, Assignee: {assignee or 'unassigned'}")
-
-    # Log creation
-    db.log_action(
-        "Clide",
-        "create_story",
-        f"Created story #{story_id}: {title}",
-        trace_id=db.generate_trace_id(),
-    )
+    if labels:
+        print_info(f"Labels: {', '.join(split_tags(labels))}")
@@ -0,0 +1,45 @@
+"""Tags command implementation."""
+
+from typing import List, Optional
+
+from ..db import db, split_tags
+from ..utils import print_info, print_table, truncate
+
+
+def tags_command(
+    names: List[str], kind: str = "landmines", days: Optional[int] = None, limit: int = 20
+) -> None:
+    """Show tag usage counts, or the items carrying the given tags."""
+    wanted = split_tags(",".join(names))
+
+    if not wanted:
+        since = None
+        if days:
+            since = db.execute_one("SELECT datetime('now', ?)", (f"-{days} days",))[0]
+        counts = db.get_tag_counts(kind, since=since, limit=limit)
+        if not counts:
+            print_info(f"No tagged {kind} found")
+            return
+        print_table(
+            [{"Tag": c["tag"], "Count": c["count"]} for c in counts],
+            title=f"Tags on {kind}",
+            columns=["Tag", "Count"],
+        )
+        return
+
+    items = db.get_tagged(kind, wanted, limit=limit)
+    if not items:
+        print_info(f"No {kind} tagged {', '.join(wanted)}")
+        return
+
+    text_col, tags_col = ("summary", "tags") if kind == "landmines" else ("title", "labels")
+    display = []
+    for item in items:
+        display.append(
+            {
+                "ID": f"#{item['id']}",
+                "Text": truncate(item[text_col], 50),
+                "Tags": ", ".join(split_tags(item[tags_col])),
+            }
+        )
+    print_table(display, title=f"{kind.title()} tagged {', '.join(wanted)}")
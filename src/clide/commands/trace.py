@@ -0,0 +1,166 @@
+"""Trace command implementation."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..db import db
+from ..utils import (
+    format_duration,
+    get_console,
+    parse_time,
+    plain_output,
+    print_error,
+    print_info,
+    print_plain,
+    print_table,
+)
+
+
+def build_span_tree(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Nest spans from Database.get_trace() under their parents.
+
+    Returns the root spans; each span gains ``children`` (in start order) and
+    ``self_time``, the part of its duration not covered by any child.
+    """
+    by_id = {span["id"]: dict(span, children=[]) for span in spans}
+    roots = []
+    for span in by_id.values():
+        parent = by_id.get(span["parent_id"]) if span["depth"] else None
+        (parent["children"] if parent else roots).append(span)
+    for span in by_id.values():
+        span["self_time"] = self_time(span)
+    return roots
+
+
+def self_time(span: Dict[str, Any]) -> Optional[float]:
+    """Duration of a span minus the union of its children's intervals."""
+    if span["duration"] is None:
+        return None
+    start, end = _timestamp(span["started_at"]), _timestamp(span["ended_at"])
+    intervals = sorted(
+        (max(start, _timestamp(child["started_at"])), min(end, _timestamp(child["ended_at"])))
+        for child in span["children"]
+        if child["ended_at"] is not None
+    )
+
+    # Merge overlapping children so parallel work is not subtracted twice
+    covered = 0.0
+    current_start = current_end = None
+    for child_start, child_end in intervals:
+        if child_end <= child_start:
+            continue
+        if current_end is None or child_start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = child_start, child_end
+        else:
+            current_end = max(current_end, child_end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return max(span["duration"] - covered, 0.0)
+
+
+def critical_path(roots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Follow the last-finishing span at each level, from the roots down.
+
+    Open spans count as finishing last, since everything above waits on them.
+    """
+    path = []
+    level = roots
+    while level:
+        span = max(
+            level, key=lambda s: (s["ended_at"] is None, s["ended_at"] or "", s["started_at"])
+        )
+        path.append(span)
+        level = span["children"]
+    return path
+
+
+def _timestamp(value: str) -> float:
+    """Seconds since the epoch for an agents_log timestamp."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def trace_command(
+    trace_id: Optional[str] = None,
+    stats: bool = False,
+    since: Optional[str] = None,
+    agent: Optional[str] = None,
+) -> None:
+    """Show one trace as a span tree, or duration percentiles per action."""
+    if stats:
+        show_stats(since, agent)
+        return
+
+    spans = db.get_trace(trace_id)
+    if not spans:
+        print_error(f"No spans found for trace {trace_id}")
+        return
+
+    roots = build_span_tree(spans)
+    path = critical_path(roots)
+    on_path = {span["id"] for span in path}
+
+    def label(span: Dict[str, Any]) -> str:
+        text = (
+            f"#{span['id']} [bold]{span['action']}[/bold] [dim]({span['agent']})[/dim] "
+            f"{format_duration(span['duration'])}"
+        )
+        if span["children"] and span["self_time"] is not None:
+            text += f" [dim]self {format_duration(span['self_time'])}[/dim]"
+        return f"[yellow]◆ {text}[/yellow]" if span["id"] in on_path else text
+
+    heading = f"[cyan]Trace {trace_id}[/cyan] — {len(spans)} spans"
+    if plain_output():
+
+        def lines(span: Dict[str, Any], depth: int) -> List[str]:
+            out = ["  " * depth + label(span)]
+            for child in span["children"]:
+                out.extend(lines(child, depth + 1))
+            return out
+
+        print_plain("\n".join([heading] + [line for root in roots for line in lines(root, 1)]))
+    else:
+        from rich.tree import Tree
+
+        def add(node: Tree, span: Dict[str, Any]) -> None:
+            branch = node.add(label(span))
+            for child in span["children"]:
+                add(branch, child)
+
+        tree = Tree(heading)
+        for root in roots:
+            add(tree, root)
+        get_console().print(tree)
+
+    total = path[0]["duration"] if path else None
+    steps = " → ".join(span["action"] for span in path)
+    print_info(f"Critical path ({format_duration(total)}): {steps}")
+
+
+def show_stats(since: Optional[str] = None, agent: Optional[str] = None) -> None:
+    """Print p50/p95/p99 durations per action."""
+    try:
+        rows = db.get_action_percentiles(since=parse_time(since) if since else None, agent=agent)
+    except ValueError as e:
+        print_error(str(e))
+        return
+    if not rows:
+        print_info("No completed actions found")
+        return
+
+    print_table(
+        [
+            {
+                "Action": row["action"],
+                "Count": row["count"],
+                "p50": format_duration(row["p50"]),
+                "p95": format_duration(row["p95"]),
+                "p99": format_duration(row["p99"]),
+                "Max": format_duration(row["max"]),
+            }
+            for row in rows
+        ],
+        title="Action durations (slowest p95 first)",
+        columns=["Action", "Count", "p50", "p95", "p99", "Max"],
+    )
@@ -1,29 +1,74 @@
 """Configuration management for Clide."""
 
 import os
+from contextlib import suppress
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional
 
-from dotenv import load_dotenv
 
-# Load .env file if it exists
-load_dotenv()
+def load_env_file() -> Optional[Path]:
+    """Load the nearest .env file, searching from the working directory up.
+
+    python-dotenv is only imported when a file is found, so commands run
+    without one (git hooks, CI) skip its import cost.
+    """
+    with suppress(OSError):
+        cwd = Path.cwd()
+        for directory in (cwd, *cwd.parents):
+            env_file = directory / ".env"
+            if env_file.is_file():
+                from dotenv import load_dotenv
+
+                load_dotenv(env_file)
+                return env_file
+    return None
+
+
+load_env_file()
 
 
 class Config:
     """Configuration manager for Clide."""
 
-    def __init__(self):
-        """Initialize configuration from environment variables and defaults."""
+    def __init__(self, environ: Optional[Mapping[str, str]] = None):
+        """Initialize configuration from environment variables and defaults.
+
+        ``environ`` replaces ``os.environ`` (the daemon builds each request's
+        settings from the client's environment).
+        """
+        env = os.environ if environ is None else environ
         # Core configuration
-        self.db_path = os.getenv("CLIDE_DB", "memory_bank.db")
-        self.dashboard_host = os.getenv("CLIDE_DASHBOARD_HOST", "127.0.0.1")
-        self.dashboard_port = int(os.getenv("CLIDE_DASHBOARD_PORT", "5000"))
-        self.verbose = os.getenv("CLIDE_VERBOSE", "false").lower() == "true"
+        self.db_path = env.get("CLIDE_DB", "memory_bank.db")
+        self.db_pool = env.get("CLIDE_DB_POOL", "false").lower() == "true"
+        # Seconds a write waits for another process to release the write lock
+        self.lock_timeout = float(env.get("CLIDE_LOCK_TIMEOUT", "30"))
+        self.log_buffer = env.get("CLIDE_LOG_BUFFER", "false").lower() == "true"
+        self.log_buffer_size = int(env.get("CLIDE_LOG_BUFFER_SIZE", "10000"))
+        self.log_buffer_policy = env.get("CLIDE_LOG_BUFFER_POLICY", "block").lower()
+        self.log_retention_days = int(env.get("CLIDE_LOG_RETENTION_DAYS", "90"))
+        self.snapshot_dir = env.get("CLIDE_SNAPSHOT_DIR", "memory_bank_snapshots")
+        # Resident daemon: "auto" forwards commands when one is listening, "off" never
+        self.daemon = env.get("CLIDE_DAEMON", "auto").lower()
+        self.socket_path = env.get("CLIDE_SOCKET", "")
+        # Boot context pack cache file (default: <db>.context.json)
+        self.context_cache = env.get("CLIDE_CONTEXT_CACHE", "")
+        # Milliseconds landmine recall may search before settling for what it has
+        self.recall_budget_ms = float(env.get("CLIDE_RECALL_BUDGET_MS", "20"))
+        self.dashboard_host = env.get("CLIDE_DASHBOARD_HOST", "127.0.0.1")
+        self.dashboard_port = int(env.get("CLIDE_DASHBOARD_PORT", "5000"))
+        # Seconds a cached dashboard page is served before re-checking data_version
+        self.dashboard_cache_ttl = float(env.get("CLIDE_DASHBOARD_CACHE_TTL", "2"))
+        # Seconds between data_version polls feeding the /events stream
+        self.dashboard_poll_interval = float(env.get("CLIDE_DASHBOARD_POLL_INTERVAL", "1"))
+        # Concurrent /events streams; each holds a server thread while open
+        self.dashboard_max_streams = int(env.get("CLIDE_DASHBOARD_MAX_STREAMS", "4"))
+        self.verbose = env.get("CLIDE_VERBOSE", "false").lower() == "true"
+        # Plain-text output: "true", "false" or "auto" (plain when stdout is not a TTY)
+        self.plain_output = env.get("CLIDE_PLAIN", "auto").lower()
 
         # AI integration (reserved for future use)
-        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        self.anthropic_api_key = env.get("ANTHROPIC_API_KEY", "")
+        self.openai_api_key = env.get("OPENAI_API_KEY", "")
 
     @property
     def db_exists(self) -> bool:
@@ -0,0 +1,247 @@
+"""Token-budgeted context pack for agent boot (``clide boot --format context``).
+
+The pack holds every section's ranked items already rendered to text, and is
+cached on disk next to the database. Each section remembers the
+``table_versions`` of the tables it was built from, so a later boot rebuilds
+only the sections whose tables changed and reuses the rest as-is. Fitting a
+pack to a token budget happens at render time and needs no queries.
+"""
+
+import json
+import math
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import config
+from .db import Database
+
+# Bump when the cached layout or item rendering changes
+PACK_FORMAT = 1
+
+# Items kept per section in the pack; budgets never reach further down
+MAX_SECTION_ITEMS = 200
+
+# Longest text kept from any single field of an item
+MAX_FIELD_CHARS = 300
+
+# Rough tokens-per-character ratio for English text and code
+CHARS_PER_TOKEN = 4
+
+Item = Dict[str, Any]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (no tokenizer dependency)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def clip(value: Any) -> str:
+    text = " ".join(str(value).split())
+    return text if len(text) <= MAX_FIELD_CHARS else text[: MAX_FIELD_CHARS - 3] + "..."
+
+
+def make_item(key: str, text: str, data: Dict[str, Any]) -> Item:
+    return {"key": key, "text": text, "tokens": estimate_tokens(text) + 1, "data": data}
+
+
+def landmine_items(db: Database) -> List[Item]:
+    return items_for_landmines(db.get_landmines(limit=MAX_SECTION_ITEMS))
+
+
+def items_for_landmines(rows: List[Dict[str, Any]]) -> List[Item]:
+    items = []
+    for row in rows:
+        text = f"- #{row['id']} {clip(row['summary'])}"
+        if row.get("tags"):
+            text += f" [{clip(row['tags'])}]"
+        for label, field in (("avoid", "avoidance_rules"), ("fix", "remediation")):
+            if row.get(field):
+                text += f"\n  {label}: {clip(row[field])}"
+        data = {k: row.get(k) for k in ("id", "summary", "tags", "avoidance_rules", "remediation")}
+        items.append(make_item(str(row["id"]), text, data))
+    return items
+
+
+def open_work_items(db: Database) -> List[Item]:
+    items = []
+    for row in db.get_open_work(limit=MAX_SECTION_ITEMS):
+        owner = f", @{row['assignee']}" if row.get("assignee") else ""
+        text = (
+            f"- {row['kind']} #{row['id']} [P{row['priority']}] {clip(row['title'])}"
+            f" ({row['status']}{owner})"
+        )
+        data = {k: row.get(k) for k in ("kind", "id", "title", "status", "priority", "assignee")}
+        items.append(make_item(f"{row['kind']}-{row['id']}", text, data))
+    return items
+
+
+def deployment_items(db: Database) -> List[Item]:
+    items = []
+    for row in db.get_deployments()[:MAX_SECTION_ITEMS]:
+        parts = [f"steps: {clip(row['steps'])}"]
+        if row.get("strategy"):
+            parts.insert(0, clip(row["strategy"]))
+        if row.get("scripts"):
+            parts.append(f"scripts: {clip(row['scripts'])}")
+        if row.get("last_deployed_at"):
+            parts.append(f"last deployed {row['last_deployed_at']}")
+        text = f"- {row['environment']}: " + "; ".join(parts)
+        data = {
+            k: row.get(k)
+            for k in ("environment", "strategy", "steps", "scripts", "last_deployed_at")
+        }
+        items.append(make_item(str(row["id"]), text, data))
+    return items
+
+
+def config_items(db: Database) -> List[Item]:
+    return [
+        make_item(row["name"], f"- {row['name']}={clip(row['value'])}", {row["name"]: row["value"]})
+        for row in db.get_config()[:MAX_SECTION_ITEMS]
+    ]
+
+
+# name -> (heading, tables it reads, share of the budget, item builder)
+SECTIONS: Dict[str, Tuple[str, Tuple[str, ...], float, Callable[[Database], List[Item]]]] = {
+    "landmines": ("Landmines (do NOT do this)", ("landmines",), 0.4, landmine_items),
+    "open_work": ("Open work", ("stories", "defects"), 0.35, open_work_items),
+    "deployment": ("Deployment", ("deployment",), 0.15, deployment_items),
+    "config": ("Config", ("configuration",), 0.1, config_items),
+}
+
+
+def cache_path_for(db_path: str) -> str:
+    """Context pack cache file for a database (``CLIDE_CONTEXT_CACHE`` overrides)."""
+    return config.context_cache or f"{db_path}.context.json"
+
+
+def read_cache(path: str, identity: List[Any]) -> Optional[Dict[str, Any]]:
+    """Cached pack at path, or None if missing, unreadable or for another file."""
+    try:
+        with open(path) as f:
+            pack = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if pack.get("format") != PACK_FORMAT or pack.get("identity") != identity:
+        return None
+    return pack
+
+
+def write_cache(path: str, pack: Dict[str, Any]) -> None:
+    """Replace the cache file atomically; failing to cache is not an error."""
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=str(Path(path).parent), prefix=".context-", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(pack, f, separators=(",", ":"), default=str)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None:
+            with suppress(OSError):
+                os.unlink(tmp)
+
+
+def load_pack(db: Database, cache_path: Optional[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """Context pack for db, reusing cached sections whose tables are unchanged.
+
+    Returns the pack and the names of the sections that had to be rebuilt
+    (empty when the whole pack came from the cache).
+    """
+    path = cache_path or cache_path_for(db.db_path)
+    # A restored or recreated bank is a different file even if its table
+    # versions happen to match the cached ones
+    try:
+        identity = [str(Path(db.db_path).resolve()), os.stat(db.db_path).st_ino]
+    except OSError:
+        identity = [db.db_path, None]
+
+    cached = read_cache(path, identity)
+    cached_sections = cached["sections"] if cached else {}
+    sections: Dict[str, Any] = {}
+    rebuilt: List[str] = []
+    # One snapshot: the versions recorded match the rows read
+    with db.transaction(write=False):
+        versions = db.get_table_versions()
+        for name, (_, tables, _, build) in SECTIONS.items():
+            wanted = {table: versions.get(table) for table in tables}
+            entry = cached_sections.get(name)
+            if entry is None or entry["versions"] != wanted:
+                entry = {"versions": wanted, "items": build(db)}
+                rebuilt.append(name)
+            sections[name] = entry
+
+    pack = {"format": PACK_FORMAT, "identity": identity, "sections": sections}
+    if rebuilt:
+        write_cache(path, pack)
+    return pack, rebuilt
+
+
+def with_landmines(pack: Dict[str, Any], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of pack whose landmines are rows (e.g. recalled for a working set).
+
+    The copy is not cached: recall depends on the working set, not only on
+    the database.
+    """
+    sections = dict(
+        pack["sections"], landmines={"versions": {}, "items": items_for_landmines(rows)}
+    )
+    return dict(pack, sections=sections)
+
+
+def fit_budget(pack: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    """Pick items, in rank order, that fit within budget tokens.
+
+    Every section first gets its share of the budget; whatever a section
+    leaves unused then goes to the remaining items, in section order. Items
+    are never skipped to squeeze in a smaller one further down the ranking.
+    """
+    chosen: Dict[str, List[Item]] = {name: [] for name in SECTIONS}
+    queues = {name: list(pack["sections"][name]["items"]) for name in SECTIONS}
+    spent = 0
+
+    def take(name: str, limit: int) -> None:
+        nonlocal spent
+        heading = 0 if chosen[name] else estimate_tokens(SECTIONS[name][0]) + 1
+        while queues[name] and spent + heading + queues[name][0]["tokens"] <= limit:
+            spent += heading + queues[name][0]["tokens"]
+            chosen[name].append(queues[name].pop(0))
+            heading = 0
+
+    for name, (_, _, share, _) in SECTIONS.items():
+        take(name, min(budget, spent + int(budget * share)))
+    for name in SECTIONS:
+        take(name, budget)
+
+    return {
+        "budget": budget,
+        "tokens": spent,
+        "sections": chosen,
+        "omitted": {name: len(queue) for name, queue in queues.items() if queue},
+    }
+
+
+def render_text(brief: Dict[str, Any]) -> str:
+    """Plain-text brief for agents."""
+    lines = [f"# Clide context (~{brief['tokens']} tokens, budget {brief['budget']})"]
+    for name, items in brief["sections"].items():
+        if items:
+            lines.append(f"## {SECTIONS[name][0]}")
+            lines.extend(item["text"] for item in items)
+    if brief["omitted"]:
+        left = ", ".join(f"{count} {name}" for name, count in brief["omitted"].items())
+        lines.append(f"(over budget, not shown: {left})")
+    return "\n".join(lines) + "\n"
+
+
+def render_json(brief: Dict[str, Any]) -> str:
+    """JSON brief: the selected rows per section, plus budget accounting."""
+    payload = dict(
+        brief,
+        sections={
+            name: [item["data"] for item in items] for name, items in brief["sections"].items()
+        },
+    )
+    return json.dumps(payload, indent=2, default=str) + "\n"
@@ -0,0 +1,365 @@
+"""Resident clide daemon served over a Unix domain socket.
+
+``clide serve`` keeps one process running with its imports loaded and a
+pooled connection to the memory bank open. Clients (see ``clide.client``)
+send one request per connection as a JSON line, with their ``CLIDE_*``
+environment:
+
+    {"argv": ["save", "-m", "msg"], "cwd": "/repo", "db": "/repo/memory_bank.db",
+     "verbose": false, "tty": false, "width": 80, "env": {"CLIDE_LOCK_TIMEOUT": "5"}}
+
+The command's output comes back while it runs, as JSON-line frames of at
+most ``OUTPUT_CHUNK_SIZE`` characters, ending with its exit code:
+
+    {"stdout": "..."}
+    {"stderr": "..."}
+    {"exit_code": 0}
+
+A request the daemon cannot serve as the client would run it gets a single
+``{"error": ...}`` line before any output, and the client runs the command
+itself. ``{"op": "ping"}`` answers with the daemon's pid and database path.
+
+Connections are handled on their own threads, but commands run one at a
+time: they share the process's working directory, ``sys.stdout`` and
+``config``. Long-running commands therefore never come here (see
+``LOCAL_COMMANDS``).
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from typing import Any, Dict, List, Optional, TextIO
+
+from .config import Config, config
+
+# Commands that always run in the calling process: they start servers, create
+# or replace the database file, need the caller's terminal, or run long
+# enough (bulk reads and writes) that they would hold up every other client
+LOCAL_COMMANDS = frozenset({"serve", "dashboard", "init", "restore", "report", "import", "backup"})
+LOCAL_SUBCOMMANDS = frozenset({("log", "compact")})
+
+# Settings fixed for the daemon's lifetime; a client asking for others runs
+# the command itself
+PROCESS_SETTINGS = ("db_pool", "log_buffer", "log_buffer_size", "log_buffer_policy")
+
+# Seconds a client may take to send its request, and the largest request read
+REQUEST_TIMEOUT = 5.0
+MAX_REQUEST_BYTES = 1 << 20
+
+# Output is sent in frames of about this many characters; a client that stops
+# reading for OUTPUT_TIMEOUT seconds is dropped and the rest discarded
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_TIMEOUT = 60.0
+
+
+class DaemonError(Exception):
+    """The daemon could not be started or stopped answering mid-request."""
+
+
+def socket_path_for(db_path: Optional[str] = None) -> str:
+    """Socket the daemon for ``db_path`` listens on (``CLIDE_SOCKET`` overrides)."""
+    return config.socket_path or f"{db_path or config.db_path}.sock"
+
+
+def runs_locally(argv: List[str]) -> bool:
+    """Whether a command (argv after the global options) must not be forwarded."""
+    return (
+        not argv
+        or argv[0].startswith("-")
+        or argv[0] in LOCAL_COMMANDS
+        or tuple(argv[:2]) in LOCAL_SUBCOMMANDS
+    )
+
+
+def send_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None):
+    """Send one request and return its first response line, decoded.
+
+    Returns None when no daemon is listening, so callers can fall back to
+    running in-process. Raises DaemonError if the daemon accepted the request
+    but did not answer.
+    """
+    for frame in stream_request(socket_path, request, timeout):
+        return frame
+    return None
+
+
+def stream_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None):
+    """Send one request and yield the decoded response frames as they arrive.
+
+    Yields nothing when no daemon is listening. Raises DaemonError if the
+    connection fails after the request was accepted.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+                if not line:
+                    raise DaemonError("Daemon closed the connection without answering")
+                while line:
+                    yield json.loads(line)
+                    line = reader.readline()
+        except OSError as e:
+            raise DaemonError(f"Daemon connection failed: {e}") from e
+    finally:
+        sock.close()
+
+
+def run_command(argv: List[str], verbose: bool = False) -> int:
+    """Run a clide command in this process and return its exit code."""
+    import click
+
+    from .cli import EX_TEMPFAIL, cli
+    from .db import LockTimeout
+    from .utils import print_error
+
+    args = (["--verbose"] if verbose else []) + list(argv)
+    try:
+        result = cli.main(args=args, prog_name="clide", obj={}, standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        sys.stderr.write("Aborted!\n")
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        if isinstance(e, LockTimeout):
+            print_error(f"Memory bank busy: {e}")
+            return EX_TEMPFAIL
+        print_error(f"Fatal error: {e}")
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+class OutputFrames:
+    """Send a command's stdout and stderr to the client as JSON-line frames.
+
+    Output is buffered up to ``OUTPUT_CHUNK_SIZE`` characters and switching
+    streams flushes, so frames keep the order things were written in. If the
+    client goes away the command still runs to the end; its output is dropped.
+    """
+
+    def __init__(self, wfile, chunk_size: int = OUTPUT_CHUNK_SIZE):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self.stream: Optional[str] = None
+        self.parts: List[str] = []
+        self.size = 0
+        self.closed = False
+
+    def send(self, frame: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self.wfile.write(json.dumps(frame).encode() + b"\n")
+        except OSError:
+            self.closed = True
+
+    def write(self, stream: str, text: str) -> None:
+        if stream != self.stream:
+            self.flush()
+            self.stream = stream
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.send({self.stream: "".join(self.parts)})
+            self.parts.clear()
+            self.size = 0
+
+    def writer(self, stream: str) -> TextIO:
+        """A text stream whose writes go to ``stream`` frames."""
+        return FrameWriter(self, stream)
+
+
+class FrameWriter(io.TextIOBase):
+    """``sys.stdout``/``sys.stderr`` stand-in feeding an ``OutputFrames``."""
+
+    def __init__(self, frames: OutputFrames, stream: str):
+        super().__init__()
+        self.frames = frames
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        # Like io.StringIO; click probes for binary streams by writing b""
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        self.frames.write(self.stream, text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.frames.flush()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request line and stream the response frames back."""
+
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_BYTES))
+        except (OSError, ValueError):
+            return
+        self.connection.settimeout(OUTPUT_TIMEOUT)
+        frames = OutputFrames(self.wfile)
+        self.server.respond(request, frames)
+        frames.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve clide commands against one database, one command at a time."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, db_path: str):
+        self.socket_path = socket_path
+        self.db_path = db_path
+        self.command_lock = threading.Lock()
+        # Owner-only socket: a request runs commands with the daemon's rights
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def respond(self, request: Dict[str, Any], frames: OutputFrames) -> None:
+        if request.get("op") == "ping":
+            frames.send({"ok": True, "pid": os.getpid(), "db": self.db_path})
+            return
+        if request.get("db") and os.path.abspath(request["db"]) != self.db_path:
+            frames.send({"error": f"daemon serves {self.db_path}"})
+            return
+        try:
+            settings = request_config(request.get("env") or {})
+        except ValueError as e:
+            frames.send({"error": f"invalid client settings: {e}"})
+            return
+        differing = [
+            name for name in PROCESS_SETTINGS if getattr(settings, name) != getattr(config, name)
+        ]
+        if differing:
+            frames.send({"error": f"daemon runs with different {', '.join(differing)}"})
+            return
+        with self.command_lock:
+            exit_code = self.execute(request, settings, frames)
+        frames.flush()
+        frames.send({"exit_code": exit_code})
+
+    def execute(self, request: Dict[str, Any], settings: Config, frames: OutputFrames) -> int:
+        """Run a forwarded command with the client's settings, streaming its output."""
+        from . import utils
+
+        cwd = os.getcwd()
+        saved = dict(vars(config))
+        previous_console = None
+        try:
+            os.chdir(request.get("cwd") or cwd)
+            # The daemon's database stays pinned; respond() checked it matches
+            vars(config).update(vars(settings), db_path=config.db_path)
+            if request.get("tty"):
+                # Render for the client's terminal; the console follows sys.stdout
+                from rich.console import Console
+
+                config.plain_output = "false"
+                width = request.get("width") or 80
+                previous_console = utils.set_console(Console(force_terminal=True, width=width))
+            else:
+                config.plain_output = "true"
+            with redirect_stdout(frames.writer("stdout")), redirect_stderr(frames.writer("stderr")):
+                return run_command(request.get("argv") or [], request.get("verbose", False))
+        finally:
+            os.chdir(cwd)
+            vars(config).clear()
+            vars(config).update(saved)
+            if request.get("tty"):
+                utils.set_console(previous_console)
+
+
+def request_config(client_env: Dict[str, str]) -> Config:
+    """Settings a command would get in the client's process.
+
+    The client's ``CLIDE_*`` variables replace the daemon's; everything else
+    (API keys and the like) comes from the daemon's environment.
+    """
+    env = {k: v for k, v in os.environ.items() if not k.startswith("CLIDE_")}
+    env.update((k, str(v)) for k, v in client_env.items() if k.startswith("CLIDE_"))
+    return Config(env)
+
+
+def warm_up() -> None:
+    """Import every command module and open the database ahead of requests."""
+    import importlib
+    import pkgutil
+
+    from . import cli, commands  # noqa: F401
+    from .db import db
+
+    for module in pkgutil.iter_modules(commands.__path__):
+        # Commands with optional dependencies (the dashboard) load on demand
+        with suppress(ImportError):
+            importlib.import_module(f"{commands.__name__}.{module.name}")
+    if os.path.exists(db.db_path):
+        db.migrate()
+        db.execute_one("SELECT 1")
+
+
+def serve(socket_path: Optional[str] = None, ready=None) -> None:
+    """Run the daemon in the foreground until interrupted or terminated.
+
+    ``ready`` is called with the server once it is listening (used by tests).
+    """
+    from .db import db
+
+    # Requests run in the client's directory, so pin the database path first
+    db.db_path = config.db_path = os.path.abspath(db.db_path)
+    db.pooled = True
+    socket_path = socket_path or socket_path_for(db.db_path)
+
+    if os.path.exists(socket_path):
+        if send_request(socket_path, {"op": "ping"}, timeout=1.0) is not None:
+            raise DaemonError(f"A daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a daemon that died
+
+    warm_up()
+    server = DaemonServer(socket_path, db.db_path)
+
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGTERM, terminate)
+    try:
+        if ready is not None:
+            ready(server)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+        db.flush_log(close=True)
@@ -0,0 +1,8 @@
+"""Clide web dashboard: WSGI app factory, read-only data layer, page cache and live feed."""
+
+from .app import create_app
+from .cache import VersionedCache
+from .data import DashboardData
+from .events import ChangeFeed
+
+__all__ = ["ChangeFeed", "DashboardData", "VersionedCache", "create_app"]
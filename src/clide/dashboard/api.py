@@ -0,0 +1,230 @@
+"""Versioned JSON read API, mounted at ``/api/v1``.
+
+Collections accept ``fields`` (comma-separated columns), equality filters
+(comma-separated values match any), ``limit`` and an opaque ``cursor`` for
+keyset paging; the next page is linked in the body and a ``Link`` header.
+Responses carry a strong ETag built from ``PRAGMA data_version`` and the
+newest change stamp of the tables behind them, and are cached with the
+dashboard pages, so an unchanged poll answers 304 without querying a table.
+"""
+
+import gzip
+import hashlib
+import json
+import secrets
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from flask import Blueprint, Response, request, url_for
+
+from ..db import ACTION_COLUMNS, split_tags
+from ..utils import decode_cursor, encode_cursor, parse_time
+from .cache import VersionedCache
+from .data import DashboardData
+
+# Largest page a client may ask for
+MAX_LIMIT = 500
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# data_version restarts with every process; mixing this in keeps ETags from
+# one run from ever matching a different body served by the next
+ETAG_EPOCH = secrets.token_hex(8)
+
+TRACE_COLUMNS = (*ACTION_COLUMNS.split(", "), "depth", "duration")
+
+
+class Resource(NamedTuple):
+    """A paged collection: where it reads from and what clients may ask for."""
+
+    source: str
+    order_col: str
+    filters: Tuple[str, ...]
+    stamp: str
+    columns: Optional[Tuple[str, ...]] = None
+    tiebreak: Tuple[str, ...] = ("id",)
+
+
+DEFECTS_STAMP = "SELECT MAX(created_at), MAX(resolved_at) FROM defects"
+LOG_STAMP = "SELECT MAX(id), MAX(started_at) FROM agents_log"
+
+# Open work mixes stories and defects, which have separate id sequences and
+# second-resolution timestamps, so its page key needs kind to stay unique
+RESOURCES = {
+    "open-work": Resource(
+        "v_open_work",
+        "created_at",
+        ("kind", "status", "priority", "assignee"),
+        "SELECT (SELECT MAX(updated_at) FROM stories), MAX(created_at), MAX(resolved_at)"
+        " FROM defects",
+        tiebreak=("kind", "id"),
+    ),
+    "defects": Resource("defects", "created_at", ("status", "severity", "story_id"), DEFECTS_STAMP),
+    "landmines": Resource(
+        "landmines",
+        "updated_at",
+        ("solution_verification", "tags"),
+        "SELECT MAX(updated_at) FROM landmines",
+    ),
+    "log": Resource(
+        "agents_log",
+        "started_at",
+        ("agent", "action", "trace_id", "since", "until"),
+        LOG_STAMP,
+        tuple(ACTION_COLUMNS.split(", ")),
+    ),
+}
+
+PAGING_ARGS = ("fields", "limit", "cursor")
+
+
+class ApiError(Exception):
+    """A client error, reported as ``{"error": message}``."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def select_fields(allowed: Tuple[str, ...]) -> Optional[List[str]]:
+    """Columns requested with ``?fields=``, or None for all of them."""
+    fields = request.args.get("fields")
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def project(rows: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    if fields is None:
+        return rows
+    return [{f: row[f] for f in fields} for row in rows]
+
+
+def build_filter(
+    data: DashboardData, name: str, resource: Resource, columns: Tuple[str, ...]
+) -> Tuple[Optional[str], Tuple[Any, ...]]:
+    """WHERE condition and params from the resource's filter arguments."""
+    unknown = set(request.args) - set(resource.filters) - set(PAGING_ARGS)
+    if unknown:
+        raise ApiError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+    db = data.database
+    if name == "log":
+        filters = {k: request.args[k] for k in resource.filters if k in request.args}
+        try:
+            for bound in ("since", "until"):
+                if bound in filters:
+                    filters[bound] = parse_time(filters[bound])
+        except ValueError as e:
+            raise ApiError(str(e)) from None
+        return db.action_filter(**filters)
+
+    conditions: List[str] = []
+    params: Tuple[Any, ...] = ()
+    for column in resource.filters:
+        value = request.args.get(column)
+        if not value:
+            continue
+        if column == "tags":
+            condition, tag_params = db.tag_filter(resource.source, split_tags(value))
+            conditions.append(condition)
+            params += tag_params
+        elif column in columns:
+            values = value.split(",")
+            conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params += tuple(values)
+    return (" AND ".join(conditions) or None), params
+
+
+def create_api(data: DashboardData, cache: VersionedCache, page_size: int) -> Blueprint:
+    """Blueprint serving the JSON API from data, sharing the page cache."""
+    api = Blueprint("api", __name__, url_prefix="/api/v1")
+
+    @api.errorhandler(ApiError)
+    def api_error(error: ApiError):
+        return {"error": error.message}, error.status
+
+    def respond(stamp: str, build: Callable[[], Tuple[Dict[str, Any], Dict[str, str]]]):
+        """Serve build()'s payload through the cache with ETag and gzip handling."""
+
+        def encode():
+            version = data.data_version()
+            payload, headers = build()
+            body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+            marker = json.dumps(list(data.database.execute_one(stamp)), default=str)
+            key = f"{ETAG_EPOCH}:{request.full_path}:{version}:{marker}"
+            etag = hashlib.sha256(key.encode()).hexdigest()[:32]
+            compressed = gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None
+            return body, compressed, etag, headers
+
+        body, compressed, etag, headers = cache.get(request.full_path, encode)
+
+        # Each content coding is a different representation with its own tag
+        use_gzip = compressed is not None and request.accept_encodings["gzip"] > 0
+        response = Response(compressed if use_gzip else body, mimetype="application/json")
+        response.set_etag(f"{etag}-gzip" if use_gzip else etag)
+        response.headers.update(headers)
+        response.headers["Cache-Control"] = "no-cache"
+        response.vary.add("Accept-Encoding")
+        if use_gzip:
+            response.content_encoding = "gzip"
+        return response.make_conditional(request)
+
+    @api.route("/<any('open-work', defects, landmines, log):name>")
+    def collection(name: str):
+        resource = RESOURCES[name]
+        columns = resource.columns or data.columns(resource.source)
+        fields = select_fields(columns)
+        condition, params = build_filter(data, name, resource, columns)
+        try:
+            limit = min(int(request.args.get("limit", page_size)), MAX_LIMIT)
+            cursor = request.args.get("cursor")
+            before = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise ApiError("Invalid limit or cursor") from None
+        if limit < 1 or (before is not None and len(before) != 1 + len(resource.tiebreak)):
+            raise ApiError("Invalid limit or cursor")
+
+        def build():
+            rows = data.page(
+                resource.source,
+                resource.order_col,
+                limit + 1,
+                before=before,
+                condition=condition,
+                params=params,
+                columns=", ".join(columns),
+                tiebreak=resource.tiebreak,
+            )
+            next_url = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                key = (resource.order_col, *resource.tiebreak)
+                args = dict(request.args, cursor=encode_cursor(tuple(last[c] for c in key)))
+                next_url = url_for("api.collection", name=name, **args)
+            payload = {"data": project(rows, fields), "next": next_url}
+            return payload, {"Link": f'<{next_url}>; rel="next"'} if next_url else {}
+
+        return respond(resource.stamp, build)
+
+    @api.route("/trace/<trace_id>")
+    def trace(trace_id: str):
+        fields = select_fields(TRACE_COLUMNS)
+        if set(request.args) - {"fields"}:
+            raise ApiError("Only 'fields' is accepted here")
+
+        def build():
+            spans = data.database.get_trace(trace_id)
+            if not spans:
+                raise ApiError(f"No trace {trace_id!r}", 404)
+            return {"trace_id": trace_id, "data": project(spans, fields)}, {}
+
+        return respond(LOG_STAMP, build)
+
+    return api
@@ -0,0 +1,176 @@
+"""Dashboard WSGI application factory.
+
+The app is safe to serve from a threaded or multi-worker WSGI server::
+
+    waitress-serve --threads 8 --call clide.dashboard:create_app
+    gunicorn -w 4 'clide.dashboard:create_app()'
+
+Each worker process keeps its own read-only connections and page cache.
+Every open ``/events`` stream holds a server thread, so at most
+``max_streams`` are served at once; keep that below the thread pool size so
+pages and the API always have a thread left.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, Response, abort, request, stream_with_context, url_for
+from jinja2 import DictLoader
+
+from ..commands.report import REPORT_SOURCES
+from ..config import config
+from ..db import ACTION_COLUMNS
+from ..utils import decode_cursor, encode_cursor
+from .api import create_api
+from .cache import VersionedCache
+from .data import DashboardData
+from .events import ChangeFeed
+from .templates import TEMPLATES
+
+# Rows per /log and /browse page
+PAGE_SIZE = 50
+
+# Seconds a browser turned away from /events waits before trying again
+STREAM_RETRY = 10
+
+
+def create_app(
+    db_path: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+    cache_ttl: Optional[float] = None,
+    poll_interval: Optional[float] = None,
+    heartbeat: float = 15.0,
+    max_streams: Optional[int] = None,
+) -> Flask:
+    """Build the dashboard app for db_path (defaults to ``config.db_path``).
+
+    Rendered pages are cached per URL and reused until another connection
+    commits (``PRAGMA data_version``), checking at most once every
+    ``cache_ttl`` seconds (``config.dashboard_cache_ttl`` by default).
+
+    ``/events`` streams home page changes as Server-Sent Events. A single
+    poller checks the data version every ``poll_interval`` seconds
+    (``config.dashboard_poll_interval`` by default) for all open streams.
+    Beyond ``max_streams`` (``config.dashboard_max_streams``) concurrent
+    streams, ``/events`` answers 503 with ``Retry-After``. The JSON API under
+    ``/api/v1`` shares the page cache.
+    """
+    data = DashboardData(db_path or config.db_path)
+    ttl = config.dashboard_cache_ttl if cache_ttl is None else cache_ttl
+    cache = VersionedCache(data.data_version, ttl=ttl)
+
+    app = Flask(__name__)
+    app.jinja_env.loader = DictLoader(TEMPLATES)
+    home_template = app.jinja_env.get_template("home.html")
+    page_template = app.jinja_env.get_template("page.html")
+    interval = config.dashboard_poll_interval if poll_interval is None else poll_interval
+    feed = ChangeFeed(data, interval=interval)
+    limit = config.dashboard_max_streams if max_streams is None else max_streams
+    stream_slots = threading.BoundedSemaphore(max(limit, 0))
+    app.extensions["clide"] = {"data": data, "cache": cache, "feed": feed}
+
+    def render_page(
+        title: str, endpoint: str, source: str, order_col: str, descending: bool = True, **kwargs
+    ) -> Tuple[str, Dict[str, str]]:
+        """Render one keyset page; cursors are opaque (order value, id) tokens."""
+        try:
+            before = request.args.get("before")
+            after = request.args.get("after")
+            rows = data.page(
+                source,
+                order_col,
+                page_size + 1,
+                before=decode_cursor(before) if before else None,
+                after=decode_cursor(after) if after else None,
+                descending=descending,
+                **kwargs,
+            )
+        except ValueError:
+            abort(400, "Invalid cursor")
+
+        # Cursors are keyed on the sort order, so "next" follows it forward
+        forward, backward = ("before", "after") if descending else ("after", "before")
+        going_back = request.args.get(backward) is not None
+
+        # One extra row tells whether a page exists beyond this one; when
+        # paging backwards it is the row at the top of the page
+        more = len(rows) > page_size
+        if more:
+            rows = rows[1:] if going_back else rows[:-1]
+        has_next = more if not going_back else True
+        has_prev = more if going_back else request.args.get(forward) is not None
+
+        def link(direction: str, row: Dict[str, Any]) -> str:
+            cursor = encode_cursor((row[order_col], row["id"]))
+            return url_for(endpoint, **request.view_args, **{direction: cursor})
+
+        next_url = link(forward, rows[-1]) if rows and has_next else None
+        prev_url = link(backward, rows[0]) if rows and has_prev else None
+
+        body = page_template.render(title=title, rows=rows, next_url=next_url, prev_url=prev_url)
+        links = []
+        if next_url:
+            links.append(f'<{next_url}>; rel="next"')
+        if prev_url:
+            links.append(f'<{prev_url}>; rel="prev"')
+        return body, {"Link": ", ".join(links)} if links else {}
+
+    def cached(compute) -> Tuple[str, int, Dict[str, str]]:
+        body, headers = cache.get(request.full_path, compute)
+        return body, 200, headers
+
+    app.register_blueprint(create_api(data, cache, page_size))
+
+    @app.route("/")
+    def home():
+        return cached(
+            lambda: (
+                home_template.render(db=data.db_path, tables=list(REPORT_SOURCES), **data.home()),
+                {},
+            )
+        )
+
+    @app.route("/events")
+    def events():
+        if not stream_slots.acquire(blocking=False):
+            return Response(
+                f"retry: {STREAM_RETRY * 1000}\n\n",
+                status=503,
+                mimetype="text/event-stream",
+                headers={"Retry-After": str(STREAM_RETRY), "Cache-Control": "no-cache"},
+            )
+        response = Response(
+            stream_with_context(feed.stream(heartbeat=heartbeat)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        # The server closes the response when the client goes away
+        response.call_on_close(stream_slots.release)
+        return response
+
+    @app.route("/log")
+    def log_page():
+        return cached(
+            lambda: render_page(
+                "Agent Log", "log_page", "agents_log", "started_at", columns=ACTION_COLUMNS
+            )
+        )
+
+    @app.route("/browse/<table>")
+    def browse_page(table):
+        if table not in REPORT_SOURCES:
+            abort(404)
+        source, condition, order = REPORT_SOURCES[table]
+        order_col, _, direction = order.partition(" ")
+        return cached(
+            lambda: render_page(
+                table.title(),
+                "browse_page",
+                source,
+                order_col,
+                descending=direction == "DESC",
+                condition=condition,
+            )
+        )
+
+    return app
@@ -0,0 +1,65 @@
+"""Response cache invalidated by ``PRAGMA data_version``."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class VersionedCache:
+    """LRU cache whose entries stay valid while the database is unchanged.
+
+    An entry is served straight from memory for ``ttl`` seconds after it was
+    last checked. After that, one call to ``version()`` (a ``PRAGMA
+    data_version`` read) decides whether it is still current: if no other
+    connection has committed since, the entry is kept and its TTL restarted,
+    otherwise it is recomputed. ``ttl=0`` checks the version on every hit.
+    """
+
+    def __init__(self, version: Callable[[], int], ttl: float = 2.0, max_entries: int = 256):
+        self.version = version
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Tuple[int, float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hits served from memory, hits revalidated against the version, misses."""
+        with self._lock:
+            return dict(self._counts, entries=len(self._entries))
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it if stale or missing."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(key)
+                self._counts["hits"] += 1
+                return entry[2]
+
+        # Read the version before computing: a commit landing in between
+        # makes the entry look stale next time, never wrongly fresh
+        version = self.version()
+        if entry is not None and entry[0] == version:
+            with self._lock:
+                self._entries[key] = (version, now + self.ttl, entry[2])
+                self._entries.move_to_end(key)
+                self._counts["revalidated"] += 1
+            return entry[2]
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._counts["misses"] += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,62 @@
+"""Read-only data access for the dashboard."""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..db import Database, open_connection, read_only_uri
+
+# Rows shown in each home page section
+HOME_LIMITS = {"open_work": 50, "critical": 20, "landmines": 20}
+
+
+class DashboardData:
+    """Queries the dashboard runs, on read-only pooled connections.
+
+    Request threads each get a pooled ``mode=ro`` connection, so the web
+    server can never write to the memory bank. One extra connection, shared
+    by all threads, answers ``data_version()``: the value only means
+    something when compared with earlier reads on the same connection.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = str(Path(db_path).resolve())
+        self.uri = read_only_uri(self.db_path)
+        self.database = Database(self.uri, pooled=True, buffered_log=False)
+        self._version_conn = open_connection(self.uri, check_same_thread=False)
+        self._version_lock = threading.Lock()
+        self._columns: Dict[str, Tuple[str, ...]] = {}
+
+    def data_version(self) -> int:
+        """``PRAGMA data_version``: changes whenever another connection commits."""
+        with self._version_lock:
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def home(self) -> Dict[str, Any]:
+        """Health summary plus the home page sections, from one snapshot."""
+        db = self.database
+        with db.transaction(write=False):
+            return {
+                "health": db.get_health_summary(),
+                "open_work": db.get_open_work(limit=HOME_LIMITS["open_work"]),
+                "critical": db.get_open_defects(severity="critical", limit=HOME_LIMITS["critical"]),
+                "landmines": db.get_landmines(limit=HOME_LIMITS["landmines"]),
+            }
+
+    def columns(self, source: str) -> Tuple[str, ...]:
+        """Column names of a table or view, looked up once."""
+        if source not in self._columns:
+            with self.database.connection() as conn:
+                cursor = conn.execute(f"SELECT * FROM {source} LIMIT 0")
+                self._columns[source] = tuple(d[0] for d in cursor.description)
+        return self._columns[source]
+
+    def page(self, source: str, order_col: str, limit: int, **kwargs) -> List[Dict[str, Any]]:
+        """One keyset page (see ``Database.get_page``)."""
+        return self.database.get_page(source, order_col, limit, **kwargs)
+
+    def close(self) -> None:
+        """Close the shared version connection and this thread's pooled one."""
+        with self._version_lock:
+            self._version_conn.close()
+        self.database.close()
@@ -0,0 +1,173 @@
+"""Server-Sent Events feed of home page changes.
+
+One poller thread per app watches ``PRAGMA data_version`` on the shared
+read-only connection. Only when another connection has committed does it
+re-run the home page queries, once, and fan the row-level differences out
+to every open ``/events`` stream. N open dashboards therefore cost one cheap
+poll per interval rather than N page renders.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .data import DashboardData
+
+logger = logging.getLogger(__name__)
+
+# Home page sections streamed as row diffs, in page order
+SECTIONS = ("open_work", "critical", "landmines")
+
+# Events buffered per stream before a slow client is resynced with a snapshot
+MAX_PENDING_EVENTS = 100
+
+
+def row_key(section: str, row: Dict[str, Any]) -> str:
+    """Stable identity of a row within its section."""
+    if section == "open_work":
+        return f"{row['kind']}-{row['id']}"
+    return str(row["id"])
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes from one home page state to the next.
+
+    Each changed section maps to ``upsert`` (new or modified rows, with their
+    ``key``), ``delete`` (keys that left) and ``order`` (all keys, in page
+    order). ``health`` is included whole when any count changed.
+    """
+    changes: Dict[str, Any] = {}
+    for section in SECTIONS:
+        before = {row_key(section, row): row for row in old.get(section, [])}
+        after = {row_key(section, row): row for row in new[section]}
+        upsert = [dict(row, key=key) for key, row in after.items() if before.get(key) != row]
+        delete = [key for key in before if key not in after]
+        if upsert or delete or list(before) != list(after):
+            changes[section] = {"upsert": upsert, "delete": delete, "order": list(after)}
+    if old.get("health") != new["health"]:
+        changes["health"] = new["health"]
+    return changes
+
+
+def format_event(name: str, payload: Dict[str, Any], event_id: int) -> str:
+    """Encode one SSE message."""
+    data = json.dumps(payload, separators=(",", ":"), default=str)
+    return f"id: {event_id}\nevent: {name}\ndata: {data}\n\n"
+
+
+class ChangeFeed:
+    """Poll for commits and broadcast home page diffs to subscribers."""
+
+    def __init__(self, data: DashboardData, interval: float = 1.0):
+        self.data = data
+        self.interval = interval
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._version: Optional[int] = None
+        self._state: Optional[Dict[str, Any]] = None
+        self._event_id = 0
+        self.polls = 0
+
+    def current(self) -> Tuple[int, Dict[str, Any]]:
+        """Latest event id and full home page state."""
+        with self._lock:
+            if self._state is None:
+                self._version = self.data.data_version()
+                self._state = self.data.home()
+            return self._event_id, self._state
+
+    def subscribe(self) -> queue.Queue:
+        """Register a stream; the poller runs while any stream is open.
+
+        The queue receives ``(event_id, changes)``; ``changes`` is None when
+        the stream fell too far behind and must resend a full snapshot.
+        """
+        events: queue.Queue = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+        with self._lock:
+            self._subscribers.append(events)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="clide-dashboard-events", daemon=True
+                )
+                self._thread.start()
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self._lock:
+            if events in self._subscribers:
+                self._subscribers.remove(events)
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Check data_version once; on change, broadcast and return the diff."""
+        self.polls += 1
+        version = self.data.data_version()
+        with self._lock:
+            if version == self._version and self._state is not None:
+                return None
+            old = self._state or {}
+        new = self.data.home()
+        changes = diff_state(old, new)
+        with self._lock:
+            self._version, self._state = version, new
+            if not changes:
+                return None
+            self._event_id += 1
+            for events in self._subscribers:
+                try:
+                    events.put_nowait((self._event_id, changes))
+                except queue.Full:
+                    # Too far behind: replace its backlog with a resync marker
+                    while not events.empty():
+                        events.get_nowait()
+                    events.put_nowait((self._event_id, None))
+        return changes
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                # A failed poll (say, a locked database) is retried next interval
+                try:
+                    self.poll()
+                except Exception:
+                    logger.exception("Dashboard change poll failed")
+                time.sleep(self.interval)
+        finally:
+            # Let the next subscriber start a fresh poller if this one died
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def stream(self, heartbeat: float = 15.0) -> Iterator[str]:
+        """SSE messages for one client: a snapshot, then diffs as they happen.
+
+        A comment line is sent every ``heartbeat`` seconds without changes, so
+        proxies keep the connection open and closed clients are noticed.
+        """
+        events = self.subscribe()
+        try:
+            event_id, state = self.current()
+            yield "retry: 3000\n" + format_event("snapshot", state, event_id)
+            while True:
+                try:
+                    next_id, changes = events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if next_id <= event_id:
+                    continue
+                if changes is None:
+                    next_id, state = self.current()
+                    yield format_event("snapshot", state, next_id)
+                else:
+                    yield format_event("diff", changes, next_id)
+                event_id = next_id
+        finally:
+            self.unsubscribe(events)
@@ -0,0 +1,220 @@
+"""Dashboard page templates, compiled once per app by ``create_app``."""
+
+LAYOUT = """<!doctype html>
+<html>
+<head>
+    <title>Clide Dashboard{% if title %} — {{title}}{% endif %}</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            margin: 40px;
+        }
+        h1 { color: #333; }
+        h2 { color: #666; margin-top: 30px; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #f4f4f4; font-weight: 600; }
+        tr:hover { background-color: #f9f9f9; }
+        nav a { margin-right: 20px; }
+        .badge { padding: 4px 8px; border-radius: 4px; font-size: 0.85em; }
+        .critical { background: #ff4444; color: white; }
+        .major { background: #ff8800; color: white; }
+        .minor { background: #ffbb33; color: white; }
+        .story { background: #0088cc; color: white; }
+        .defect { background: #cc0000; color: white; }
+    </style>
+</head>
+<body>
+{% block body %}{% endblock %}
+</body>
+</html>
+"""
+
+HOME = """{% extends "layout.html" %}
+{% block body %}
+    <h1>🚀 Clide Dashboard</h1>
+    <p><strong>Database:</strong> {{db}}</p>
+
+    <h2>📊 Health</h2>
+    <p id="health">
+        <strong>Stories:</strong> <span data-health="stories.total">{{health.stories.total}}</span>
+        open (<span data-health="stories.todo">{{health.stories.todo}}</span> todo,
+        <span data-health="stories.in_progress">{{health.stories.in_progress}}</span> in progress,
+        <span data-health="stories.blocked">{{health.stories.blocked}}</span> blocked) &middot;
+        <strong>Defects:</strong> <span data-health="defects.total">{{health.defects.total}}</span>
+        open (<span class="badge critical"><span data-health="severity.critical"
+        >{{health.severity.critical}}</span> critical</span>
+        <span class="badge major"><span data-health="severity.major"
+        >{{health.severity.major}}</span> major</span>
+        <span class="badge minor"><span data-health="severity.minor"
+        >{{health.severity.minor}}</span> minor</span>) &middot;
+        <strong>Landmines:</strong> <span data-health="landmines">{{health.landmines}}</span>
+    </p>
+
+    <h2>📋 Open Work</h2>
+    <table>
+        <thead><tr>
+            <th>Kind</th><th>ID</th><th>Title</th><th>Status</th>
+            <th>Priority</th><th>Assignee</th><th>Updated</th>
+        </tr></thead>
+        <tbody id="open_work">
+        {% for r in open_work %}
+        <tr data-key="{{r['kind']}}-{{r['id']}}">
+            <td><span class="badge {{r['kind']}}">{{r['kind']}}</span></td>
+            <td>#{{r['id']}}</td>
+            <td>{{r['title']}}</td>
+            <td>{{r['status']}}</td>
+            <td>{{r['priority']}}</td>
+            <td>{{r['assignee'] or '-'}}</td>
+            <td>{{r['updated_at']}}</td>
+        </tr>
+        {% endfor %}
+        </tbody>
+    </table>
+
+    <h2>🐛 Critical Defects</h2>
+    <ul id="critical">
+    {% for d in critical %}
+        <li data-key="{{d['id']}}">
+            <strong>#{{d['id']}}</strong> {{d['title']}} — <em>{{d['status']}}</em>
+        </li>
+    {% endfor %}
+    </ul>
+
+    <p>
+        <a href="/log">Agent log</a>
+        {% for t in tables %} &middot; <a href="/browse/{{t}}">{{t}}</a>{% endfor %}
+    </p>
+
+    <h2>💣 Recent Landmines</h2>
+    <ul id="landmines">
+    {% for l in landmines %}
+        <li data-key="{{l['id']}}"><strong>#{{l['id']}}</strong> {{l['summary']}}
+        {% if l['solution_verification'] %}<em>({{l['solution_verification']}})</em>{% endif %}
+        </li>
+    {% endfor %}
+    </ul>
+
+    <script>
+    // Apply row diffs from /events; rows are built with textContent only
+    (function () {
+        if (!window.EventSource) return;
+        function el(tag, text, cls) {
+            var node = document.createElement(tag);
+            if (text !== undefined) node.textContent = text;
+            if (cls) node.className = cls;
+            return node;
+        }
+        var render = {
+            open_work: function (r) {
+                var tr = el("tr"), badge = el("td");
+                badge.appendChild(el("span", r.kind, "badge " + r.kind));
+                tr.appendChild(badge);
+                [ "#" + r.id, r.title, r.status, r.priority, r.assignee || "-", r.updated_at ]
+                    .forEach(function (v) { tr.appendChild(el("td", v)); });
+                return tr;
+            },
+            critical: function (r) {
+                var li = el("li");
+                li.appendChild(el("strong", "#" + r.id));
+                li.appendChild(document.createTextNode(" " + r.title + " — "));
+                li.appendChild(el("em", r.status));
+                return li;
+            },
+            landmines: function (r) {
+                var li = el("li");
+                li.appendChild(el("strong", "#" + r.id));
+                li.appendChild(document.createTextNode(" " + r.summary + " "));
+                if (r.solution_verification) {
+                    li.appendChild(el("em", "(" + r.solution_verification + ")"));
+                }
+                return li;
+            }
+        };
+        function applySection(name, change) {
+            var box = document.getElementById(name), rows = {};
+            Array.prototype.forEach.call(box.children, function (n) {
+                rows[n.dataset.key] = n;
+            });
+            change.delete.forEach(function (key) {
+                if (rows[key]) { rows[key].remove(); delete rows[key]; }
+            });
+            change.upsert.forEach(function (r) {
+                var node = render[name](r);
+                node.dataset.key = r.key;
+                if (rows[r.key]) rows[r.key].replaceWith(node);
+                rows[r.key] = node;
+            });
+            change.order.forEach(function (key) { box.appendChild(rows[key]); });
+        }
+        function applyHealth(health) {
+            document.querySelectorAll("[data-health]").forEach(function (n) {
+                n.textContent = n.dataset.health.split(".").reduce(function (o, k) {
+                    return o[k];
+                }, health);
+            });
+        }
+        function onSnapshot(e) {
+            var state = JSON.parse(e.data);
+            applyHealth(state.health);
+            Object.keys(render).forEach(function (name) {
+                var rows = state[name];
+                var keys = rows.map(function (r) {
+                    return name === "open_work" ? r.kind + "-" + r.id : String(r.id);
+                });
+                var known = {};
+                keys.forEach(function (k) { known[k] = true; });
+                var gone = Array.prototype.map.call(
+                    document.getElementById(name).children, function (n) { return n.dataset.key; }
+                ).filter(function (k) { return !known[k]; });
+                applySection(name, {
+                    upsert: rows.map(function (r, i) { return Object.assign({key: keys[i]}, r); }),
+                    delete: gone,
+                    order: keys
+                });
+            });
+        }
+        function onDiff(e) {
+            var changes = JSON.parse(e.data);
+            if (changes.health) applyHealth(changes.health);
+            Object.keys(render).forEach(function (name) {
+                if (changes[name]) applySection(name, changes[name]);
+            });
+        }
+        function connect() {
+            var source = new EventSource("/events");
+            source.addEventListener("snapshot", onSnapshot);
+            source.addEventListener("diff", onDiff);
+            source.onerror = function () {
+                // A 503 (too many open dashboards) closes the source for good
+                if (source.readyState === EventSource.CLOSED) setTimeout(connect, 10000);
+            };
+        }
+        connect();
+    })();
+    </script>
+{% endblock %}
+"""
+
+PAGE = """{% extends "layout.html" %}
+{% block body %}
+    <p><a href="/">← Dashboard</a></p>
+    <h1>{{title}}</h1>
+    {% if rows %}
+    <table>
+        <tr>{% for c in rows[0].keys() %}<th>{{c}}</th>{% endfor %}</tr>
+        {% for r in rows %}
+        <tr>{% for v in r.values() %}<td>{{v if v is not none else ''}}</td>{% endfor %}</tr>
+        {% endfor %}
+    </table>
+    {% else %}
+    <p>No rows.</p>
+    {% endif %}
+    <nav>
+        {% if prev_url %}<a href="{{prev_url}}">← Previous</a>{% endif %}
+        {% if next_url %}<a href="{{next_url}}">Next →</a>{% endif %}
+    </nav>
+{% endblock %}
+"""
+
+TEMPLATES = {"layout.html": LAYOUT, "home.html": HOME, "page.html": PAGE}
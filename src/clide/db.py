@@ -1,40 +1,637 @@
 """Database operations for Clide."""
 
+import atexit
+import json
+import math
+import os
+import random
+import re
 import sqlite3
+import string
+import threading
+import time
 import uuid
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from .config import config
+from .log_writer import ActionRef, BufferedLogWriter, PendingAction
+
+# SQLite's own busy handler timeout, used for everything except taking the
+# write lock (see Database.begin_write)
+BUSY_TIMEOUT_MS = 5000
+
+# Backoff bounds (seconds) between BEGIN IMMEDIATE attempts; each sleep is
+# drawn uniformly from [0, bound) and the bound doubles per attempt
+LOCK_BACKOFF_MIN = 0.002
+LOCK_BACKOFF_MAX = 0.05
+
+
+class LockTimeout(sqlite3.OperationalError):
+    """Gave up waiting for another connection to release the write lock."""
+
+
+def is_busy(error: sqlite3.Error) -> bool:
+    """Whether an error means another connection holds a conflicting lock."""
+    message = str(error)
+    return "database is locked" in message or "database is busy" in message
+
+
+def open_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a SQLite connection configured the way Clide expects.
+
+    ``db_path`` may be a ``file:`` URI, e.g. from ``read_only_uri()``.
+    """
+    conn = sqlite3.connect(
+        db_path, check_same_thread=check_same_thread, uri=db_path.startswith("file:")
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return conn
+
+
+def read_only_uri(db_path: str) -> str:
+    """``file:`` URI opening db_path read-only (writes fail, WAL readers still work)."""
+    return f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+
+def migration_version(name: str) -> Tuple[int, ...]:
+    """Version tuple from a migration file name ("...-v1_10-x.sql" -> (1, 10))."""
+    match = re.search(r"v(\d+(?:_\d+)*)", name)
+    return tuple(int(part) for part in match.group(1).split("_")) if match else ()
+
+
+@lru_cache(maxsize=None)
+def discover_migrations(directory: Optional[str] = None) -> Tuple[str, ...]:
+    """Migration file names in ``directory``, in version order (cached).
+
+    Only the directory listing is read; SQL is parsed when a migration runs.
+    """
+    path = Path(directory) if directory else MIGRATIONS_DIR
+    if not path.is_dir():
+        return ()
+    names = [name for name in os.listdir(path) if name.endswith(".sql")]
+    return tuple(sorted(names, key=lambda name: (migration_version(name), name)))
+
+
+def iter_statements(script: str) -> Iterator[str]:
+    """Split a SQL script into complete statements (trigger bodies included)."""
+    buffer: List[str] = []
+    for line in script.splitlines(keepends=True):
+        buffer.append(line)
+        statement = "".join(buffer)
+        if sqlite3.complete_statement(statement):
+            buffer = []
+            yield statement.strip()
+    rest = "".join(line for line in buffer if not line.lstrip().startswith("--")).strip()
+    if rest:
+        yield rest
+
+
+def _file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    """Return (device, inode) of the database file, or None if it has none."""
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word literally."""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def recall_pattern(text: str) -> "re.Pattern[str]":
+    """Word-prefix regex for a recall term or phrase ("db py" matches "db.py")."""
+    words = [re.escape(word) for word in re.findall(r"[a-z0-9]+", text.lower())]
+    return re.compile(r"(?<![a-z0-9])" + r"[^a-z0-9]+".join(words))
+
+
+# SQLite's lower() only folds ASCII letters
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def split_tags(text: Optional[str]) -> List[str]:
+    """Normalize a comma-separated tag string exactly as the tag triggers do.
+
+    Tabs and newlines separate like commas; each tag is trimmed of spaces
+    and lowercased, both the way SQLite's trim() and lower() do it (ASCII
+    only), so "Ärger" stays "Ärger" here and in the tag index.
+    """
+    if not text:
+        return []
+    for sep in ("\t", "\n", "\r"):
+        text = text.replace(sep, ",")
+    names = (part.strip(" ").translate(ASCII_LOWER) for part in text.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class ConnectionPool:
+    """Thread-local cache of long-lived connections, one per thread and db_path.
+
+    Connections are health-checked before reuse: a connection that no longer
+    answers ``SELECT 1``, or whose database file was deleted or replaced (for
+    example by ``clide init --force``), is closed and reopened transparently.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+
+    def _slots(self) -> Dict[str, Tuple[sqlite3.Connection, Optional[Tuple[int, int]]]]:
+        slots = getattr(self._local, "slots", None)
+        if slots is None:
+            slots = self._local.slots = {}
+        return slots
+
+    def acquire(self, db_path: str) -> sqlite3.Connection:
+        """Return this thread's healthy connection to db_path, opening one if needed."""
+        slots = self._slots()
+        entry = slots.get(db_path)
+        if entry is not None:
+            conn, identity = entry
+            if self._is_healthy(conn, db_path, identity):
+                return conn
+            self._discard(db_path)
+
+        conn = open_connection(db_path, check_same_thread=False)
+        slots[db_path] = (conn, _file_identity(db_path))
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    @staticmethod
+    def _is_healthy(
+        conn: sqlite3.Connection, db_path: str, identity: Optional[Tuple[int, int]]
+    ) -> bool:
+        if identity is not None and _file_identity(db_path) != identity:
+            return False
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _discard(self, db_path: str) -> None:
+        entry = self._slots().pop(db_path, None)
+        if entry is None:
+            return
+        conn = entry[0]
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        with suppress(sqlite3.Error):
+            conn.close()
+
+    def release(self, db_path: str) -> None:
+        """Close this thread's connection to db_path, if any."""
+        self._discard(db_path)
+
+    def close_all(self) -> None:
+        """Close every pooled connection from every thread (shutdown hook)."""
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            with suppress(sqlite3.Error):
+                conn.close()
+        self._local = threading.local()
+
+
+# Repository root holding memory_bank.schema.sql and migrations/
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+MIGRATIONS_DIR = ROOT_DIR / "migrations"
+
+# Databases (path, file identity) already confirmed current by this process
+_current_schemas: Set[Tuple[str, Optional[Tuple[int, int]]]] = set()
+
+# Millisecond timestamps for agent log spans; they sort with datetime('now')
+SPAN_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# Span duration in seconds (rounded to the millisecond timestamps' precision),
+# NULL while the action is still open
+SPAN_DURATION = "ROUND((julianday(ended_at) - julianday(started_at)) * 86400.0, 3)"
+
+# Guard against parent_id cycles when walking a trace
+MAX_TRACE_DEPTH = 256
+
+# Every agents_log column, and the archive database's copy of the table
+LOG_ROW_COLUMNS = (
+    "id, agent, session_id, action, details, started_at, ended_at, parent_id, trace_id"
+)
+# Span trees that started entirely before a cutoff, oldest roots first (params:
+# before, before, root limit). A root is pinned while any span under it is
+# newer, so compaction never deletes a parent whose children are kept (which
+# ON DELETE SET NULL would silently turn into extra roots).
+COMPACTABLE_SPANS = """
+    WITH RECURSIVE
+      pinned(id, parent_id) AS (
+        SELECT id, parent_id FROM agents_log WHERE started_at >= ? AND parent_id IS NOT NULL
+        UNION
+        SELECT a.id, a.parent_id FROM agents_log a JOIN pinned p ON a.id = p.parent_id
+      ),
+      roots(id) AS (
+        SELECT id FROM agents_log
+        WHERE parent_id IS NULL AND started_at < ?
+          AND id NOT IN (SELECT id FROM pinned WHERE parent_id IS NULL)
+        ORDER BY started_at, id LIMIT ?
+      ),
+      tree(id) AS (
+        SELECT id FROM roots
+        UNION ALL
+        SELECT a.id FROM agents_log a JOIN tree t ON a.parent_id = t.id
+      )
+    SELECT id FROM tree
+"""
+
+ARCHIVE_LOG_TABLE = """
+    CREATE TABLE IF NOT EXISTS archive.agents_log (
+        id INTEGER PRIMARY KEY,
+        agent TEXT NOT NULL,
+        session_id TEXT,
+        action TEXT NOT NULL,
+        details TEXT,
+        started_at DATETIME,
+        ended_at DATETIME,
+        parent_id INTEGER,
+        trace_id TEXT
+    )
+"""
+
+# Columns returned by agent log listings
+ACTION_COLUMNS = "id, agent, action, details, trace_id, parent_id, started_at, ended_at"
+
+# Open states counted by the health summary
+OPEN_STORY_STATUSES = ("todo", "in_progress", "blocked")
+OPEN_DEFECT_STATUSES = ("open", "in_progress", "blocked")
+DEFECT_SEVERITIES = ("critical", "major", "minor", "trivial")
+
+# Ground-truth counts from the base tables, in the shape of the counters table
+COUNTS_FROM_TABLES = """
+    SELECT 'story' AS kind, status, '' AS severity, COUNT(*) AS count
+    FROM stories GROUP BY status
+    UNION ALL
+    SELECT 'defect', status, severity, COUNT(*)
+    FROM defects GROUP BY status, severity
+    UNION ALL
+    SELECT 'landmine', COALESCE(solution_verification, ''), '', COUNT(*)
+    FROM landmines GROUP BY COALESCE(solution_verification, '')
+"""
+
+# FTS5 index behind each searchable table, with bm25 column weights
+SEARCH_INDEXES = {
+    "landmines": ("landmines_fts", "summary", "10.0, 4.0, 2.0, 4.0, 4.0, 6.0"),
+    "defects": ("defects_fts", "title", "10.0, 4.0, 2.0"),
+    "stories": ("stories_fts", "title", "10.0, 4.0, 2.0, 6.0"),
+}
+
+# Landmine recall: newest matches read per piece of evidence (an index range
+# scan that stops early, however common the word), and how much each kind
+# of evidence counts before its rarity is weighed in
+RECALL_CANDIDATES = 200
+RECALL_WEIGHTS = {"path": 3.0, "tag": 2.0, "term": 1.0}
+
+# Best candidates re-scored against every piece of evidence
+RECALL_POOL = 50
+
+# Landmine columns covered by landmines_fts
+LANDMINE_TEXT_COLUMNS = ("summary", "cause", "impact", "remediation", "avoidance_rules", "tags")
+
+LANDMINE_FTS_RECALL = (
+    "SELECT rowid FROM landmines_fts WHERE landmines_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+)
+
+LANDMINE_TAG_RECALL = """
+    SELECT landmine_id FROM landmine_tags
+    WHERE tag_id = (SELECT id FROM tags WHERE name = ?)
+    ORDER BY landmine_id DESC LIMIT ?
+"""
+
+# Link table and foreign key column for each taggable table
+TAG_LINKS = {
+    "landmines": ("landmine_tags", "landmine_id"),
+    "stories": ("story_tags", "story_id"),
+}
+
+# Tables that accept bulk imports ("testing" holds test-run history)
+IMPORTABLE_TABLES = ("stories", "defects", "landmines", "testing")
+
+
+# Write-lock wait counters kept per Database (seconds for the wait fields)
+LOCK_COUNTERS = {
+    "transactions": 0,
+    "contended": 0,
+    "retries": 0,
+    "wait": 0.0,
+    "max_wait": 0.0,
+    "timeouts": 0,
+}
+
+# Process-wide pool used by Database instances in pooled mode
+pool = ConnectionPool()
+atexit.register(pool.close_all)
 
 
 class Database:
     """Database manager for Clide memory bank."""
 
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize database manager."""
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pooled: Optional[bool] = None,
+        buffered_log: Optional[bool] = None,
+    ):
+        """Initialize database manager.
+
+        Args:
+            db_path: Path to the SQLite file (defaults to ``config.db_path``)
+            pooled: Reuse a long-lived per-thread connection instead of opening
+                one per call (defaults to ``config.db_pool``)
+            buffered_log: Queue agent log writes for a background thread
+                instead of committing them inline (defaults to ``config.log_buffer``)
+        """
         self.db_path = db_path or config.db_path
+        self.pooled = config.db_pool if pooled is None else pooled
+        self.buffered_log = config.log_buffer if buffered_log is None else buffered_log
+        self._local = threading.local()
+        self._log_writer: Optional[BufferedLogWriter] = None
+        self._log_writer_lock = threading.Lock()
+        self._lock_counts = dict(LOCK_COUNTERS)
+        self._lock_counts_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        if self.pooled:
+            return pool.acquire(self.db_path)
+        return open_connection(self.db_path)
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether this thread is inside a ``transaction()`` block."""
+        return getattr(self._local, "conn", None) is not None
 
     @contextmanager
-    def connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")
+    def connection(self, write: bool = False):
+        """Context manager for database connections.
+
+        Commits on success and rolls back on error. In pooled mode the
+        underlying connection is kept open for the next call. Inside a
+        ``transaction()`` block the transaction's connection is reused and
+        committing is left to the enclosing transaction. With ``write`` the
+        write lock is taken up front through ``begin_write()``.
+        """
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+
+        conn = self._open()
         try:
+            if write:
+                self.begin_write(conn)
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
+        finally:
+            if not self.pooled:
+                conn.close()
+
+    @contextmanager
+    def transaction(self, write: bool = True, timeout: Optional[float] = None):
+        """Group every database call in the block into one connection and commit.
+
+        All ``Database`` methods called inside the block on this thread share
+        the same connection, so a command pays for a single durable commit.
+        Nested ``transaction()`` blocks become savepoints: an error inside a
+        nested block rolls back only that block, while an error escaping the
+        outermost block rolls back everything.
+
+        Write transactions take the write lock up front (``begin_write()``),
+        waiting at most ``timeout`` seconds (``config.lock_timeout`` by
+        default), so they never fail halfway when another process commits
+        first. Pass ``write=False`` for read-only blocks, which then share a
+        snapshot without blocking writers.
+
+        Example:
+            with db.transaction():
+                story_id = db.create_story("Title")
+                db.log_action("Clide", "create_story", f"Created #{story_id}")
+        """
+        state = self._local
+        conn = getattr(state, "conn", None)
+
+        if conn is not None:
+            savepoint = f"clide_sp_{state.depth}"
+            state.depth += 1
+            conn.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+            finally:
+                state.depth -= 1
+            return
+
+        conn = self._open()
+        try:
+            if write:
+                self.begin_write(conn, timeout)
+            else:
+                conn.execute("BEGIN")
+        except BaseException:
+            if not self.pooled:
+                conn.close()
+            raise
+        state.conn = conn
+        state.depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            state.conn = None
+            state.depth = 0
+            if not self.pooled:
+                conn.close()
+
+    def begin_write(self, conn: sqlite3.Connection, timeout: Optional[float] = None) -> float:
+        """Start a write transaction on ``conn``, waiting for the write lock.
+
+        SQLite's busy handler polls on a fixed schedule, so concurrent writers
+        retry in lockstep. Instead ``BEGIN IMMEDIATE`` is attempted without
+        it and retried after a random sleep whose bound doubles each attempt
+        (full jitter). Raises LockTimeout after ``timeout`` seconds
+        (``config.lock_timeout`` by default). Returns the seconds waited,
+        which are also added to ``lock_stats``.
+        """
+        timeout = config.lock_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        bound = LOCK_BACKOFF_MIN
+        retries = 0
+        conn.execute("PRAGMA busy_timeout = 0")
+        try:
+            while True:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    break
+                except sqlite3.OperationalError as e:
+                    now = time.monotonic()
+                    if not is_busy(e):
+                        raise
+                    if now >= deadline:
+                        self._count_lock_wait(now - started, retries, timed_out=True)
+                        raise LockTimeout(
+                            f"database is locked: no write lock after {now - started:.1f}s"
+                        ) from e
+                    retries += 1
+                    time.sleep(min(random.uniform(0, bound), deadline - now))
+                    bound = min(bound * 2, LOCK_BACKOFF_MAX)
+        finally:
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        waited = time.monotonic() - started
+        self._count_lock_wait(waited, retries)
+        return waited
+
+    def _count_lock_wait(self, waited: float, retries: int, timed_out: bool = False) -> None:
+        with self._lock_counts_lock:
+            counts = self._lock_counts
+            counts["transactions"] += 1
+            if retries or timed_out:
+                counts["contended"] += 1
+                counts["retries"] += retries
+                counts["wait"] += waited
+                counts["max_wait"] = max(counts["max_wait"], waited)
+            counts["timeouts"] += timed_out
+
+    @property
+    def lock_stats(self) -> Dict[str, Any]:
+        """Write-lock counters since the last ``reset_lock_stats()``.
+
+        ``transactions`` counts write transactions started; ``contended``
+        those that had to retry, with their ``retries``, total ``wait`` and
+        ``max_wait`` in seconds; ``timeouts`` those that gave up.
+        """
+        with self._lock_counts_lock:
+            return dict(self._lock_counts)
+
+    def reset_lock_stats(self) -> Dict[str, Any]:
+        """Return the write-lock counters and start counting from zero."""
+        with self._lock_counts_lock:
+            stats, self._lock_counts = self._lock_counts, dict(LOCK_COUNTERS)
+        return stats
+
+    def record_lock_waits(self, command: str) -> bool:
+        """Store this process's lock waits for ``command`` in ``lock_waits``.
+
+        Only commands that waited for the write lock are recorded, so
+        uncontended commands pay nothing. Best effort: gives up after one
+        second rather than delaying the command further. Returns whether a
+        row was written.
+        """
+        stats = self.reset_lock_stats()
+        if not stats["contended"] or self.in_transaction:
+            return False
+        try:
+            with self.transaction(timeout=1.0) as conn:
+                conn.execute(
+                    """
+                    INSERT INTO lock_waits
+                    (command, pid, transactions, contended, retries, wait_ms, max_wait_ms,
+                     timeouts)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        command,
+                        os.getpid(),
+                        stats["transactions"],
+                        stats["contended"],
+                        stats["retries"],
+                        round(stats["wait"] * 1000, 3),
+                        round(stats["max_wait"] * 1000, 3),
+                        stats["timeouts"],
+                    ),
+                )
+        except sqlite3.Error:
+            return False
+        finally:
+            # The insert's own lock wait is not part of the command
+            self.reset_lock_stats()
+        return True
+
+    def get_lock_report(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-command lock waits: invocations that waited, totals and tails.
+
+        ``p50_ms``/``p95_ms`` are nearest-rank percentiles of the per-invocation
+        wait; worst p95 first.
+        """
+        where, params = ("WHERE recorded_at >= ?", (since,)) if since else ("", ())
+        query = f"""
+            WITH ranked AS (
+                SELECT *,
+                       ROW_NUMBER() OVER (PARTITION BY command ORDER BY wait_ms) AS rank,
+                       COUNT(*) OVER (PARTITION BY command) AS total
+                FROM lock_waits
+                {where}
+            )
+            SELECT command, total AS invocations,
+                   SUM(transactions) AS transactions,
+                   SUM(contended) AS contended,
+                   SUM(retries) AS retries,
+                   ROUND(SUM(wait_ms), 1) AS wait_ms,
+                   MIN(CASE WHEN rank >= 0.50 * total THEN wait_ms END) AS p50_ms,
+                   MIN(CASE WHEN rank >= 0.95 * total THEN wait_ms END) AS p95_ms,
+                   MAX(max_wait_ms) AS max_ms,
+                   SUM(timeouts) AS timeouts,
+                   MAX(recorded_at) AS last_seen
+            FROM ranked
+            GROUP BY command
+            ORDER BY p95_ms DESC, command
+        """
+        return [dict(row) for row in self.execute(query, params)]
+
+    def write_lock_held(self) -> bool:
+        """Whether another connection holds the write lock right now."""
+        conn = open_connection(self.db_path)
+        try:
+            conn.execute("PRAGMA busy_timeout = 0")
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                if is_busy(e):
+                    return True
+                raise
+            conn.rollback()
+            return False
         finally:
             conn.close()
 
-    def execute(self, query: str, params: Union[tuple, dict] = ()) -> List[sqlite3.Row]:
-        """Execute query and return results."""
-        with self.connection() as conn:
+    def close(self) -> None:
+        """Close this thread's pooled connection (no-op when not pooled)."""
+        if self.pooled:
+            pool.release(self.db_path)
+
+    def execute(
+        self, query: str, params: Union[tuple, dict] = (), write: bool = False
+    ) -> List[sqlite3.Row]:
+        """Execute query and return results (``write`` takes the write lock first)."""
+        with self.connection(write) as conn:
             return conn.execute(query, params).fetchall()
 
     def execute_one(self, query: str, params: Union[tuple, dict] = ()) -> Optional[sqlite3.Row]:
@@ -43,65 +640,243 @@ class Database:
             result = conn.execute(query, params).fetchone()
             return result
 
+    def iter_rows(
+        self, query: str, params: Union[tuple, dict] = (), batch_size: int = 500
+    ) -> Iterator[sqlite3.Row]:
+        """Yield query results lazily, fetching batch_size rows at a time.
+
+        Unlike execute(), memory use stays flat regardless of result size.
+        """
+        with self.connection() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
     def execute_script(self, script: str) -> None:
-        """Execute SQL script."""
+        """Execute SQL script.
+
+        Scripts commit any pending transaction first, so this must not be
+        called inside a ``transaction()`` block.
+        """
+        if self.in_transaction:
+            raise RuntimeError("execute_script() cannot run inside a transaction")
         with self.connection() as conn:
             conn.executescript(script)
 
     def initialize(self) -> bool:
-        """Initialize database from schema files."""
-        schema_path = Path(__file__).parent.parent.parent / "memory_bank.schema.sql"
-        migration_path = Path(__file__).parent.parent.parent / "migrations" / "2025-08-28-v1_1.sql"
+        """Create the database from the base schema, then apply all migrations."""
+        schema_path = ROOT_DIR / "memory_bank.schema.sql"
 
         if not schema_path.exists():
             return False
 
-        # Create database
-        with open(schema_path) as f:
-            self.execute_script(f.read())
-
-        # Apply migrations
-        if migration_path.exists():
-            with open(migration_path) as f:
+        # The base schema sets file-level pragmas, so it only runs on new files
+        if not self.has_table("meta"):
+            with open(schema_path) as f:
                 self.execute_script(f.read())
 
+        self.migrate()
+        return True
+
+    # ========== Migrations ==========
+
+    @property
+    def user_version(self) -> int:
+        """Number of migrations applied, as recorded in ``PRAGMA user_version``."""
+        return self.execute_one("PRAGMA user_version")[0]
+
+    def is_current(self) -> bool:
+        """Whether every discovered migration has been applied.
+
+        One ``PRAGMA user_version`` read, cached per database file for the
+        life of the process.
+        """
+        key = (self.db_path, _file_identity(self.db_path))
+        if key in _current_schemas:
+            return True
+        current = self.user_version >= len(discover_migrations())
+        if current:
+            _current_schemas.add(key)
+        return current
+
+    def applied_migrations(self) -> Set[str]:
+        """Names of migrations recorded in ``meta``.
+
+        Databases from before migrations were recorded are baselined from
+        their ``schema_version``: every migration up to that version counts as
+        applied, since each migration bumps it as its last statement.
+        """
+        rows = self.execute("SELECT key, value FROM meta WHERE key LIKE 'migration:%'")
+        applied = {row["key"].split(":", 1)[1] for row in rows}
+        if applied:
+            return applied
+        row = self.execute_one("SELECT value FROM meta WHERE key = 'schema_version'")
+        if row is None:
+            return set()
+        baseline = migration_version(f"v{str(row[0]).replace('.', '_')}")
+        return {name for name in discover_migrations() if migration_version(name) <= baseline}
+
+    def pending_migrations(self) -> List[str]:
+        """Migrations not yet applied, in the order they will run."""
+        applied = self.applied_migrations()
+        return [name for name in discover_migrations() if name not in applied]
+
+    def migrate(self) -> List[str]:
+        """Apply pending migrations, each in its own transaction.
+
+        Returns the names applied. Cheap when nothing is pending: after the
+        first check only the cached ``user_version`` comparison runs.
+        """
+        if self.is_current():
+            return []
+        if self.in_transaction:
+            raise RuntimeError("migrate() cannot run inside a transaction")
+
+        applied = self.applied_migrations()
+        ran = []
+        for name in discover_migrations():
+            if name in applied:
+                continue
+            if self.apply_migration(name, version=len(applied) + 1):
+                ran.append(name)
+            applied.add(name)
+
+        # Record baselined migrations too, so later runs skip the fallback
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES (?, 'baseline')",
+                [(f"migration:{name}",) for name in applied],
+            )
+            conn.execute(f"PRAGMA user_version = {len(applied)}")
+        self.is_current()
+        return ran
+
+    def apply_migration(self, name: str, version: Optional[int] = None) -> bool:
+        """Apply one migration script atomically and record it in ``meta``.
+
+        The write lock is taken first and the record re-checked, so concurrent
+        processes upgrading the same file apply each migration once.
+        ``version`` sets ``PRAGMA user_version`` in the same transaction.
+        Returns False if the file is missing or was already applied.
+        """
+        migration_path = MIGRATIONS_DIR / name
+        if not migration_path.exists():
+            return False
+        with open(migration_path) as f:
+            script = f.read()
+
+        with self.connection() as conn:
+            self.begin_write(conn)
+            try:
+                done = conn.execute(
+                    "SELECT 1 FROM meta WHERE key = ?", (f"migration:{name}",)
+                ).fetchone()
+                if done:
+                    conn.rollback()
+                    return False
+                for statement in iter_statements(script):
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES (?, datetime('now'))",
+                    (f"migration:{name}",),
+                )
+                if version is not None:
+                    conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
         return True
 
+    def has_table(self, name: str) -> bool:
+        """Check whether a table (or virtual table) exists."""
+        row = self.execute_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        )
+        return row is not None
+
     # ========== Agent Log Operations ==========
 
+    @property
+    def log_writer(self) -> Optional[BufferedLogWriter]:
+        """The background log writer, started on first use in buffered mode."""
+        if not self.buffered_log:
+            return None
+        with self._log_writer_lock:
+            if self._log_writer is None or self._log_writer.closed:
+                self._log_writer = BufferedLogWriter(
+                    self, max_size=config.log_buffer_size, policy=config.log_buffer_policy
+                )
+            return self._log_writer
+
+    @property
+    def log_stats(self) -> Optional[Dict[str, int]]:
+        """Buffered log writer counters, or None if nothing was buffered."""
+        writer = self._log_writer
+        return writer.stats if writer is not None else None
+
+    def flush_log(self, close: bool = False, timeout: Optional[float] = 5.0) -> bool:
+        """Write out buffered log entries; with ``close`` also stop the writer.
+
+        The writer commits on its own connection, so this must not be called
+        inside a ``transaction()`` block. Returns False if the writer did not
+        finish within ``timeout``.
+        """
+        writer = self._log_writer
+        if writer is None or writer.closed:
+            return True
+        if self.in_transaction:
+            raise RuntimeError("flush_log() cannot run inside a transaction")
+        return writer.close(timeout) if close else writer.flush(timeout)
+
     def log_action(
         self,
         agent: str,
         action: str,
         details: Optional[str] = None,
         trace_id: Optional[str] = None,
-        parent_id: Optional[int] = None,
-    ) -> int:
-        """Log an agent action."""
-        query = """
-            INSERT INTO agents_log (agent, action, details, trace_id, parent_id)
-            VALUES (?, ?, ?, ?, ?)
+        parent_id: Optional[ActionRef] = None,
+        started_at: Optional[str] = None,
+    ) -> ActionRef:
+        """Log an agent action.
+
+        ``started_at`` (from ``log_writer.span_now``) backdates the start, so a command
+        can do its reads first and write its whole span in one commit at the
+        end. In buffered mode this returns a ``PendingAction`` handle whose
+        ``id`` is filled in once the background writer has inserted the row.
         """
-        with self.connection() as conn:
-            cursor = conn.execute(query, (agent, action, details, trace_id, parent_id))
+        writer = self.log_writer
+        if writer is not None:
+            return writer.log_action(agent, action, details, trace_id, parent_id, started_at)
+        if isinstance(parent_id, PendingAction):
+            parent_id = parent_id.id
+        query = f"""
+            INSERT INTO agents_log (agent, action, details, trace_id, parent_id, started_at)
+            VALUES (?, ?, ?, ?, ?, COALESCE(?, {SPAN_NOW}))
+        """
+        with self.connection(write=True) as conn:
+            cursor = conn.execute(query, (agent, action, details, trace_id, parent_id, started_at))
             return cursor.lastrowid
 
-    def end_action(self, log_id: int) -> None:
+    def end_action(self, log_id: Optional[ActionRef]) -> None:
         """Mark action as ended."""
-        query = "UPDATE agents_log SET ended_at = datetime('now') WHERE id = ?"
-        self.execute(query, (log_id,))
+        if log_id is None:
+            return
+        writer = self.log_writer
+        if writer is not None:
+            writer.end_action(log_id)
+            return
+        if isinstance(log_id, PendingAction):
+            log_id = log_id.id
+        query = f"UPDATE agents_log SET ended_at = {SPAN_NOW} WHERE id = ?"
+        self.execute(query, (log_id,), write=True)
 
     def get_recent_actions(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent agent actions."""
-        query = """
-            SELECT id, agent, action, details, trace_id, parent_id,
-                   started_at, ended_at
-            FROM agents_log
-            ORDER BY started_at DESC
-            LIMIT ?
-        """
-        rows = self.execute(query, (limit,))
-        return [dict(row) for row in rows]
+        return self.get_actions_page(limit)
 
     # ========== Configuration Operations ==========
 
@@ -129,7 +904,7 @@ class Database:
                 notes = excluded.notes,
                 updated_at = datetime('now')
         """
-        self.execute(query, (scope, name, value, source, notes))
+        self.execute(query, (scope, name, value, source, notes), write=True)
 
     # ========== Stories Operations ==========
 
@@ -148,21 +923,22 @@ class Database:
             (title, description, priority, assignee, labels, acceptance_criteria)
             VALUES (?, ?, ?, ?, ?, ?)
         """
-        with self.connection() as conn:
+        with self.connection(write=True) as conn:
             cursor = conn.execute(
                 query,
                 (title, description, priority, assignee, labels, acceptance_criteria),
             )
             return cursor.lastrowid
 
-    def get_open_stories(self) -> List[Dict[str, Any]]:
-        """Get all open stories."""
+    def get_open_stories(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get open stories, highest priority first (all of them unless limit is set)."""
         query = """
             SELECT * FROM stories
             WHERE status IN ('todo', 'in_progress', 'blocked')
             ORDER BY priority ASC, created_at ASC
+            LIMIT ?
         """
-        rows = self.execute(query)
+        rows = self.execute(query, (-1 if limit is None else limit,))
         return [dict(row) for row in rows]
 
     # ========== Defects Operations ==========
@@ -180,15 +956,18 @@ class Database:
             INSERT INTO defects (title, description, severity, detected_by, story_id)
             VALUES (?, ?, ?, ?, ?)
         """
-        with self.connection() as conn:
+        with self.connection(write=True) as conn:
             cursor = conn.execute(query, (title, description, severity, detected_by, story_id))
             return cursor.lastrowid
 
-    def get_open_defects(self) -> List[Dict[str, Any]]:
-        """Get all open defects."""
-        query = """
+    def get_open_defects(
+        self, severity: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get open defects, most severe first, optionally of a single severity."""
+        severity_filter = "AND severity = ?" if severity else ""
+        query = f"""
             SELECT * FROM defects
-            WHERE status IN ('open', 'in_progress', 'blocked')
+            WHERE status IN ('open', 'in_progress', 'blocked') {severity_filter}
             ORDER BY
                 CASE severity
                     WHEN 'critical' THEN 1
@@ -197,8 +976,10 @@ class Database:
                     ELSE 3
                 END,
                 created_at ASC
+            LIMIT ?
         """
-        rows = self.execute(query)
+        params = (severity,) if severity else ()
+        rows = self.execute(query, params + (-1 if limit is None else limit,))
         return [dict(row) for row in rows]
 
     def resolve_defect(self, defect_id: int, resolution: str, status: str = "resolved") -> None:
@@ -208,7 +989,7 @@ class Database:
             SET status = ?, resolution = ?, resolved_at = datetime('now')
             WHERE id = ?
         """
-        self.execute(query, (status, resolution, defect_id))
+        self.execute(query, (status, resolution, defect_id), write=True)
 
     # ========== Landmines Operations ==========
 
@@ -228,7 +1009,7 @@ class Database:
             (summary, cause, impact, detection, remediation, avoidance_rules, tags)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """
-        with self.connection() as conn:
+        with self.connection(write=True) as conn:
             cursor = conn.execute(
                 query,
                 (summary, cause, impact, detection, remediation, avoidance_rules, tags),
@@ -236,22 +1017,73 @@ class Database:
             return cursor.lastrowid
 
     def get_landmines(self, limit: int = 20, tags: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get recent landmines."""
+        """Get recent landmines, optionally only those with any of the given tags."""
         if tags:
-            query = """
-                SELECT * FROM landmines
-                WHERE tags LIKE ?
-                ORDER BY updated_at DESC
+            return self.get_tagged("landmines", split_tags(tags), limit=limit)
+        query = """
+            SELECT * FROM landmines
+            ORDER BY updated_at DESC
+            LIMIT ?
+        """
+        rows = self.execute(query, (limit,))
+        return [dict(row) for row in rows]
+
+    # ========== Tag Operations ==========
+
+    def tag_filter(self, kind: str, tags: List[str]) -> Tuple[str, Tuple[Any, ...]]:
+        """Return an ``id IN (...)`` SQL condition matching rows with any of tags."""
+        link_table, fk = TAG_LINKS[kind]
+        placeholders = ", ".join("?" for _ in tags)
+        condition = f"""id IN (
+            SELECT lt.{fk} FROM {link_table} lt
+            JOIN tags t ON t.id = lt.tag_id
+            WHERE t.name IN ({placeholders})
+        )"""
+        return condition, tuple(tags)
+
+    def get_tagged(self, kind: str, tags: List[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """Get landmines or stories carrying any of the (normalized) tags."""
+        if not tags:
+            return []
+        condition, params = self.tag_filter(kind, tags)
+        query = f"SELECT * FROM {kind} WHERE {condition} ORDER BY updated_at DESC LIMIT ?"
+        rows = self.execute(query, params + (limit,))
+        return [dict(row) for row in rows]
+
+    def get_tag_counts(
+        self, kind: str = "landmines", since: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Count landmines or stories per tag, most used first.
+
+        Args:
+            kind: "landmines" or "stories"
+            since: Only count rows created at or after this SQLite datetime
+            limit: Maximum number of tags to return
+        """
+        link_table, fk = TAG_LINKS[kind]
+        if since:
+            query = f"""
+                SELECT t.name AS tag, COUNT(*) AS count
+                FROM {link_table} lt
+                JOIN tags t ON t.id = lt.tag_id
+                JOIN {kind} x ON x.id = lt.{fk}
+                WHERE x.created_at >= ?
+                GROUP BY lt.tag_id
+                ORDER BY count DESC, t.name
                 LIMIT ?
             """
-            rows = self.execute(query, (f"%{tags}%", limit))
+            params: Tuple[Any, ...] = (since, limit)
         else:
-            query = """
-                SELECT * FROM landmines
-                ORDER BY updated_at DESC
+            query = f"""
+                SELECT t.name AS tag, COUNT(*) AS count
+                FROM {link_table} lt
+                JOIN tags t ON t.id = lt.tag_id
+                GROUP BY lt.tag_id
+                ORDER BY count DESC, t.name
                 LIMIT ?
             """
-            rows = self.execute(query, (limit,))
+            params = (limit,)
+        rows = self.execute(query, params)
         return [dict(row) for row in rows]
 
     # ========== Testing Operations ==========
@@ -272,10 +1104,10 @@ class Database:
                 SET status = ?, last_run_status = ?, last_run_at = datetime('now')
                 WHERE id = ?
             """
-            self.execute(query, (status, last_run_status, testing_id))
+            self.execute(query, (status, last_run_status, testing_id), write=True)
         else:
             query = "UPDATE testing SET status = ? WHERE id = ?"
-            self.execute(query, (status, testing_id))
+            self.execute(query, (status, testing_id), write=True)
 
     def record_test_run(
         self, area: str, status: str, details: Optional[str] = None
@@ -303,7 +1135,7 @@ class Database:
                 INSERT INTO testing (area, steps, expected, status, last_run_status, last_run_at)
                 VALUES (?, ?, ?, ?, ?, datetime('now'))
             """
-            with self.connection() as conn:
+            with self.connection(write=True) as conn:
                 cursor = conn.execute(
                     query,
                     (area, details or "Automated test", "Test passes", "active", status),
@@ -312,6 +1144,683 @@ class Database:
 
         return None
 
+    # ========== Bulk Import Operations ==========
+
+    def get_import_checkpoint(self, key: str) -> int:
+        """Return how many rows of an import have been committed so far."""
+        row = self.execute_one("SELECT value FROM meta WHERE key = ?", (f"import:{key}",))
+        return int(row["value"]) if row else 0
+
+    def clear_import_checkpoint(self, key: str) -> None:
+        """Forget the progress recorded for an import."""
+        self.execute("DELETE FROM meta WHERE key = ?", (f"import:{key}",), write=True)
+
+    def _defer_indexes(self, table: str) -> None:
+        """Drop secondary indexes on table, remembering their DDL in meta."""
+        meta_key = f"import_deferred_indexes:{table}"
+        with self.transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (meta_key,)).fetchone()
+            saved = json.loads(row["value"]) if row else {}
+            indexes = conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            ).fetchall()
+            for index in indexes:
+                saved[index["name"]] = index["sql"]
+                conn.execute(f'DROP INDEX IF EXISTS "{index["name"]}"')
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                (meta_key, json.dumps(saved)),
+            )
+
+    def _restore_indexes(self, table: str) -> int:
+        """Recreate indexes dropped by _defer_indexes and return how many."""
+        meta_key = f"import_deferred_indexes:{table}"
+        with self.transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (meta_key,)).fetchone()
+            if not row:
+                return 0
+            saved = json.loads(row["value"])
+            for sql in saved.values():
+                conn.execute(sql.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+            conn.execute("DELETE FROM meta WHERE key = ?", (meta_key,))
+            return len(saved)
+
+    def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+        checkpoint_key: Optional[str] = None,
+        defer_indexes: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Stream rows into table with executemany, one transaction per batch.
+
+        Columns are taken from the first row; later rows missing a column
+        insert NULL for it, and a later row with a column the first row lacks
+        raises ValueError rather than losing that value.
+
+        When checkpoint_key is given, the number of committed rows is stored
+        in ``meta`` inside each batch's transaction, so re-running the same
+        import skips rows that were already committed.
+
+        Args:
+            table: One of IMPORTABLE_TABLES
+            rows: Iterable of column -> value mappings (consumed lazily)
+            batch_size: Rows per executemany call and commit
+            checkpoint_key: Identifies the import for restarts
+            defer_indexes: Drop secondary indexes during the load and rebuild
+                them once at the end
+            progress: Called with the total committed row count after each batch
+
+        Returns:
+            Number of rows inserted by this call (excluding skipped rows)
+        """
+        if table not in IMPORTABLE_TABLES:
+            raise ValueError(f"Cannot import into '{table}'")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        known = {row["name"] for row in self.execute(f"PRAGMA table_info({table})")}
+        skip = self.get_import_checkpoint(checkpoint_key) if checkpoint_key else 0
+        committed = skip
+        inserted = 0
+        iterator = iter(rows)
+
+        for _ in range(skip):
+            if next(iterator, None) is None:
+                break
+
+        if defer_indexes:
+            self._defer_indexes(table)
+
+        columns: List[str] = []
+        allowed: Set[str] = set()
+        query = ""
+        batch: List[Tuple[Any, ...]] = []
+
+        def flush() -> None:
+            nonlocal committed, inserted
+            with self.transaction() as conn:
+                conn.executemany(query, batch)
+                if checkpoint_key:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                        (f"import:{checkpoint_key}", str(committed + len(batch))),
+                    )
+            committed += len(batch)
+            inserted += len(batch)
+            batch.clear()
+            if progress:
+                progress(committed)
+
+        try:
+            for row in iterator:
+                if not columns:
+                    columns = [col for col in row if col != "id"]
+                    unknown = sorted(set(columns) - known)
+                    if unknown:
+                        raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+                    placeholders = ", ".join("?" for _ in columns)
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                    allowed = {*columns, "id"}
+                elif not allowed.issuperset(row):
+                    extra = sorted(set(row) - allowed)
+                    raise ValueError(
+                        f"Row {committed + len(batch) + 1} has column(s) missing from the"
+                        f" first row: {', '.join(extra)}"
+                    )
+                batch.append(tuple(row.get(col) for col in columns))
+                if len(batch) >= batch_size:
+                    flush()
+
+            if batch:
+                flush()
+        finally:
+            # Also rebuilds indexes left dropped by an interrupted earlier run
+            self._restore_indexes(table)
+
+        return inserted
+
+    # ========== Search Operations ==========
+
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Iterable[str]] = None,
+        limit: int = 20,
+        raw: bool = False,
+        highlight: Tuple[str, str] = ("**", "**"),
+    ) -> List[Dict[str, Any]]:
+        """Full-text search landmines, defects and stories, best matches first.
+
+        Args:
+            query: Words to find (all must match), or FTS5 syntax when raw=True
+            kinds: Restrict to some of "landmines", "defects", "stories"
+            limit: Maximum number of results across all kinds
+            raw: Pass query to FTS5 unchanged (enables OR, NEAR, prefix*, column:)
+            highlight: Markers placed around matched terms in snippets
+
+        Returns:
+            Dicts with kind, id, title, snippet and rank (lower is better)
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+
+        selected = list(kinds) if kinds else list(SEARCH_INDEXES)
+        parts = []
+        params: List[Any] = []
+        for kind in selected:
+            if kind not in SEARCH_INDEXES:
+                raise ValueError(f"Unknown search kind: {kind}")
+            fts, title_col, weights = SEARCH_INDEXES[kind]
+            parts.append(f"""
+                SELECT '{kind}' AS kind, rowid AS id, {title_col} AS title,
+                       snippet({fts}, -1, ?, ?, '...', 12) AS snippet,
+                       bm25({fts}, {weights}) AS rank
+                FROM {fts} WHERE {fts} MATCH ?
+                """)
+            params.extend([highlight[0], highlight[1], match])
+
+        sql = " UNION ALL ".join(parts) + " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        rows = self.execute(sql, tuple(params))
+        return [dict(row) for row in rows]
+
+    def recall_landmines(
+        self,
+        phrases: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        terms: Iterable[str] = (),
+        limit: int = 10,
+        budget_ms: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Rank landmines against a working set, using the FTS and tag indexes.
+
+        Each piece of evidence (a file-name phrase such as "db py", a tag, a
+        search term) reads its newest ``RECALL_CANDIDATES`` matches from the
+        FTS5 or tag index, a bounded scan however common it is. Its idf comes
+        from that list: exact when the list is short, otherwise estimated from
+        the id range the newest matches span.
+
+        Landmines found score their kind's weight times idf per evidence they
+        were found by. The best ``RECALL_POOL`` are then re-scored against all
+        the evidence, since a landmine outside one common word's newest
+        matches may still contain it: tags exactly, phrases and terms as
+        word-prefix matches over the indexed columns. Ties go to newer ones.
+
+        ``budget_ms`` bounds the time spent: once the deadline passes, the
+        running query is interrupted and ranking uses the evidence read so
+        far (paths first, then tags, then terms).
+
+        Returns:
+            (rows with ``score`` and ``matched`` evidence kinds, best first;
+             whether the budget cut the search short)
+        """
+        evidence = [("path", phrase, f'"{phrase}"') for phrase in phrases]
+        evidence += [("tag", tag, tag) for tag in tags]
+        evidence += [("term", term, fts_query(term)) for term in terms]
+
+        scores: Dict[int, float] = {}
+        weighted: List[Tuple[str, str, float]] = []
+        truncated = False
+        with self.connection() as conn:
+            newest = conn.execute("SELECT COALESCE(MAX(id), 0) FROM landmines").fetchone()[0]
+            deadline = None
+            if budget_ms is not None:
+                deadline = time.perf_counter() + budget_ms / 1000
+                conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+            try:
+                for kind, value, param in evidence:
+                    if deadline is not None and time.perf_counter() > deadline:
+                        truncated = True
+                        break
+                    query = LANDMINE_TAG_RECALL if kind == "tag" else LANDMINE_FTS_RECALL
+                    try:
+                        ids = [row[0] for row in conn.execute(query, (param, RECALL_CANDIDATES))]
+                    except sqlite3.OperationalError as e:
+                        if "interrupted" not in str(e):
+                            raise
+                        truncated = True
+                        break
+                    if not ids:
+                        continue
+                    frequency = len(ids)
+                    if frequency == RECALL_CANDIDATES:
+                        frequency = frequency * newest / (newest - ids[-1] + 1)
+                    weight = RECALL_WEIGHTS[kind] * math.log(1 + newest / frequency)
+                    weighted.append((kind, value, weight))
+                    for landmine_id in ids:
+                        scores[landmine_id] = scores.get(landmine_id, 0.0) + weight
+            finally:
+                conn.set_progress_handler(None, 0)
+
+            candidates = sorted(scores, key=lambda i: (-scores[i], -i))[:RECALL_POOL]
+            if not candidates:
+                return [], truncated
+            placeholders = ", ".join("?" for _ in candidates)
+            rows = conn.execute(
+                f"SELECT * FROM landmines WHERE id IN ({placeholders})", tuple(candidates)
+            ).fetchall()
+
+        checks = [(kind, value, weight, recall_pattern(value)) for kind, value, weight in weighted]
+        results = []
+        for row in map(dict, rows):
+            text = " ".join(str(row[column] or "") for column in LANDMINE_TEXT_COLUMNS).lower()
+            row_tags = split_tags(row["tags"])
+            score, kinds = 0.0, []
+            for kind, value, weight, pattern in checks:
+                if value in row_tags if kind == "tag" else pattern.search(text):
+                    score += weight
+                    if kind not in kinds:
+                        kinds.append(kind)
+            row["score"] = round(score, 4)
+            row["matched"] = kinds
+            results.append(row)
+        results.sort(key=lambda row: (-row["score"], -row["id"]))
+        return results[:limit], truncated
+
+    # ========== Health Summary ==========
+
+    def get_health_summary(self) -> Dict[str, Any]:
+        """Return open-work counts by status and severity.
+
+        Reads the trigger-maintained ``counters`` table, which holds one row
+        per (kind, status, severity), so the cost is independent of how many
+        stories, defects and landmines exist. Memory banks created before
+        v1.5 fall back to one grouped pass over the covering status indexes.
+
+        Returns:
+            {"stories": {"total", "todo", "in_progress", "blocked"},
+             "defects": {"total", "open", "in_progress", "blocked"},
+             "severity": {"critical", "major", "minor", "trivial"},
+             "landmines": int}
+        """
+        try:
+            rows = self.execute("SELECT kind, status, severity, count FROM counters")
+        except sqlite3.OperationalError:
+            rows = self.execute(COUNTS_FROM_TABLES)
+
+        summary: Dict[str, Any] = {
+            "stories": dict.fromkeys(("total",) + OPEN_STORY_STATUSES, 0),
+            "defects": dict.fromkeys(("total",) + OPEN_DEFECT_STATUSES, 0),
+            "severity": dict.fromkeys(DEFECT_SEVERITIES, 0),
+            "landmines": 0,
+        }
+        for row in rows:
+            kind, status, count = row["kind"], row["status"], row["count"]
+            if kind == "story" and status in OPEN_STORY_STATUSES:
+                summary["stories"][status] += count
+                summary["stories"]["total"] += count
+            elif kind == "defect" and status in OPEN_DEFECT_STATUSES:
+                summary["defects"][status] += count
+                summary["defects"]["total"] += count
+                severity = summary["severity"]
+                severity[row["severity"]] = severity.get(row["severity"], 0) + count
+            elif kind == "landmine":
+                summary["landmines"] += count
+        return summary
+
+    def recount(self, fix: bool = True) -> List[Dict[str, Any]]:
+        """Compare the counters table with the base tables and optionally rebuild it.
+
+        Args:
+            fix: Replace every counter with freshly computed values
+
+        Returns:
+            One dict per drifted key: kind, status, severity, stored, actual
+        """
+        with self.transaction(write=fix) as conn:
+            actual = {
+                (r["kind"], r["status"], r["severity"]): r["count"]
+                for r in conn.execute(COUNTS_FROM_TABLES)
+            }
+            stored = {
+                (r["kind"], r["status"], r["severity"]): r["count"]
+                for r in conn.execute("SELECT kind, status, severity, count FROM counters")
+            }
+            drift = [
+                {
+                    "kind": key[0],
+                    "status": key[1],
+                    "severity": key[2],
+                    "stored": stored.get(key, 0),
+                    "actual": actual.get(key, 0),
+                }
+                for key in sorted(set(actual) | set(stored))
+                if stored.get(key, 0) != actual.get(key, 0)
+            ]
+            if fix:
+                conn.execute("DELETE FROM counters")
+                conn.executemany(
+                    "INSERT INTO counters(kind, status, severity, count) VALUES (?, ?, ?, ?)",
+                    [key + (count,) for key, count in actual.items()],
+                )
+        return drift
+
+    # ========== Keyset Pagination ==========
+
+    def get_cursor_key(self, source: str, order_col: str, row_id: int) -> Optional[Tuple[Any, int]]:
+        """Return the (order value, id) key of a row, or None if it is gone."""
+        row = self.execute_one(f"SELECT {order_col}, id FROM {source} WHERE id = ?", (row_id,))
+        return (row[0], row[1]) if row else None
+
+    def get_page(
+        self,
+        source: str,
+        order_col: str,
+        limit: int,
+        before: Optional[Tuple[Any, ...]] = None,
+        after: Optional[Tuple[Any, ...]] = None,
+        condition: Optional[str] = None,
+        params: tuple = (),
+        descending: bool = True,
+        columns: str = "*",
+        tiebreak: Tuple[str, ...] = ("id",),
+    ) -> List[Dict[str, Any]]:
+        """Fetch one page of rows ordered by (order_col, *tiebreak).
+
+        ``before`` / ``after`` are keys holding a value for each of those
+        columns: the page holds the rows sorting just below or just above
+        that key. The tiebreak columns must make the key unique, so sources
+        that merge tables with separate id sequences add a column telling
+        them apart. Rows always come back in display order (descending unless
+        ``descending`` is False). With an index on ``order_col`` each page is
+        a single index range scan, however deep into the table it is.
+        """
+        for bound in (before, after):
+            if bound is not None and len(bound) != 1 + len(tiebreak):
+                raise ValueError(f"Page key {bound!r} does not match ({order_col}, {tiebreak})")
+        key = ", ".join((order_col, *tiebreak))
+        marks = ", ".join("?" for _ in range(1 + len(tiebreak)))
+        conditions = [condition] if condition else []
+        params = tuple(params)
+        if before is not None:
+            conditions.append(f"({key}) < ({marks})")
+            params += tuple(before)
+            scan_desc = True
+        elif after is not None:
+            conditions.append(f"({key}) > ({marks})")
+            params += tuple(after)
+            scan_desc = False
+        else:
+            scan_desc = descending
+
+        direction = "DESC" if scan_desc else "ASC"
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = ", ".join(f"{col} {direction}" for col in (order_col, *tiebreak))
+        query = f"SELECT {columns} FROM {source}{where} ORDER BY {order} LIMIT ?"
+        rows = [dict(row) for row in self.execute(query, params + (limit,))]
+        if scan_desc != descending:
+            rows.reverse()
+        return rows
+
+    def action_filter(
+        self,
+        agent: Optional[str] = None,
+        action: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        parent_id: Optional[int] = None,
+        open_only: bool = False,
+    ) -> Tuple[Optional[str], Tuple[Any, ...]]:
+        """Build a WHERE condition (or None) and params for agent log filters.
+
+        ``since``/``until`` are SQLite datetime strings (until is exclusive).
+        ``parent_id`` keeps that entry and everything beneath it.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        for column, value in (("agent", agent), ("action", action), ("trace_id", trace_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("started_at < ?")
+            params.append(until)
+        if parent_id is not None:
+            conditions.append(
+                "id IN (WITH RECURSIVE subtree(id) AS ("
+                "SELECT ? UNION ALL "
+                "SELECT child.id FROM agents_log child JOIN subtree ON child.parent_id = subtree.id"
+                ") SELECT id FROM subtree)"
+            )
+            params.append(parent_id)
+        if open_only:
+            # Must match the partial index predicate exactly
+            conditions.append("ended_at IS NULL")
+        return (" AND ".join(conditions) or None), tuple(params)
+
+    def get_actions_page(
+        self,
+        limit: int = 50,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Get a page of agent actions, newest first.
+
+        ``before`` / ``after`` are agents_log ids: older or newer entries than
+        that row. ``filters`` are passed to ``action_filter()``. Raises
+        ValueError if the cursor row no longer exists.
+        """
+        keys = {}
+        for name, row_id in (("before", before), ("after", after)):
+            if row_id is not None:
+                keys[name] = self.get_cursor_key("agents_log", "started_at", row_id)
+                if keys[name] is None:
+                    raise ValueError(f"No log entry #{row_id}")
+        condition, params = self.action_filter(**filters)
+        return self.get_page(
+            "agents_log",
+            "started_at",
+            limit,
+            before=keys.get("before"),
+            after=keys.get("after"),
+            condition=condition,
+            params=params,
+            columns=ACTION_COLUMNS,
+        )
+
+    # ========== Tracing ==========
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Get every span of a trace with its depth and duration in seconds.
+
+        Roots are the trace's entries whose parent is not in the trace; their
+        descendants are pulled in by parent_id in the same recursive query.
+        Rows come back in start order.
+        """
+        query = f"""
+            WITH RECURSIVE span(id, depth) AS (
+                SELECT id, 0 FROM agents_log AS root
+                WHERE trace_id = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM agents_log AS parent
+                      WHERE parent.id = root.parent_id AND parent.trace_id = root.trace_id
+                  )
+                UNION ALL
+                SELECT child.id, span.depth + 1
+                FROM agents_log AS child JOIN span ON child.parent_id = span.id
+                WHERE span.depth < {MAX_TRACE_DEPTH}
+            )
+            SELECT a.id, a.agent, a.action, a.details, a.parent_id,
+                   a.started_at, a.ended_at, span.depth,
+                   {SPAN_DURATION} AS duration
+            FROM span JOIN agents_log AS a ON a.id = span.id
+            ORDER BY a.started_at, a.id
+        """
+        return [dict(row) for row in self.execute(query, (trace_id,))]
+
+    def get_action_percentiles(
+        self, since: Optional[str] = None, agent: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get count, p50/p95/p99 and max duration (seconds) per action.
+
+        Percentiles are nearest-rank over ended spans, computed with window
+        functions. Slowest p95 first.
+        """
+        condition, params = self.action_filter(agent=agent, since=since)
+        where = f" AND {condition}" if condition else ""
+        query = f"""
+            WITH ranked AS (
+                SELECT action, {SPAN_DURATION} AS duration,
+                       ROW_NUMBER() OVER (PARTITION BY action ORDER BY {SPAN_DURATION}) AS rank,
+                       COUNT(*) OVER (PARTITION BY action) AS total
+                FROM agents_log
+                WHERE ended_at IS NOT NULL{where}
+            )
+            SELECT action, total AS count,
+                   MIN(CASE WHEN rank >= 0.50 * total THEN duration END) AS p50,
+                   MIN(CASE WHEN rank >= 0.95 * total THEN duration END) AS p95,
+                   MIN(CASE WHEN rank >= 0.99 * total THEN duration END) AS p99,
+                   MAX(duration) AS max
+            FROM ranked
+            GROUP BY action
+            ORDER BY p95 DESC, action
+        """
+        return [dict(row) for row in self.execute(query, params)]
+
+    # ========== Log Retention ==========
+
+    def compact_log(
+        self,
+        before: str,
+        batch_size: int = 1000,
+        archive_path: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, int]:
+        """Roll agents_log rows started before ``before`` into agents_log_daily.
+
+        Span trees are handled oldest first, ``batch_size`` trees (a root and
+        all its child spans) per short write transaction: aggregate into the
+        daily table, copy to the ``archive_path`` database (if given), then
+        delete. A tree with any span started at or after ``before`` is kept
+        whole, so ``clide trace`` never sees orphaned children. Returns counts
+        of compacted and archived rows and batches.
+        """
+        if self.in_transaction:
+            raise RuntimeError("compact_log() cannot run inside a transaction")
+
+        result = {"rows": 0, "archived": 0, "batches": 0}
+        with self.connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS compact_batch (id INTEGER PRIMARY KEY)")
+            if archive_path:
+                conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+                conn.execute(ARCHIVE_LOG_TABLE)
+            try:
+                while True:
+                    self.begin_write(conn)
+                    try:
+                        moved = self._compact_batch(conn, before, batch_size, bool(archive_path))
+                        conn.commit()
+                    except BaseException:
+                        conn.rollback()
+                        raise
+                    if not moved:
+                        break
+                    result["rows"] += moved
+                    result["archived"] += moved if archive_path else 0
+                    result["batches"] += 1
+                    if progress:
+                        progress(result["rows"])
+            finally:
+                conn.execute("DROP TABLE IF EXISTS temp.compact_batch")
+                if archive_path:
+                    conn.execute("DETACH DATABASE archive")
+        return result
+
+    def count_compactable(self, before: str) -> int:
+        """Number of log rows ``compact_log(before)`` would remove."""
+        query = f"SELECT COUNT(*) FROM ({COMPACTABLE_SPANS})"
+        return self.execute_one(query, (before, before, -1))[0]
+
+    def _compact_batch(
+        self, conn: sqlite3.Connection, before: str, batch_size: int, archive: bool
+    ) -> int:
+        """Roll up, archive and delete one batch of old span trees."""
+        conn.execute("DELETE FROM temp.compact_batch")
+        conn.execute(
+            f"INSERT INTO temp.compact_batch (id) {COMPACTABLE_SPANS}",
+            (before, before, batch_size),
+        )
+        moved = conn.execute("SELECT COUNT(*) FROM temp.compact_batch").fetchone()[0]
+        if not moved:
+            return 0
+
+        batch = "id IN (SELECT id FROM temp.compact_batch)"
+        conn.execute(f"""
+            INSERT INTO agents_log_daily
+                (day, agent, action, count, ended, total_duration, max_duration)
+            SELECT date(started_at), agent, action, COUNT(*), COUNT(ended_at),
+                   COALESCE(SUM(duration), 0), MAX(duration)
+            FROM (SELECT *, {SPAN_DURATION} AS duration FROM agents_log WHERE {batch})
+            WHERE true
+            GROUP BY date(started_at), agent, action
+            ON CONFLICT (day, agent, action) DO UPDATE SET
+                count = count + excluded.count,
+                ended = ended + excluded.ended,
+                total_duration = total_duration + excluded.total_duration,
+                max_duration = MAX(
+                    COALESCE(max_duration, excluded.max_duration),
+                    COALESCE(excluded.max_duration, max_duration)
+                )
+            """)
+        if archive:
+            conn.execute(
+                f"INSERT OR IGNORE INTO archive.agents_log ({LOG_ROW_COLUMNS}) "
+                f"SELECT {LOG_ROW_COLUMNS} FROM main.agents_log WHERE {batch}"
+            )
+        conn.execute(f"DELETE FROM agents_log WHERE {batch}")
+        return moved
+
+    def vacuum_free_pages(self, step: int = 1000) -> Optional[int]:
+        """Return free pages to the OS, ``step`` pages per write transaction.
+
+        Returns the number of pages released, or None if the database was not
+        created with ``auto_vacuum = INCREMENTAL`` (see ``enable_incremental_vacuum``).
+        """
+        if self.execute_one("PRAGMA auto_vacuum")[0] != 2:
+            return None
+        released = 0
+        while True:
+            free = self.execute_one("PRAGMA freelist_count")[0]
+            if not free:
+                return released
+            with self.connection() as conn:
+                conn.execute(f"PRAGMA incremental_vacuum({min(step, free)})").fetchall()
+            released += min(step, free)
+
+    def enable_incremental_vacuum(self) -> None:
+        """Switch an existing database to incremental auto-vacuum (runs a full VACUUM)."""
+        if self.in_transaction:
+            raise RuntimeError("enable_incremental_vacuum() cannot run inside a transaction")
+        with self.connection() as conn:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def get_log_daily(
+        self, since: Optional[str] = None, action: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get compacted daily log aggregates, newest day first."""
+        conditions, params = [], []
+        if since:
+            conditions.append("day >= date(?)")
+            params.append(since)
+        if action:
+            conditions.append("action = ?")
+            params.append(action)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT * FROM agents_log_daily{where} ORDER BY day DESC, agent, action"
+        return [dict(row) for row in self.execute(query, tuple(params))]
+
     # ========== Views ==========
 
     def get_open_work(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -320,6 +1829,19 @@ class Database:
         rows = self.execute(query, (limit,))
         return [dict(row) for row in rows]
 
+    def get_deployments(self) -> List[Dict[str, Any]]:
+        """Get the deployment playbook, one row per environment entry."""
+        query = "SELECT * FROM deployment ORDER BY environment, id"
+        return [dict(row) for row in self.execute(query)]
+
+    def get_table_versions(self) -> Dict[str, int]:
+        """Trigger-maintained change counter per tracked table (see v1.10).
+
+        Unlike ``PRAGMA data_version`` these persist in the file, so they can
+        key caches kept across processes.
+        """
+        return {row["name"]: row["version"] for row in self.execute("SELECT * FROM table_versions")}
+
     def get_defects_with_stories(self) -> List[Dict[str, Any]]:
         """Get defects with linked stories."""
         query = "SELECT * FROM v_defects_with_stories"
@@ -332,14 +1854,17 @@ class Database:
         """Generate a unique trace ID for session tracking."""
         return str(uuid.uuid4())
 
-    def backup(self, backup_path: str) -> bool:
-        """Create a backup of the database."""
-        try:
-            import shutil
+    def backup(self, backup_path: str, **options: Any) -> bool:
+        """Create a consistent, verified backup of the database.
+
+        ``options`` are passed to ``clide.backup.backup_database``.
+        """
+        from .backup import BackupError, backup_database
 
-            shutil.copy2(self.db_path, backup_path)
+        try:
+            backup_database(self.db_path, backup_path, **options)
             return True
-        except Exception:
+        except (BackupError, OSError):
             return False
 
 
@@ -0,0 +1,216 @@
+"""Buffered, background agent-log writer.
+
+``Database.log_action`` normally inserts and commits on the caller's thread.
+With ``CLIDE_LOG_BUFFER=true`` entries go into a bounded in-process queue
+instead, and a daemon thread batch-inserts them with ``executemany`` once
+``batch_size`` entries are waiting or ``flush_interval`` seconds have passed.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# What to do when the queue is full: wait for room (up to block_timeout, then
+# drop), or drop the new entry immediately
+BACKPRESSURE_POLICIES = ("block", "drop")
+
+INSERT_ACTION = """
+    INSERT INTO agents_log (agent, action, details, trace_id, parent_id, started_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Queue markers for flush() and close(); each is queued with a threading.Event
+_FLUSH = "flush"
+_STOP = "stop"
+
+
+class PendingAction:
+    """Handle returned by a buffered ``log_action``; ``id`` is set once written."""
+
+    __slots__ = ("id",)
+
+    def __init__(self):
+        self.id: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"PendingAction(id={self.id})"
+
+
+ActionRef = Union[int, PendingAction]
+
+
+def span_now() -> str:
+    """Current UTC time in the millisecond format used for agent log spans."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+class BufferedLogWriter:
+    """Queue agent log writes and flush them in batches on a daemon thread."""
+
+    def __init__(
+        self,
+        database,
+        max_size: int = 10000,
+        policy: str = "block",
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        block_timeout: float = 1.0,
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.database = database
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.last_error: Optional[Exception] = None
+
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._counts = {"queued": 0, "flushed": 0, "dropped": 0, "failed": 0, "batches": 0}
+        self._thread = threading.Thread(target=self._run, name="clide-log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters: queued, flushed, dropped, failed entries and batches written."""
+        with self._lock:
+            return dict(self._counts, pending=self._queue.qsize())
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer thread has stopped."""
+        return not self._thread.is_alive()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += amount
+
+    def _put(self, entry: Tuple[Any, ...]) -> bool:
+        """Enqueue an entry according to the backpressure policy."""
+        try:
+            if self.policy == "block":
+                self._queue.put(entry, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+
+    def log_action(
+        self,
+        agent: str,
+        action: str,
+        details: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[ActionRef] = None,
+        started_at: Optional[str] = None,
+    ) -> PendingAction:
+        """Queue an action start; the handle can be passed to end_action()."""
+        handle = PendingAction()
+        if isinstance(parent_id, PendingAction) and parent_id.id is not None:
+            parent_id = parent_id.id
+        row = (agent, action, details, trace_id, parent_id, started_at or span_now())
+        self._put(("start", handle, row))
+        return handle
+
+    def end_action(self, ref: ActionRef) -> None:
+        """Queue an action end for a handle or an already-written id."""
+        self._put(("end", ref, span_now()))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far. Returns False on timeout."""
+        return self._signal(_FLUSH, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """Flush pending entries and stop the writer thread."""
+        return self._signal(_STOP, timeout)
+
+    def _signal(self, marker: str, timeout: Optional[float]) -> bool:
+        """Queue a marker behind pending entries and wait until it is handled."""
+        if self.closed:
+            return self._queue.empty()
+        done = threading.Event()
+        try:
+            self._queue.put((marker, done, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        batch: List[Tuple[Any, ...]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            else:
+                if item[0] not in (_FLUSH, _STOP):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) < self.batch_size:
+                        continue
+
+            # Batch full, interval elapsed, flush requested or stopping
+            if batch:
+                self._write(batch)
+                batch = []
+            deadline = None
+            if item is not None and item[0] in (_FLUSH, _STOP):
+                item[1].set()
+                if item[0] == _STOP:
+                    return
+
+    def _write(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Insert a batch of starts and apply its ends in one transaction."""
+        try:
+            with self.database.transaction() as conn:
+                pending: List[Tuple[PendingAction, Tuple[Any, ...]]] = []
+
+                def insert_pending() -> None:
+                    if not pending:
+                        return
+                    conn.executemany(INSERT_ACTION, [row for _, row in pending])
+                    # Rowids of one executemany under the write lock are
+                    # consecutive, ending at last_insert_rowid()
+                    last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    first = last - len(pending) + 1
+                    for offset, (handle, _) in enumerate(pending):
+                        handle.id = first + offset
+                    pending.clear()
+
+                ends = []
+                for kind, ref, payload in batch:
+                    if kind == "end":
+                        ends.append((payload, ref))
+                        continue
+                    parent = payload[4]
+                    if isinstance(parent, PendingAction):
+                        if parent.id is None and any(h is parent for h, _ in pending):
+                            insert_pending()
+                        payload = payload[:4] + (parent.id,) + payload[5:]
+                    pending.append((ref, payload))
+                insert_pending()
+
+                updates = [
+                    (ended_at, ref.id if isinstance(ref, PendingAction) else ref)
+                    for ended_at, ref in ends
+                ]
+                conn.executemany(
+                    "UPDATE agents_log SET ended_at = ? WHERE id = ?",
+                    [update for update in updates if update[1] is not None],
+                )
+        except sqlite3.Error as e:
+            self.last_error = e
+            self._count("failed", len(batch))
+            return
+        self._count("flushed", len(batch))
+        self._count("batches")
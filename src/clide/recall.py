@@ -0,0 +1,189 @@
+"""Landmine recall for the current working set (``clide boot --files/--diff``).
+
+The working set is a list of changed paths, optionally with the identifiers
+touched by ``git diff``. It is turned into the three kinds of evidence that
+``Database.recall_landmines`` ranks with: file-name phrases, candidate tags
+(path components) and search terms (path components plus the most frequent
+words on changed lines).
+"""
+
+import re
+import subprocess
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .config import config
+from .db import Database
+
+# Path parts too common to say anything about what is being worked on
+GENERIC_PARTS = frozenset(
+    {
+        "src",
+        "lib",
+        "app",
+        "test",
+        "tests",
+        "docs",
+        "build",
+        "dist",
+        "scripts",
+        "py",
+        "js",
+        "ts",
+        "md",
+        "json",
+        "yaml",
+        "toml",
+        "sql",
+        "init",
+        "main",
+        "index",
+        "utils",
+    }
+)
+
+# Words from diffs that match nearly everything
+STOPWORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "with",
+        "not",
+        "none",
+        "true",
+        "false",
+        "self",
+        "cls",
+        "return",
+        "import",
+        "from",
+        "def",
+        "class",
+        "elif",
+        "else",
+        "try",
+        "except",
+        "raise",
+        "pass",
+        "str",
+        "int",
+        "dict",
+        "list",
+        "len",
+        "args",
+        "kwargs",
+        "this",
+        "const",
+        "function",
+        "null",
+    }
+)
+
+# Search terms taken from a diff, most frequent first
+MAX_DIFF_TERMS = 16
+
+# Diff output read at most; a huge diff says little more than its first MiB
+MAX_DIFF_BYTES = 1 << 20
+
+WORD = re.compile(r"[A-Z]?[a-z]+\d*|[A-Z]+(?![a-z])\d*|\d+")
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class WorkingSet(NamedTuple):
+    """Evidence describing what an agent is working on."""
+
+    paths: List[str]
+    phrases: List[str]
+    tags: List[str]
+    terms: List[str]
+
+
+class RecallError(Exception):
+    """The working set could not be read (e.g. not inside a git repository)."""
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words of an identifier or path, splitting snake and camel case."""
+    return [w.lower() for w in WORD.findall(text)]
+
+
+def path_parts(path: str) -> List[str]:
+    """Meaningful components of a path: "src/clide/dashboard/api.py" -> [clide, dashboard, api]."""
+    parts = [w for w in words(path) if len(w) > 1 and w not in GENERIC_PARTS]
+    return list(dict.fromkeys(parts))
+
+
+def file_phrase(path: str) -> Optional[str]:
+    """FTS phrase for a file name as written in prose: "src/clide/db.py" -> "db py"."""
+    name = re.split(r"[\\/]", path.rstrip("/\\"))[-1]
+    tokens = re.findall(r"[a-z0-9]+", name.lower())
+    return " ".join(tokens) if tokens else None
+
+
+def diff_terms(diff: str, limit: int = MAX_DIFF_TERMS) -> List[str]:
+    """Most frequent words of identifiers on added or removed lines."""
+    counts: Counter = Counter()
+    for line in diff.splitlines():
+        if line[:1] not in ("+", "-") or line.startswith(("+++", "---")):
+            continue
+        for identifier in IDENTIFIER.findall(line[1:]):
+            counts.update(w for w in words(identifier) if len(w) > 2 and w not in STOPWORDS)
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def git(*args: str, cwd: Optional[str] = None) -> str:
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, timeout=10, check=True
+        )
+    except FileNotFoundError as e:
+        raise RecallError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode(errors="replace").strip().splitlines()
+        raise RecallError(message[0] if message else f"git {args[0]} failed") from e
+    except subprocess.TimeoutExpired as e:
+        raise RecallError(f"git {args[0]} timed out") from e
+    return result.stdout[:MAX_DIFF_BYTES].decode(errors="replace")
+
+
+def git_changes(cwd: Optional[str] = None) -> Tuple[List[str], str]:
+    """Changed and untracked paths, and the diff against HEAD, of the repo at cwd."""
+    try:
+        base = ["HEAD"] if git("rev-parse", "--verify", "--quiet", "HEAD", cwd=cwd) else []
+    except RecallError:
+        base = []  # No commits yet: diff the index instead
+    names = git("diff", *base, "--name-only", cwd=cwd).splitlines()
+    names += git("ls-files", "--others", "--exclude-standard", cwd=cwd).splitlines()
+    diff = git("diff", *base, "--unified=0", cwd=cwd)
+    return list(dict.fromkeys(n for n in names if n)), diff
+
+
+def build_working_set(
+    files: Iterable[str] = (), diff: bool = False, cwd: Optional[str] = None
+) -> WorkingSet:
+    """Working set from explicit paths and, with diff=True, the git working tree."""
+    paths = [p.strip() for f in files for p in f.split(",") if p.strip()]
+    changed = ""
+    if diff:
+        changed_paths, changed = git_changes(cwd)
+        paths += changed_paths
+    paths = list(dict.fromkeys(paths))
+
+    parts = list(dict.fromkeys(part for path in paths for part in path_parts(path)))
+    phrases = list(dict.fromkeys(p for p in map(file_phrase, paths) if p))
+    terms = list(dict.fromkeys(parts + diff_terms(changed)))
+    return WorkingSet(paths, phrases, parts, terms)
+
+
+def recall(
+    db: Database, working_set: WorkingSet, limit: int = 10, budget_ms: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Top landmines for working_set; see ``Database.recall_landmines``."""
+    return db.recall_landmines(
+        working_set.phrases,
+        working_set.tags,
+        working_set.terms,
+        limit=limit,
+        budget_ms=config.recall_budget_ms if budget_ms is None else budget_ms,
+    )
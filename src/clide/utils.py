@@ -1,34 +1,89 @@
 """Utility functions for Clide."""
 
-from datetime import datetime
-from typing import Any, Dict, List
+import base64
+import binascii
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.table import Table
+from .config import config
 
-console = Console()
+# Rich console markup such as "[bold]" or "[/red]" (the tag syntax rich parses)
+MARKUP_TAG = re.compile(r"(?<!\\)\[[a-z#/@][^\[\]]*?\]")
+
+_console = None
+
+
+def get_console():
+    """Return the shared rich Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def set_console(console) -> Any:
+    """Replace the shared Console (None resets it); returns the previous one."""
+    global _console
+    previous, _console = _console, console
+    return previous
+
+
+def plain_output() -> bool:
+    """Whether to write plain text instead of rich output.
+
+    ``CLIDE_PLAIN=true|false`` forces it; by default output is plain when
+    stdout is not a terminal (git hooks, pipes, CI), which also keeps rich
+    from being imported at all.
+    """
+    setting = config.plain_output
+    if setting in ("true", "1", "yes"):
+        return True
+    if setting in ("false", "0", "no"):
+        return False
+    isatty = getattr(sys.stdout, "isatty", None)
+    return not (isatty and isatty())
+
+
+def strip_markup(text: str) -> str:
+    """Remove rich markup tags from text."""
+    return MARKUP_TAG.sub("", text).replace("\\[", "[")
+
+
+def print_plain(text: str) -> None:
+    """Write text to stdout without rich, dropping any markup."""
+    sys.stdout.write(strip_markup(text) + "\n")
+
+
+def _print_message(symbol: str, color: str, message: str) -> None:
+    if plain_output():
+        print_plain(f"{symbol} {message}")
+    else:
+        get_console().print(f"[{color}]{symbol}[/{color}] {message}")
 
 
 def print_success(message: str) -> None:
     """Print success message in green."""
-    console.print(f"[green]✓[/green] {message}")
+    _print_message("✓", "green", message)
 
 
 def print_error(message: str) -> None:
     """Print error message in red."""
-    console.print(f"[red]✗[/red] {message}")
+    _print_message("✗", "red", message)
 
 
 def print_warning(message: str) -> None:
     """Print warning message in yellow."""
-    console.print(f"[yellow]⚠[/yellow] {message}")
+    _print_message("⚠", "yellow", message)
 
 
 def print_info(message: str) -> None:
     """Print info message in blue."""
-    console.print(f"[blue]ℹ[/blue] {message}")
+    _print_message("ℹ", "blue", message)
 
 
 def print_table(data: List[Dict[str, Any]], title: str = "", columns: List[str] = None) -> None:
@@ -41,25 +96,53 @@ def print_table(data: List[Dict[str, Any]], title: str = "", columns: List[str]
     if columns is None:
         columns = list(data[0].keys())
 
+    headers = [col.replace("_", " ").title() for col in columns]
+    if plain_output():
+        rows = [[strip_markup(str(row.get(col, ""))) for col in columns] for row in data]
+        widths = [
+            max([len(header)] + [len(row[i]) for row in rows]) for i, header in enumerate(headers)
+        ]
+        lines = [title] if title else []
+        for cells in [headers] + rows:
+            lines.append(
+                "  ".join(cell.ljust(width) for cell, width in zip(cells, widths)).rstrip()
+            )
+        sys.stdout.write("\n".join(lines) + "\n")
+        return
+
+    from rich.table import Table
+
     table = Table(title=title, show_header=True, header_style="bold magenta")
 
-    for col in columns:
-        table.add_column(col.replace("_", " ").title())
+    for header in headers:
+        table.add_column(header)
 
     for row in data:
         table.add_row(*[str(row.get(col, "")) for col in columns])
 
-    console.print(table)
+    get_console().print(table)
 
 
 def print_panel(content: str, title: str = "", style: str = "cyan") -> None:
     """Print content in a panel."""
-    console.print(Panel(content, title=title, border_style=style))
+    if plain_output():
+        print_plain(f"{title}\n{content}" if title else content)
+        return
+
+    from rich.panel import Panel
+
+    get_console().print(Panel(content, title=title, border_style=style))
 
 
 def print_markdown(content: str) -> None:
     """Print markdown content."""
-    console.print(Markdown(content))
+    if plain_output():
+        sys.stdout.write(content + "\n")
+        return
+
+    from rich.markdown import Markdown
+
+    get_console().print(Markdown(content))
 
 
 def format_datetime(dt: str) -> str:
@@ -73,6 +156,18 @@ def format_datetime(dt: str) -> str:
         return dt
 
 
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a span duration in seconds; None means still running."""
+    if seconds is None:
+        return "open"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:.0f}m {seconds:02.0f}s"
+
+
 def format_priority(priority: int) -> str:
     """Format priority with emoji."""
     priority_map = {
@@ -97,8 +192,56 @@ def format_status(status: str) -> str:
     return status_map.get(status.lower(), status)
 
 
+# Relative time spans accepted by parse_time(), e.g. "90m" or "2d"
+TIME_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_time(value: str) -> str:
+    """Parse an absolute or relative ("2h", "3d") time as a UTC SQLite datetime.
+
+    Absolute values are ISO 8601; naive ones are taken as UTC, like the
+    ``datetime('now')`` defaults in the schema. Raises ValueError otherwise.
+    """
+    value = value.strip()
+    match = re.fullmatch(r"(\d+)\s*([smhdw])", value)
+    if match:
+        delta = timedelta(**{TIME_UNITS[match.group(2)]: int(match.group(1))})
+        parsed = datetime.now(timezone.utc) - delta
+    else:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(
+                f"Invalid time: {value!r} (use ISO 8601 or e.g. 30m, 2h, 7d)"
+            ) from None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
 def truncate(text: str, max_length: int = 50) -> str:
     """Truncate text with ellipsis."""
     if not text:
         return ""
     return text[:max_length] + "..." if len(text) > max_length else text
+
+
+def encode_cursor(key: Tuple[Any, ...]) -> str:
+    """Encode a keyset pagination key as an opaque URL-safe token."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, ...]:
+    """Decode a token from encode_cursor(). Raises ValueError if malformed.
+
+    Keys end in a row id, after the order value and any other tiebreaks.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not isinstance(key, list) or len(key) < 2 or not isinstance(key[-1], int):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return tuple(key)
@@ -20,3 +20,70 @@ def test_cli_import():
     from clide.cli import cli
 
     assert cli is not None
+
+
+# Heavy modules that must stay out of every command's import path: rich and
+# dotenv load on first use, the dashboard and backup stacks only for their
+# own commands
+LAZY_MODULES = (
+    "rich",
+    "dotenv",
+    "flask",
+    "werkzeug",
+    "jinja2",
+    "zstandard",
+    "sqlite3.dump",
+    "clide.dashboard",
+    "clide.backup",
+)
+
+
+def test_cli_cold_start_imports(record_property):
+    """Test a cold CLI start (cli plus db, as every command loads) skips lazy modules.
+
+    The import time is recorded as a test property rather than asserted, since
+    wall-clock numbers vary too much between machines.
+    """
+    import os
+    import subprocess
+    import tempfile
+
+    code = f"import sys; sys.path.insert(0, {str(src_path)!r}); import clide.cli, clide.db"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=tmpdir,
+            env={k: v for k, v in os.environ.items() if not k.startswith("CLIDE_")},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    # "import time: self | cumulative | <two spaces per nesting level>module"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        imports.append((module[1:], int(cumulative_us)))
+
+    names = {module.strip() for module, _ in imports}
+    loaded = sorted(
+        name for name in names if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+    )
+    assert loaded == [], f"eagerly imported: {loaded}"
+    assert {"clide.cli", "clide.db", "click"} <= names
+
+    # Each top-level import's cumulative time already covers its children
+    total_us = sum(us for module, us in imports if not module.startswith(" "))
+    record_property("cold_start_import_us", total_us)
+
+
+def test_plain_output_without_tty(capsys):
+    """Test non-TTY output is plain text with markup removed."""
+    from clide.utils import print_info, print_table
+
+    print_info("[bold]hello[/bold]")
+    print_table([{"story_id": 1, "status": "[red]OPEN[/red]"}], title="Stories")
+    out = capsys.readouterr().out
+    assert out.splitlines() == ["ℹ hello", "Stories", "Story Id  Status", "1         OPEN"]
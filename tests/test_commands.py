@@ -1,9 +1,12 @@
 """Tests for command implementations."""
 
+import contextlib
 import sys
 import tempfile
 from pathlib import Path
 
+import pytest
+
 # Add src to path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
@@ -217,3 +220,989 @@ def test_database_config_operations():
         assert test_config["value"] == "test_value"
     finally:
         Path(db_path).unlink(missing_ok=True)
+
+
+def test_bulk_insert_resumes_from_checkpoint():
+    """Test bulk import batches, checkpoints and resumes after a failure."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "import.db"))
+        db.initialize()
+
+        def rows(fail_at=None):
+            for i in range(10):
+                if i == fail_at:
+                    raise RuntimeError("source interrupted")
+                yield {"title": f"Story {i}", "priority": 2}
+
+        with contextlib.suppress(RuntimeError):
+            db.bulk_insert("stories", rows(fail_at=7), batch_size=3, checkpoint_key="k")
+
+        assert db.get_import_checkpoint("k") == 6
+        assert len(db.get_open_stories()) == 6
+
+        inserted = db.bulk_insert(
+            "stories", rows(), batch_size=3, checkpoint_key="k", defer_indexes=True
+        )
+        assert inserted == 4
+        titles = sorted(s["title"] for s in db.get_open_stories())
+        assert titles == sorted(f"Story {i}" for i in range(10))
+
+        index = db.execute_one(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND name = 'idx_stories_status_priority'"
+        )
+        assert index is not None
+
+
+def test_bulk_insert_rejects_unknown_columns():
+    """Test bulk import validates table and column names."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "import.db"))
+        db.initialize()
+
+        for table, row in (("agents_log", {"agent": "x"}), ("stories", {"nope": 1})):
+            try:
+                db.bulk_insert(table, [row])
+            except ValueError:
+                continue
+            raise AssertionError(f"expected ValueError for {table}")
+
+        # A column first seen in a later row is an error, not silently dropped
+        rows = [{"title": "A", "description": None}, {"title": "B"}, {"title": "C", "points": 3}]
+        with pytest.raises(ValueError, match="Row 3 .*points"):
+            db.bulk_insert("stories", rows)
+
+
+def test_read_records_csv_and_jsonl():
+    """Test import readers stream CSV and JSONL records."""
+    from clide.commands.importer import read_records
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "defects.csv"
+        csv_path.write_text("title,severity,description\nCrash,critical,\n")
+        jsonl_path = Path(tmpdir) / "defects.jsonl"
+        jsonl_path.write_text('{"title": "Crash", "severity": "critical"}\n\n')
+
+        assert list(read_records(str(csv_path))) == [
+            {"title": "Crash", "severity": "critical", "description": None}
+        ]
+        assert list(read_records(str(jsonl_path))) == [{"title": "Crash", "severity": "critical"}]
+
+
+def test_report_streams_formats(monkeypatch):
+    """Test report_command streams every format to a file."""
+    import json
+
+    from clide.commands import report
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "report.db"))
+        db.initialize()
+        for i in range(3):
+            db.create_story(title=f"Story | {i}")
+        monkeypatch.setattr(report, "db", db)
+        monkeypatch.setattr(report, "WRITE_CHUNK_SIZE", 16)
+
+        out = Path(tmpdir) / "out"
+        report.report_command("stories", str(out), "json")
+        assert sorted(s["title"] for s in json.loads(out.read_text())) == [
+            "Story | 0",
+            "Story | 1",
+            "Story | 2",
+        ]
+
+        report.report_command("stories", str(out), "jsonl")
+        assert len(out.read_text().splitlines()) == 3
+
+        report.report_command("stories", str(out), "csv")
+        assert out.read_text().splitlines()[0].startswith("id,title")
+
+        report.report_command("stories", str(out), "markdown")
+        content = out.read_text()
+        assert "Total entries: 3" in content
+        assert "Story \\| 2" in content
+
+
+def test_boot_reads_without_the_write_lock(monkeypatch):
+    """Test boot reads in a snapshot and logs its span in one write afterwards."""
+    from clide.commands import boot
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "boot.db"))
+        db.initialize()
+        db.create_landmine("Do not boot twice")
+        monkeypatch.setattr(boot, "db", db)
+
+        locked_during_reads = []
+        get_config = db.get_config
+        monkeypatch.setattr(
+            db,
+            "get_config",
+            lambda *a: locked_during_reads.append(db.write_lock_held()) or get_config(*a),
+        )
+        db.reset_lock_stats()
+        boot.boot_command(summary=True)
+
+        assert locked_during_reads == [False]
+        assert db.lock_stats["transactions"] == 1
+        (span,) = db.get_recent_actions()
+        assert span["action"] == "boot" and span["started_at"] <= span["ended_at"]
+
+        # The context pack also logs its span in a single write at the end
+        db.reset_lock_stats()
+        boot.boot_command(fmt="json", budget=500)
+        assert db.lock_stats["transactions"] == 1
+        brief = db.get_recent_actions(limit=1)[0]
+        assert brief["details"] == "Context pack (json, 500 tokens)" and brief["ended_at"]
+
+
+def test_database_search():
+    """Test FTS search ranking, filters and trigger-maintained indexes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "search.db"))
+        db.initialize()
+
+        landmine_id = db.create_landmine(
+            summary="Redis timeout under load", remediation="Raise socket timeout"
+        )
+        db.create_defect(title="Login fails", description="Redis connection refused")
+        db.create_story(title="Cache warmup", description="Avoid cold starts")
+
+        results = db.search("redis")
+        assert [r["kind"] for r in results] == ["landmines", "defects"]
+        assert "**Redis**" in results[0]["snippet"]
+
+        assert db.search("redis", kinds=["defects"])[0]["title"] == "Login fails"
+        assert db.search("tim") == []
+        assert db.search("timeouts")[0]["id"] == landmine_id
+
+        db.execute(
+            "UPDATE landmines SET summary = 'Postgres pool exhausted', remediation = NULL "
+            "WHERE id = ?",
+            (landmine_id,),
+        )
+        assert db.search("timeout") == []
+        assert db.search("postgres")[0]["id"] == landmine_id
+
+        db.execute("DELETE FROM stories")
+        assert db.search("warmup") == []
+
+
+def test_database_tag_index():
+    """Test tags are normalized, matched exactly and kept in sync."""
+    from clide.db import split_tags
+
+    assert split_tags(" Redis,perf,, PERF\nDB ") == ["redis", "perf", "db"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "tags.db"))
+        db.initialize()
+
+        redis_id = db.create_landmine(summary="Redis timeout", tags="Redis, perf")
+        db.create_landmine(summary="Redis-cluster failover", tags="redis-cluster")
+        db.create_story(title="Speed up boot", labels="perf,cli")
+
+        assert [lm["id"] for lm in db.get_landmines(tags="redis")] == [redis_id]
+        assert db.get_tagged("stories", ["cli"])[0]["title"] == "Speed up boot"
+
+        counts = {c["tag"]: c["count"] for c in db.get_tag_counts("landmines")}
+        assert counts == {"redis": 1, "perf": 1, "redis-cluster": 1}
+
+        db.execute("UPDATE landmines SET tags = 'security' WHERE id = ?", (redis_id,))
+        assert db.get_landmines(tags="redis") == []
+        assert [lm["id"] for lm in db.get_landmines(tags="security")] == [redis_id]
+
+        db.execute("DELETE FROM landmines WHERE id = ?", (redis_id,))
+        assert db.get_tag_counts("landmines") == [{"tag": "redis-cluster", "count": 1}]
+
+
+def test_tag_index_matches_split_tags_for_any_text():
+    """Test the tag triggers and split_tags agree on non-ASCII and control characters."""
+    from clide.db import split_tags
+
+    # Only ASCII is lowercased and only spaces are trimmed, as in SQLite
+    assert split_tags("Ärger, Redis") == ["Ärger", "redis"]
+    assert split_tags("x\x0cy,\x0b") == ["x\x0cy", "\x0b"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "tags.db"))
+        db.initialize()
+
+        samples = ["Ärger, Redis", "x\x0cy", 'say "hi"\\now', "bell\x07,\x1b[0m", "ÉTÉ\tnaïve"]
+        for text in samples:
+            landmine_id = db.create_landmine(summary=f"tags {text!r}", tags=text)
+            indexed = db.execute(
+                "SELECT t.name FROM landmine_tags lt JOIN tags t ON t.id = lt.tag_id"
+                " WHERE lt.landmine_id = ?",
+                (landmine_id,),
+            )
+            assert sorted(row["name"] for row in indexed) == sorted(split_tags(text))
+            for tag in split_tags(text):
+                assert landmine_id in [lm["id"] for lm in db.get_landmines(tags=tag)]
+
+        assert [lm["summary"] for lm in db.get_landmines(tags="Ärger")] == ["tags 'Ärger, Redis'"]
+
+
+def test_database_health_summary():
+    """Test grouped health counts and their covering-index query plans."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "health.db"))
+        db.initialize()
+
+        for i in range(3):
+            db.create_story(title=f"Story {i}")
+        db.execute("UPDATE stories SET status = 'blocked' WHERE id = 1")
+        db.execute("UPDATE stories SET status = 'completed' WHERE id = 2")
+        db.create_defect(title="Crash", severity="critical")
+        db.create_defect(title="Typo", severity="minor")
+        resolved = db.create_defect(title="Old", severity="critical")
+        db.resolve_defect(resolved, "done")
+        for i in range(150):
+            db.create_landmine(summary=f"Landmine {i}")
+
+        health = db.get_health_summary()
+        assert health["stories"] == {"total": 2, "todo": 1, "in_progress": 0, "blocked": 1}
+        assert health["defects"] == {"total": 2, "open": 2, "in_progress": 0, "blocked": 0}
+        assert health["severity"] == {"critical": 1, "major": 0, "minor": 1, "trivial": 0}
+        assert health["landmines"] == 150
+
+        assert [d["title"] for d in db.get_open_defects(severity="critical")] == ["Crash"]
+        assert len(db.get_open_stories(limit=1)) == 1
+
+        plans = [
+            row["detail"]
+            for table, group in (("stories", "status"), ("defects", "status, severity"))
+            for row in db.execute(
+                f"EXPLAIN QUERY PLAN SELECT {group}, COUNT(*) FROM {table} "
+                f"WHERE status IN ('open', 'todo') GROUP BY {group}"
+            )
+        ]
+        assert all("COVERING INDEX" in plan for plan in plans)
+
+
+def test_database_counters_track_changes():
+    """Test trigger-maintained counters stay exact and recount repairs drift."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "counters.db"))
+        db.initialize()
+
+        story_id = db.create_story(title="Story")
+        db.create_story(title="Another")
+        defect_id = db.create_defect(title="Crash", severity="critical")
+        db.create_landmine(summary="Gotcha")
+
+        db.execute("UPDATE stories SET status = 'in_progress' WHERE id = ?", (story_id,))
+        db.execute("UPDATE defects SET severity = 'minor' WHERE id = ?", (defect_id,))
+        db.execute("DELETE FROM stories WHERE id != ?", (story_id,))
+
+        health = db.get_health_summary()
+        assert health["stories"] == {"total": 1, "todo": 0, "in_progress": 1, "blocked": 0}
+        assert health["severity"]["critical"] == 0
+        assert health["severity"]["minor"] == 1
+        assert health["landmines"] == 1
+        assert db.recount(fix=False) == []
+
+        db.execute("UPDATE counters SET count = 99 WHERE kind = 'landmine'")
+        drift = db.recount(fix=True)
+        assert [(d["kind"], d["stored"], d["actual"]) for d in drift] == [("landmine", 99, 1)]
+        assert db.recount(fix=False) == []
+
+
+def test_database_keyset_pages():
+    """Test keyset pages walk the log both ways, ties included, via the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "pages.db"))
+        db.initialize()
+        # All entries share one started_at, so the id tie-break decides order
+        for i in range(7):
+            db.execute(
+                "INSERT INTO agents_log (agent, action, started_at) VALUES (?, 'run', ?)",
+                ("A" if i % 2 else "B", "2026-01-01 00:00:00"),
+            )
+
+        first = db.get_actions_page(limit=3)
+        assert [r["id"] for r in first] == [7, 6, 5]
+        second = db.get_actions_page(limit=3, before=first[-1]["id"])
+        assert [r["id"] for r in second] == [4, 3, 2]
+        assert [r["id"] for r in db.get_actions_page(limit=3, after=second[0]["id"])] == [7, 6, 5]
+        assert [r["id"] for r in db.get_actions_page(limit=3, agent="A")] == [6, 4, 2]
+
+        with pytest.raises(ValueError):
+            db.get_actions_page(before=999)
+
+        plan = " ".join(
+            row["detail"]
+            for row in db.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM agents_log "
+                "WHERE (started_at, id) < (?, ?) ORDER BY started_at DESC, id DESC LIMIT 3",
+                ("2026-01-01", 4),
+            )
+        )
+        assert "idx_agents_log_started" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_report_pages(monkeypatch):
+    """Test report_command writes one keyset page per call."""
+    import json
+
+    from clide.commands import report
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "report_pages.db"))
+        db.initialize()
+        for i in range(5):
+            db.create_story(title=f"Story {i}")
+        monkeypatch.setattr(report, "db", db)
+
+        out = Path(tmpdir) / "page.json"
+        report.report_command("stories", str(out), "json", limit=2)
+        assert [s["id"] for s in json.loads(out.read_text())] == [5, 4]
+        report.report_command("stories", str(out), "json", limit=2, before=4)
+        assert [s["id"] for s in json.loads(out.read_text())] == [3, 2]
+        report.report_command("stories", str(out), "json", limit=2, after=3)
+        assert [s["id"] for s in json.loads(out.read_text())] == [5, 4]
+
+
+def test_database_log_filters_use_indexes():
+    """Test every agent log filter combination filters correctly via an index."""
+    import itertools
+    import re
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "filters.db"))
+        db.initialize()
+        root = db.log_action("Clide", "boot", trace_id="t1")
+        child = db.log_action("Clide", "save", trace_id="t1", parent_id=root)
+        db.log_action("Tester", "save", trace_id="t1", parent_id=child)
+        db.log_action("Tester", "boot", trace_id="t2")
+        db.end_action(root)
+
+        def ids(**filters):
+            return sorted(r["id"] for r in db.get_actions_page(**filters))
+
+        assert ids(action="save") == [2, 3]
+        assert ids(trace_id="t1", agent="Tester") == [3]
+        assert ids(parent_id=child) == [2, 3]
+        assert ids(open_only=True) == [2, 3, 4]
+        assert ids(since="2000-01-01", until="2000-01-02") == []
+
+        filters = {
+            "agent": "Clide",
+            "action": "save",
+            "trace_id": "t1",
+            "since": "2000-01-01",
+            "until": "2100-01-01",
+            "parent_id": root,
+            "open_only": True,
+        }
+        full_scan = re.compile(r"SCAN agents_log(?! USING INDEX idx_agents_log_open)")
+        for size in range(len(filters) + 1):
+            for names in itertools.combinations(filters, size):
+                condition, params = db.action_filter(**{n: filters[n] for n in names})
+                condition = f"{condition} AND " if condition else ""
+                plan = [
+                    row["detail"]
+                    for row in db.execute(
+                        "EXPLAIN QUERY PLAN SELECT * FROM agents_log "
+                        f"WHERE {condition}(started_at, id) < (?, ?) "
+                        "ORDER BY started_at DESC, id DESC LIMIT 50",
+                        params + ("2100-01-01", 0),
+                    )
+                ]
+                assert not any(full_scan.match(step) for step in plan), (names, plan)
+
+
+def test_trace_tree_and_percentiles():
+    """Test trace reconstruction, self-time, critical path and percentiles."""
+    from clide.commands.trace import build_span_tree, critical_path
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "trace.db"))
+        db.initialize()
+        spans = (
+            # id, parent, action, start second, end second
+            (1, None, "boot", 0, 10),
+            (2, 1, "load", 1, 4),
+            (3, 1, "scan", 2, 8),
+            (4, 3, "hash", 3, 5),
+            (5, None, "save", 11, None),
+        )
+        for span_id, parent, action, start, end in spans:
+            db.execute(
+                "INSERT INTO agents_log (id, agent, action, trace_id, parent_id, started_at,"
+                " ended_at) VALUES (?, 'Clide', ?, 't1', ?, datetime('2026-01-01', ?), "
+                "CASE WHEN ? IS NULL THEN NULL ELSE datetime('2026-01-01', ?) END)",
+                (span_id, action, parent, f"+{start} seconds", end, f"+{end} seconds"),
+            )
+        db.log_action("Clide", "other", trace_id="t2")
+
+        rows = db.get_trace("t1")
+        assert [r["id"] for r in rows] == [1, 2, 3, 4, 5]
+        assert [r["depth"] for r in rows] == [0, 1, 1, 2, 0]
+
+        roots = build_span_tree(rows)
+        boot = roots[0]
+        assert boot["duration"] == pytest.approx(10)
+        # Children cover seconds 1-8 of boot's 0-10, overlaps merged
+        assert boot["self_time"] == pytest.approx(3)
+        assert roots[1]["self_time"] is None
+        assert [s["action"] for s in critical_path(roots)] == ["save"]
+        assert [s["action"] for s in critical_path([boot])] == ["boot", "scan", "hash"]
+
+        stats = {r["action"]: r for r in db.get_action_percentiles()}
+        assert stats["boot"]["count"] == 1
+        assert stats["scan"]["p95"] == pytest.approx(6)
+        assert "save" not in stats
+        assert list(stats)[0] == "boot"
+
+
+def test_database_compact_log():
+    """Test log compaction rolls up, archives and deletes old rows in batches."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "compact.db"))
+        db.initialize()
+        assert db.execute_one("PRAGMA auto_vacuum")[0] == 2
+
+        rows = [
+            ("Clide", "boot", "2026-01-01 10:00:00", "2026-01-01 10:00:02"),
+            ("Clide", "boot", "2026-01-01 11:00:00", "2026-01-01 11:00:04"),
+            ("Clide", "boot", "2026-01-02 10:00:00", None),
+            ("Clide", "save", "2026-01-02 10:00:00", "2026-01-02 10:00:01"),
+        ]
+        for _ in range(50):
+            rows.append(("Clide", "status", "2026-01-03 00:00:00", "2026-01-03 00:00:00"))
+        for agent, action, started, ended in rows:
+            db.execute(
+                "INSERT INTO agents_log (agent, action, details, started_at, ended_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (agent, action, "x" * 2000, started, ended),
+            )
+        recent = db.log_action("Clide", "boot")
+
+        archive = str(Path(tmpdir) / "archive.db")
+        result = db.compact_log("2026-01-02 12:00:00", batch_size=2, archive_path=archive)
+        assert result == {"rows": 4, "archived": 4, "batches": 2}
+        db.compact_log("2026-02-01", batch_size=20)
+
+        daily = {(d["day"], d["action"]): d for d in db.get_log_daily()}
+        boot = daily[("2026-01-01", "boot")]
+        assert (boot["count"], boot["ended"], boot["total_duration"]) == (2, 2, 6)
+        assert boot["max_duration"] == 4
+        assert daily[("2026-01-02", "boot")]["ended"] == 0
+        assert daily[("2026-01-03", "status")]["count"] == 50
+
+        assert [r["id"] for r in db.execute("SELECT id FROM agents_log")] == [recent]
+        archived = Database(archive).execute_one("SELECT COUNT(*) FROM agents_log")[0]
+        assert archived == 4
+        assert db.vacuum_free_pages() > 0
+        assert db.execute_one("PRAGMA freelist_count")[0] == 0
+
+
+def test_compact_log_keeps_span_trees_whole():
+    """Test a trace with a span newer than the cutoff is not partly compacted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "compact.db"))
+        db.initialize()
+
+        def span(action, started, parent=None, trace="t1"):
+            return db.execute(
+                "INSERT INTO agents_log (agent, action, trace_id, parent_id, started_at, ended_at)"
+                " VALUES ('Clide', ?, ?, ?, ?, ?) RETURNING id",
+                (action, trace, parent, started, started),
+                write=True,
+            )[0]["id"]
+
+        # A long session: its root and first step are old, a later step is not
+        root = span("session", "2026-01-01 10:00:00")
+        step = span("scan", "2026-01-01 10:00:01", root)
+        late = span("hash", "2026-03-01 09:00:00", step)
+        # A finished trace, entirely old
+        old_root = span("boot", "2026-01-02 10:00:00", trace="t2")
+        span("load", "2026-01-02 10:00:01", old_root, trace="t2")
+
+        assert db.count_compactable("2026-02-01") == 2
+        assert db.compact_log("2026-02-01", batch_size=1)["rows"] == 2
+
+        kept = {r["id"]: r["parent_id"] for r in db.execute("SELECT id, parent_id FROM agents_log")}
+        assert kept == {root: None, step: root, late: step}
+        assert [s["action"] for s in db.get_trace("t1")][:1] == ["session"]
+
+        # Once the whole tree is past the cutoff it goes in one batch
+        assert db.compact_log("2026-04-01", batch_size=1) == {
+            "rows": 3,
+            "archived": 0,
+            "batches": 1,
+        }
+
+
+def test_daemon_forwards_commands(monkeypatch):
+    """Test commands forwarded to the daemon run against its warm database."""
+    import io
+    import json
+    import queue
+    import threading
+
+    from clide import db as db_module
+    from clide.client import forward, split_global_options
+    from clide.config import config
+    from clide.daemon import OutputFrames, send_request, serve
+
+    assert split_global_options(["-v", "--db=x.db", "log", "-n", "5"]) == (
+        {"db": "x.db", "verbose": True, "via_daemon": False},
+        ["log", "-n", "5"],
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "daemon.db")
+        socket_path = str(Path(tmpdir) / "daemon.sock")
+        Database(db_path).initialize()
+        monkeypatch.chdir(tmpdir)
+        monkeypatch.setattr(config, "db_path", db_path)
+        monkeypatch.setattr(config, "socket_path", socket_path)
+        monkeypatch.setattr(config, "daemon", "auto")
+        monkeypatch.setattr(db_module.db, "db_path", db_path)
+        monkeypatch.setattr(db_module.db, "pooled", False)
+
+        # No daemon yet: the client runs commands in-process
+        assert forward(["save", "-m", "local"]) is None
+
+        started = queue.Queue()
+        thread = threading.Thread(
+            target=serve, kwargs={"socket_path": socket_path, "ready": started.put}
+        )
+        thread.start()
+        server = started.get(timeout=10)
+        try:
+            assert send_request(socket_path, {"op": "ping"})["db"] == db_path
+
+            out = io.StringIO()
+            assert forward(["save", "-m", "via daemon"], stdout=out) == 0
+            assert "Session saved" in out.getvalue()
+
+            out = io.StringIO()
+            assert forward(["--db", db_path, "log", "-n", "5"], stdout=out) == 0
+            assert "via daemon" in out.getvalue()
+
+            assert forward(["no-such-command"], stderr=io.StringIO()) == 2
+            # Commands that replace the database, or run long, never leave the process
+            assert forward(["init", "--force"]) is None
+            assert forward(["report", "stories"]) is None
+            assert forward(["log", "compact"]) is None
+            # A different database is not served by this daemon
+            assert forward(["--db", "other.db", "status"]) is None
+
+            # The client's CLIDE_* settings apply to the forwarded command...
+            cache = Path(tmpdir) / "client-pack.json"
+            monkeypatch.setenv("CLIDE_CONTEXT_CACHE", str(cache))
+            assert forward(["boot", "--format", "context"], stdout=io.StringIO()) == 0
+            assert cache.exists() and config.context_cache == ""
+            # ...unless the daemon cannot honour them, then it runs locally
+            monkeypatch.setenv("CLIDE_LOG_BUFFER", "true")
+            assert forward(["status"]) is None
+            monkeypatch.delenv("CLIDE_LOG_BUFFER")
+
+            # Connections are served while a command is running
+            with server.command_lock:
+                assert send_request(socket_path, {"op": "ping"}, timeout=5)["ok"]
+        finally:
+            server.shutdown()
+            thread.join(timeout=10)
+
+        assert not Path(socket_path).exists()
+        assert forward(["status"]) is None
+        rows = Database(db_path).execute("SELECT details FROM agents_log WHERE action = 'save'")
+        assert [row["details"] for row in rows] == ["via daemon"]
+
+    # Output goes out in bounded frames, in the order it was written
+    sent = io.BytesIO()
+    frames = OutputFrames(sent, chunk_size=4)
+    out, err = frames.writer("stdout"), frames.writer("stderr")
+    out.write("ab")
+    err.write("!")
+    out.write("cdefgh")
+    out.flush()
+    assert [json.loads(line) for line in sent.getvalue().splitlines()] == [
+        {"stdout": "ab"},
+        {"stderr": "!"},
+        {"stdout": "cdefgh"},
+    ]
+
+
+def test_dashboard_app_caches_until_data_changes():
+    """Test the dashboard serves cached pages until another connection commits."""
+    import sqlite3
+
+    from clide.dashboard import create_app
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "dash.db")
+        db = Database(db_path)
+        db.initialize()
+        db.create_story("First story")
+
+        # ttl=0: every hit re-checks data_version
+        app = create_app(db_path, page_size=2, cache_ttl=0)
+        cache = app.extensions["clide"]["cache"]
+        client = app.test_client()
+
+        response = client.get("/")
+        assert response.status_code == 200
+        assert "First story" in response.get_data(as_text=True)
+        assert client.get("/").get_data(as_text=True) == response.get_data(as_text=True)
+        assert cache.stats["misses"] == 1 and cache.stats["revalidated"] == 1
+
+        db.create_story("Second story")
+        assert "Second story" in client.get("/").get_data(as_text=True)
+        assert cache.stats["misses"] == 2
+
+        # Keyset pages with Link headers; bad cursors and tables are rejected
+        for i in range(3):
+            db.log_action("Agent", f"step-{i}")
+        page = client.get("/log")
+        assert 'rel="next"' in page.headers["Link"]
+        assert client.get("/log?before=garbage").status_code == 400
+        assert client.get("/browse/nope").status_code == 404
+
+        # The app's connections are read-only
+        data = app.extensions["clide"]["data"]
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            data.database.execute("DELETE FROM stories")
+        data.close()
+
+
+def test_dashboard_events_stream_row_diffs():
+    """Test /events sends a snapshot, then only changed rows, from one shared poller."""
+    import json
+    import time
+
+    from clide.dashboard import create_app
+    from clide.dashboard.events import diff_state
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "events.db")
+        db = Database(db_path)
+        db.initialize()
+        kept = db.create_story("Kept story")
+        moved = db.create_story("Moved story")
+
+        app = create_app(db_path, poll_interval=0.01, heartbeat=0.05)
+        feed = app.extensions["clide"]["feed"]
+        response = app.test_client().get("/events", buffered=False)
+        assert response.mimetype == "text/event-stream"
+        stream = iter(response.response)
+
+        def next_event():
+            while True:
+                chunk = next(stream)
+                chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+                if not chunk.startswith(":"):
+                    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines()[-3:])
+                    return lines["event"], json.loads(lines["data"])
+
+        name, state = next_event()
+        assert name == "snapshot"
+        assert {row["title"] for row in state["open_work"]} == {"Kept story", "Moved story"}
+
+        db.execute("UPDATE stories SET status = 'in_progress' WHERE id = ?", (moved,), write=True)
+        name, changes = next_event()
+        assert name == "diff"
+        assert [row["key"] for row in changes["open_work"]["upsert"]] == [f"story-{moved}"]
+        assert changes["open_work"]["delete"] == []
+        assert changes["health"]["stories"]["in_progress"] == 1
+        assert "critical" not in changes and "landmines" not in changes
+
+        # Idle polls are a data_version read; no extra events are produced
+        polls = feed.polls
+        while feed.polls < polls + 3:
+            time.sleep(0.01)
+        assert feed.poll() is None
+        response.close()
+
+        # Removals are reported by key
+        old = {"open_work": state["open_work"], "critical": [], "landmines": [], "health": {}}
+        new = dict(old, open_work=[r for r in state["open_work"] if r["id"] == kept])
+        assert diff_state(old, new)["open_work"]["delete"] == [f"story-{moved}"]
+        app.extensions["clide"]["data"].close()
+
+
+def test_dashboard_change_feed_survives_a_failed_poll():
+    """Test the events poller keeps running after data_version() raises."""
+    import sqlite3
+    import time
+
+    from clide.dashboard.events import ChangeFeed
+
+    class FlakyData:
+        calls = 0
+
+        def data_version(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return 1
+
+        def home(self):
+            return {"open_work": [], "critical": [], "landmines": [], "health": {}}
+
+    feed = ChangeFeed(FlakyData(), interval=0.01)
+    events = feed.subscribe()
+    deadline = time.monotonic() + 5
+    while feed.polls < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert feed.polls >= 3 and feed._state is not None
+    feed.unsubscribe(events)
+
+
+def test_dashboard_caps_event_streams_below_the_thread_pool():
+    """Test open /events streams cannot starve a fixed thread pool of page requests."""
+    import http.client
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from werkzeug.serving import BaseWSGIServer
+
+    from clide.dashboard import create_app
+
+    class PooledServer(BaseWSGIServer):
+        """A fixed pool of worker threads, like waitress."""
+
+        pool = ThreadPoolExecutor(max_workers=3)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.handle_in_pool, request, client_address)
+
+        def handle_in_pool(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "streams.db")
+        Database(db_path).initialize()
+        # Three threads: one stream allowed, two left for everything else
+        app = create_app(db_path, poll_interval=0.05, heartbeat=0.1, max_streams=1)
+        server = PooledServer("127.0.0.1", 0, app)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        opened = []
+
+        def get(path):
+            conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+            conn.request("GET", path)
+            response = conn.getresponse()
+            opened.append((conn, response))
+            return response
+
+        try:
+            stream = get("/events")
+            assert stream.status == 200 and stream.readline().startswith(b"retry:")
+
+            refused = get("/events")
+            assert refused.status == 503 and refused.getheader("Retry-After") == "10"
+
+            # Pages and the API still answer while the cap is reached
+            for path in ("/", "/api/v1/open-work"):
+                assert get(path).status == 200
+
+            # Closing the stream frees its slot
+            for conn, response in opened:
+                response.close()
+                conn.close()
+            for _ in range(50):
+                if get("/events").status == 200:
+                    break
+                threading.Event().wait(0.05)
+            assert opened[-1][1].status == 200
+        finally:
+            for conn, response in opened:
+                response.close()
+                conn.close()
+            server.shutdown()
+            PooledServer.pool.shutdown(wait=False)
+            app.extensions["clide"]["data"].close()
+
+
+def test_dashboard_json_api_pages_filters_and_etags():
+    """Test /api/v1 field selection, filters, keyset paging, gzip and 304s."""
+    import gzip
+    import json
+
+    from clide.dashboard import create_app
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "api.db")
+        db = Database(db_path)
+        db.initialize()
+        for i in range(5):
+            db.create_story(f"Story {i}")
+        trace_id = "t-api"
+        root = db.log_action("Agent", "deploy", trace_id=trace_id)
+        db.log_action("Agent", "step", trace_id=trace_id, parent_id=root)
+
+        app = create_app(db_path, cache_ttl=0)
+        client = app.test_client()
+
+        # Keyset pages follow the next link until exhausted
+        titles, url = [], "/api/v1/open-work?fields=id,title&limit=2&kind=story"
+        while url:
+            page = client.get(url).get_json()
+            assert all(set(row) == {"id", "title"} for row in page["data"])
+            titles += [row["title"] for row in page["data"]]
+            url = page["next"]
+        assert sorted(titles) == [f"Story {i}" for i in range(5)]
+
+        assert client.get("/api/v1/open-work?fields=nope").status_code == 400
+        assert client.get("/api/v1/open-work?colour=red").status_code == 400
+        assert client.get("/api/v1/defects?cursor=garbage").get_json()["error"]
+        assert client.get("/api/v1/log?action=step").get_json()["data"][0]["action"] == "step"
+        assert client.get("/api/v1/log?since=1h").get_json()["data"]
+        assert client.get("/api/v1/log?since=garbage").status_code == 400
+        assert client.get("/api/v1/log?until=garbage").status_code == 400
+        spans = client.get(f"/api/v1/trace/{trace_id}?fields=action,depth").get_json()["data"]
+        assert spans == [{"action": "deploy", "depth": 0}, {"action": "step", "depth": 1}]
+        assert client.get("/api/v1/trace/missing").status_code == 404
+
+        # Unchanged polls are 304s served without re-running the query
+        first = client.get("/api/v1/open-work")
+        etag = first.headers["ETag"]
+        cache = app.extensions["clide"]["cache"]
+        misses = cache.stats["misses"]
+        again = client.get("/api/v1/open-work", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and cache.stats["misses"] == misses
+
+        db.create_story("Story 5")
+        changed = client.get("/api/v1/open-work", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+        # Large bodies are gzipped on request, under their own ETag
+        zipped = client.get("/api/v1/open-work", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert zipped.headers["ETag"] != changed.headers["ETag"]
+        assert json.loads(gzip.decompress(zipped.data)) == changed.get_json()
+        app.extensions["clide"]["data"].close()
+
+
+def test_dashboard_json_api_pages_open_work_across_kinds():
+    """Test open-work paging when stories and defects share ids and timestamps."""
+    from clide.dashboard import create_app
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "open-work.db")
+        db = Database(db_path)
+        db.initialize()
+        for i in range(30):
+            db.create_story(f"Story {i}")
+            db.create_defect(f"Defect {i}")
+        with db.transaction():
+            for table in ("stories", "defects"):
+                db.execute(f"UPDATE {table} SET created_at = '2026-01-01 00:00:00'")
+
+        client = create_app(db_path, cache_ttl=0).test_client()
+        seen, url = [], "/api/v1/open-work?fields=kind,id&limit=7"
+        while url:
+            page = client.get(url).get_json()
+            seen += [(row["kind"], row["id"]) for row in page["data"]]
+            url = page["next"]
+        assert len(seen) == len(set(seen)) == 60
+
+        # A cursor from a differently keyed resource is rejected, not run
+        defects = client.get("/api/v1/defects?limit=1").get_json()
+        cursor = defects["next"].split("cursor=")[1]
+        assert client.get(f"/api/v1/open-work?cursor={cursor}").status_code == 400
+
+
+def test_context_pack_cache_rebuilds_only_changed_sections():
+    """Test the boot context pack is cached, partially rebuilt and fitted to a budget."""
+    import json
+
+    from clide.context import estimate_tokens, fit_budget, load_pack, render_json, render_text
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "context.db")
+        cache_path = str(Path(tmpdir) / "pack.json")
+        db = Database(db_path)
+        db.initialize()
+        for i in range(30):
+            db.create_landmine(f"Landmine {i} " + "x" * 80, avoidance_rules="never do it")
+            db.create_story(f"Story {i}")
+        db.set_config("NODE_VERSION", "20")
+
+        pack, rebuilt = load_pack(db, cache_path)
+        assert rebuilt == ["landmines", "open_work", "deployment", "config"]
+        assert load_pack(db, cache_path) == (pack, [])
+
+        # Logging is not tracked, so it does not invalidate the pack
+        db.log_action("Agent", "work")
+        assert load_pack(db, cache_path)[1] == []
+
+        db.create_story("Fresh story")
+        pack, rebuilt = load_pack(db, cache_path)
+        assert rebuilt == ["open_work"]
+        assert "Fresh story" in json.dumps(pack["sections"]["open_work"])
+
+        brief = fit_budget(pack, 300)
+        text = render_text(brief)
+        assert brief["tokens"] <= 300 and estimate_tokens(text) <= 330
+        assert brief["sections"]["landmines"] and brief["sections"]["open_work"]
+        assert brief["sections"]["config"][0]["data"] == {"NODE_VERSION": "20"}
+        assert brief["omitted"]["landmines"] > 0
+        assert "NODE_VERSION=20" in text and "over budget" in text
+        assert json.loads(render_json(brief))["sections"]["config"] == [{"NODE_VERSION": "20"}]
+
+        # Everything fits in a large budget
+        assert fit_budget(pack, 100_000)["omitted"] == {}
+
+
+def test_boot_recalls_landmines_for_working_set():
+    """Test landmine recall ranks by file names, tags and diff terms over recency."""
+    import subprocess
+
+    from clide.context import fit_budget, load_pack, with_landmines
+    from clide.recall import build_working_set, diff_terms, file_phrase, path_parts, recall
+
+    assert path_parts("src/clide/dashboard/apiClient.py") == ["clide", "dashboard", "api", "client"]
+    assert file_phrase("src/clide/db.py") == "db py"
+    assert diff_terms("+++ b/x.py\n+    retry_backoff(retry)\n-    return None\n") == [
+        "retry",
+        "backoff",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "recall.db")
+        db = Database(db_path)
+        db.initialize()
+        path_hit = db.create_landmine("Editing db.py without a migration breaks old banks")
+        tag_hit = db.create_landmine("Cache keys must include data_version", tags="dashboard")
+        term_hit = db.create_landmine("Unbounded retry backoff starves writers")
+        for i in range(20):
+            db.create_landmine(f"Unrelated gotcha {i}", tags="deploy")
+
+        # Without a working set boot shows the newest (unrelated) landmines
+        assert path_hit not in [row["id"] for row in db.get_landmines(limit=10)]
+
+        working_set = build_working_set(["src/clide/db.py,src/clide/dashboard/app.py"])
+        rows, truncated = recall(db, working_set, limit=5, budget_ms=1000)
+        assert not truncated
+        assert [row["id"] for row in rows[:2]] == [path_hit, tag_hit]
+        assert "path" in rows[0]["matched"] and "tag" in rows[1]["matched"]
+
+        # --diff reads paths and changed identifiers from git
+        repo = Path(tmpdir) / "repo"
+        repo.mkdir()
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        (repo / "writer.py").write_text("def write():\n    pass\n")
+        subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+        (repo / "writer.py").write_text("def write():\n    retry_backoff()\n    retry_backoff()\n")
+        working_set = build_working_set(diff=True, cwd=str(repo))
+        assert working_set.paths == ["writer.py"]
+        assert working_set.terms[:3] == ["writer", "retry", "backoff"]
+        rows, _ = recall(db, working_set, limit=3, budget_ms=1000)
+        assert rows[0]["id"] == term_hit
+
+        # The context pack puts recalled landmines first, without caching them
+        pack, _ = load_pack(db, str(Path(tmpdir) / "pack.json"))
+        brief = fit_budget(with_landmines(pack, rows), 500)
+        assert brief["sections"]["landmines"][0]["data"]["id"] == term_hit
+        assert load_pack(db, str(Path(tmpdir) / "pack.json"))[0] == pack
@@ -1,5 +1,6 @@
 """Tests for database functionality."""
 
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -29,3 +30,333 @@ def test_trace_id_generation():
     trace_id = db.generate_trace_id()
     assert isinstance(trace_id, str)
     assert len(trace_id) == 36  # UUID format
+
+
+def test_pooled_connection_reuse():
+    """Test pooled mode reuses one connection and reconnects after close."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "pool.db"), pooled=True)
+        db.initialize()
+
+        with db.connection() as first:
+            pass
+        with db.connection() as second:
+            pass
+        assert first is second
+
+        db.close()
+        with db.connection() as third:
+            assert third.execute("SELECT 1").fetchone()[0] == 1
+        assert third is not first
+        db.close()
+
+
+def test_pooled_connection_detects_replaced_file():
+    """Test pooled mode reopens when the database file is replaced."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "pool.db"
+        db = Database(str(db_path), pooled=True)
+        db.initialize()
+        db.create_story(title="Before reset")
+
+        db_path.unlink()
+        db.initialize()
+        assert db.get_open_stories() == []
+        db.close()
+
+
+def test_pooled_connection_rolls_back_on_error():
+    """Test pooled mode keeps the connection() commit/rollback semantics."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "pool.db"), pooled=True)
+        db.initialize()
+
+        try:
+            with db.connection() as conn:
+                conn.execute("INSERT INTO stories (title) VALUES ('rolled back')")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        assert db.get_open_stories() == []
+        db.close()
+
+
+def test_transaction_single_commit():
+    """Test transaction() shares one connection and commits once at the end."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "txn.db")
+        db = Database(db_path)
+        db.initialize()
+        observer = Database(db_path)
+
+        with db.transaction() as conn:
+            story_id = db.create_story(title="Grouped")
+            log_id = db.log_action("Clide", "create_story", f"Created #{story_id}")
+            with db.connection() as inner:
+                assert inner is conn
+            assert observer.get_open_stories() == []
+
+        assert [s["id"] for s in observer.get_open_stories()] == [story_id]
+        assert observer.execute_one("SELECT id FROM agents_log WHERE id = ?", (log_id,))
+
+
+def test_transaction_rollback_and_savepoints():
+    """Test nested transactions roll back independently as savepoints."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "txn.db"))
+        db.initialize()
+
+        with db.transaction():
+            db.create_story(title="Outer")
+            try:
+                with db.transaction():
+                    db.create_story(title="Inner")
+                    raise ValueError("undo inner")
+            except ValueError:
+                pass
+
+        assert [s["title"] for s in db.get_open_stories()] == ["Outer"]
+
+        try:
+            with db.transaction():
+                db.create_story(title="Discarded")
+                raise ValueError("undo all")
+        except ValueError:
+            pass
+
+        assert [s["title"] for s in db.get_open_stories()] == ["Outer"]
+        assert not db.in_transaction
+
+
+def test_migrations_run_once_and_baseline_legacy_databases(monkeypatch):
+    """Test migrations are discovered, recorded, skipped once applied and atomic."""
+    import shutil
+
+    import pytest
+
+    from clide import db as db_module
+    from clide.db import discover_migrations, migration_version
+
+    migrations = discover_migrations()
+    assert migrations[0] == "2025-08-28-v1_1.sql"
+    assert len(migrations) >= 8
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "migrate.db"))
+        assert db.initialize()
+        assert db.user_version == len(migrations)
+        assert db.pending_migrations() == []
+        assert db.is_current()
+
+        # Re-running must not replay v1_1's ALTER TABLE statements
+        assert db.initialize()
+        assert db.migrate() == []
+
+        # A bank from before migrations were recorded: only schema_version
+        legacy_path = str(Path(tmpdir) / "legacy.db")
+        shutil.copy(db.db_path, legacy_path)
+        legacy = Database(legacy_path)
+        with legacy.connection() as conn:
+            conn.execute("DELETE FROM meta WHERE key LIKE 'migration:%'")
+            conn.execute("UPDATE meta SET value = '1.7' WHERE key = 'schema_version'")
+            conn.execute("DROP TABLE agents_log_daily")
+            conn.execute("PRAGMA user_version = 0")
+        after_v1_7 = [name for name in migrations if migration_version(name) > (1, 7)]
+        assert after_v1_7[0] == "2026-10-17-v1_8-log-rollup.sql"
+        assert legacy.pending_migrations() == after_v1_7
+        assert not legacy.is_current()
+        assert legacy.migrate() == after_v1_7
+        assert legacy.has_table("agents_log_daily")
+        assert legacy.user_version == len(migrations)
+        assert legacy.pending_migrations() == []
+
+        # A failing migration is rolled back whole and stays pending
+        (Path(tmpdir) / "2099-01-01-v9_0-broken.sql").write_text(
+            "CREATE TABLE half (x);\n-- second statement fails\nINSERT INTO missing VALUES (1);\n"
+        )
+        monkeypatch.setattr(db_module, "MIGRATIONS_DIR", Path(tmpdir))
+        with pytest.raises(sqlite3.OperationalError):
+            db.apply_migration("2099-01-01-v9_0-broken.sql", version=99)
+        assert not db.has_table("half")
+        assert db.user_version == len(migrations)
+
+
+def test_buffered_log_writer():
+    """Test buffered log writes batch, resolve handles and count drops."""
+    from clide.log_writer import BufferedLogWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "buffered.db"), buffered_log=True)
+        db.initialize()
+        # A long interval keeps entries queued until flush_log() asks for them
+        db._log_writer = BufferedLogWriter(db, flush_interval=60)
+
+        root = db.log_action("Clide", "boot", trace_id="t1")
+        child = db.log_action("Clide", "load", trace_id="t1", parent_id=root)
+        db.end_action(child)
+        db.end_action(root)
+        db.end_action(None)
+        assert root.id is None
+        assert db.flush_log()
+
+        rows = db.execute("SELECT id, parent_id, ended_at FROM agents_log ORDER BY id")
+        assert [row["id"] for row in rows] == [root.id, child.id]
+        assert rows[1]["parent_id"] == root.id
+        assert all(row["ended_at"] for row in rows)
+        assert db.log_stats["flushed"] == 4
+        assert db.flush_log(close=True)
+        # A closed writer is replaced on next use
+        assert not db.log_writer.closed
+        db.flush_log(close=True)
+
+        # Hold the write lock so the writer stalls and the tiny queue fills
+        writer = BufferedLogWriter(db, max_size=1, policy="drop", batch_size=1)
+        blocker = Database(db.db_path, buffered_log=False)
+        with blocker.transaction() as conn:
+            conn.execute("INSERT INTO meta(key, value) VALUES ('lock', '1')")
+            for _ in range(5):
+                writer.log_action("Clide", "spam")
+        assert writer.close()
+        stats = writer.stats
+        assert stats["dropped"] > 0
+        assert stats["flushed"] + stats["dropped"] == 5
+
+
+def test_backup_includes_wal_and_compresses():
+    """Test backups capture un-checkpointed WAL data and compress verifiably."""
+    import gzip
+    import sqlite3
+
+    from clide.backup import backup_database
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "live.db"), pooled=True)
+        db.initialize()
+        with db.connection() as conn:
+            conn.execute("PRAGMA wal_autocheckpoint = 0")
+        for i in range(20):
+            db.create_story(title=f"Story {i}")
+        assert Path(db.db_path + "-wal").stat().st_size > 0
+
+        plain = str(Path(tmpdir) / "plain.db")
+        result = backup_database(db.db_path, plain, step_pages=2, pause=0)
+        assert result["verified"] and result["mb_per_s"] > 0
+        copy = sqlite3.connect(plain)
+        assert copy.execute("SELECT COUNT(*) FROM stories").fetchone()[0] == 20
+        assert copy.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        copy.close()
+
+        packed = str(Path(tmpdir) / "packed.db.gz")
+        result = backup_database(db.db_path, packed, compact=True, compression="gzip")
+        assert result["output_bytes"] < result["bytes"]
+        unpacked = Path(tmpdir) / "unpacked.db"
+        unpacked.write_bytes(gzip.decompress(Path(packed).read_bytes()))
+        copy = sqlite3.connect(str(unpacked))
+        assert copy.execute("SELECT COUNT(*) FROM stories").fetchone()[0] == 20
+        copy.close()
+
+        assert db.backup(str(Path(tmpdir) / "via_db.db"))
+        assert sorted(p.name for p in Path(tmpdir).iterdir() if p.name.startswith(".")) == []
+        db.close()
+
+
+def test_incremental_snapshots_store_only_changes():
+    """Test snapshots dedupe unchanged chunks, restore exactly and prune."""
+    import sqlite3
+    import threading
+
+    from clide.backup import SnapshotStore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "live.db"))
+        db.initialize()
+        for i in range(300):
+            db.create_landmine(summary=f"Landmine {i}", cause="x" * 500)
+        store = SnapshotStore(str(Path(tmpdir) / "snapshots"))
+
+        first = store.create(db.db_path)
+        assert first["new_chunks"] == len(first["chunks"])
+
+        db.create_story(title="After first snapshot")
+        stop = threading.Event()
+
+        def write_while_snapshotting():
+            while not stop.is_set():
+                db.log_action("Tester", "noise")
+
+        writer = threading.Thread(target=write_while_snapshotting)
+        writer.start()
+        try:
+            second = store.create(db.db_path)
+        finally:
+            stop.set()
+            writer.join()
+        assert second["parent"] == first["id"]
+        assert 0 < second["new_chunks"] < len(second["chunks"])
+
+        restored = str(Path(tmpdir) / "restored.db")
+        store.restore("latest", restored)
+        conn = sqlite3.connect(restored)
+        titles = [row[0] for row in conn.execute("SELECT title FROM stories")]
+        assert titles == ["After first snapshot"]
+        assert conn.execute("SELECT COUNT(*) FROM landmines").fetchone()[0] == 300
+        conn.close()
+
+        store.prune(keep=1)
+        assert [m["id"] for m in store.list()] == [second["id"]]
+        store.restore(second["id"], restored, overwrite=True)
+
+
+def test_write_lock_retry_timeout_and_report():
+    """Test writers wait for the write lock with backoff and record the wait."""
+    import threading
+    import time
+
+    import pytest
+
+    from clide.db import LockTimeout, open_connection
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(str(Path(tmpdir) / "locks.db"))
+        db.initialize()
+        db.reset_lock_stats()
+
+        holder = open_connection(db.db_path, check_same_thread=False)
+        holder.execute("BEGIN IMMEDIATE")
+        assert db.write_lock_held()
+
+        # Released while the writer is retrying
+        release = threading.Timer(0.2, holder.commit)
+        release.start()
+        started = time.monotonic()
+        story_id = db.create_story("Written after the lock is released")
+        assert time.monotonic() - started >= 0.15
+        release.join()
+        row = db.execute_one("SELECT title FROM stories WHERE id = ?", (story_id,))
+        assert row["title"] == "Written after the lock is released"
+
+        stats = db.lock_stats
+        assert stats["transactions"] == 1 and stats["contended"] == 1
+        assert stats["retries"] >= 1 and stats["wait"] >= 0.15
+
+        # Held past the timeout: the writer gives up and nothing is written
+        holder.execute("BEGIN IMMEDIATE")
+        with pytest.raises(LockTimeout), db.transaction(timeout=0.1):
+            db.create_story("Never written")
+        holder.rollback()
+        holder.close()
+        assert db.lock_stats["timeouts"] == 1
+        assert not db.write_lock_held()
+
+        assert db.record_lock_waits("story")
+        assert db.lock_stats["contended"] == 0
+        # Uncontended commands leave no row
+        db.create_story("Uncontended")
+        assert not db.record_lock_waits("story")
+
+        (report,) = db.get_lock_report()
+        assert report["command"] == "story"
+        assert report["invocations"] == 1 and report["contended"] == 2
+        assert report["timeouts"] == 1
+        assert report["max_ms"] >= 100
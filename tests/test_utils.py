@@ -3,11 +3,20 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src to path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from clide.utils import format_datetime, format_priority, truncate  # noqa: E402
+from clide.utils import (  # noqa: E402
+    decode_cursor,
+    encode_cursor,
+    format_datetime,
+    format_priority,
+    parse_time,
+    truncate,
+)
 
 
 def test_format_priority():
@@ -45,3 +54,22 @@ def test_format_datetime():
     # Test with empty string
     assert format_datetime("") == ""
     assert format_datetime(None) == ""
+
+
+def test_cursor_round_trip():
+    """Test cursor tokens decode to the key they encode and reject junk."""
+    token = encode_cursor(("2026-01-01 00:00:00", 42))
+    assert "=" not in token
+    assert decode_cursor(token) == ("2026-01-01 00:00:00", 42)
+    for bad in ("not-a-cursor", encode_cursor(("x", "y")), ""):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_parse_time():
+    """Test absolute and relative times normalize to UTC SQLite datetimes."""
+    assert parse_time("2026-01-02") == "2026-01-02 00:00:00"
+    assert parse_time("2026-01-02T05:00:00+02:00") == "2026-01-02 03:00:00"
+    assert parse_time("2h") < parse_time("1h")
+    with pytest.raises(ValueError):
+        parse_time("yesterday")